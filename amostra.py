@@ -0,0 +1,141 @@
+# =========================
+# AMOSTRA ESTRATIFICADA (CONSULTAS APROXIMADAS)
+# =========================
+# Construída uma vez por versão dos dados em bases grandes. Os estratos são
+# os pares (ano, success_category); cada um recebe uma fatia da amostra
+# proporcional ao seu tamanho, com um mínimo por estrato para que anos e
+# categorias raros também tenham variância estimável.
+#
+# Uma consulta aplica os filtros da barra lateral às linhas da amostra e
+# expande cada linha pelo peso do seu estrato (linhas do estrato / linhas
+# sorteadas). Os KPIs saem com intervalo de confiança de 95%: variância do
+# total por estrato (com correção de população finita) e, para as médias,
+# linearização do estimador de razão. O custo depende do tamanho da amostra,
+# não do tamanho da base.
+import numpy as np
+
+from config import TAMANHO_AMOSTRA
+from cubo import MEDIDAS, adicionar_medias, medidas_por_linha
+
+# Linhas sorteadas no mínimo por estrato (ou o estrato inteiro, se menor)
+MINIMO_ESTRATO = 5
+# Quantil da normal para o intervalo de confiança de 95%
+Z_95 = 1.959963984540054
+# Colunas da amostra usadas pelos filtros e pelos agrupamentos
+COLUNAS_AMOSTRA = ["ano", "mes", "score", "revenue"]
+# Medidas de contagem, arredondadas nas estimativas agrupadas
+CONTAGENS = ["n", "n_nomes", "nota_n", "orcamento_n"]
+# KPI -> (numerador, denominador) entre as medidas do cubo; None = total
+KPIS = {
+    "receita_total": ("receita_soma", None),
+    "receita_media": ("receita_soma", "n"),
+    "roi_medio": ("roi_soma", "n"),
+    "orcamento_medio": ("orcamento_soma", "orcamento_n"),
+}
+
+
+def estratos(df):
+    """Código do estrato (ano, success_category) de cada linha e o número de estratos."""
+    categoria = df["success_category"].cat.codes.to_numpy().astype(np.int64) + 1
+    ano = df["ano"].to_numpy().astype(np.int64)
+    chave = (ano - ano.min()) * (len(df["success_category"].cat.categories) + 1) + categoria
+    codigos, estrato = np.unique(chave, return_inverse=True)
+    return estrato, len(codigos)
+
+
+def sortear(estrato, n_estratos, tamanho, minimo=MINIMO_ESTRATO, semente=0):
+    """
+    Posições sorteadas (ordenadas) com alocação proporcional e o tamanho da
+    população e da amostra de cada estrato.
+    """
+    populacao = np.bincount(estrato, minlength=n_estratos)
+    alocacao = np.round(tamanho * populacao / max(len(estrato), 1)).astype(np.int64)
+    alocacao = np.minimum(np.maximum(alocacao, minimo), populacao)
+    # Ordem aleatória dentro de cada estrato; ficam as primeiras `alocacao` linhas
+    aleatorio = np.random.default_rng(semente).random(len(estrato))
+    ordem = np.lexsort((aleatorio, estrato))
+    inicio = np.concatenate([[0], np.cumsum(populacao)[:-1]])
+    estrato_ordenado = estrato[ordem]
+    posto = np.arange(len(ordem)) - inicio[estrato_ordenado]
+    return np.sort(ordem[posto < alocacao[estrato_ordenado]]), populacao, alocacao
+
+
+class AmostraEstratificada:
+    """Amostra (ano × categoria de sucesso) com estimativas e intervalos para os filtros."""
+
+    def __init__(self, df, tamanho=TAMANHO_AMOSTRA, minimo=MINIMO_ESTRATO, semente=0):
+        estrato, n_estratos = estratos(df)
+        self.linhas, self.populacao, self.alocacao = sortear(estrato, n_estratos, tamanho, minimo, semente)
+        self.n_base = len(df)
+        self.estrato = estrato[self.linhas]
+        self.peso = (self.populacao / np.maximum(self.alocacao, 1))[self.estrato]
+        sorteadas = df.iloc[self.linhas]
+        self.df = sorteadas[COLUNAS_AMOSTRA].reset_index(drop=True)
+        medidas = medidas_por_linha(sorteadas).reset_index(drop=True)
+        # Receita/ROI ausentes não somam, como no groupby do cubo
+        self.medidas = medidas.fillna(0)
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def consultar(self, filtros, por=()):
+        """
+        Somas e contagens estimadas (e médias derivadas) das linhas que passam
+        em `filtros`, agrupadas por `por` (colunas da amostra; vazio = total).
+        Mesmo formato de CuboOLAP.consultar.
+        """
+        por = list(por)
+        dentro = filtros.mascara(self.df).to_numpy()
+        expandidas = self.medidas[dentro].mul(self.peso[dentro], axis=0)
+        if por:
+            for coluna in por:
+                expandidas[coluna] = self.df[coluna].to_numpy()[dentro]
+            agregado = expandidas.groupby(por, observed=True)[MEDIDAS].sum().reset_index()
+        else:
+            agregado = expandidas[MEDIDAS].sum().to_frame().T
+        agregado = adicionar_medias(agregado)
+        agregado[CONTAGENS] = agregado[CONTAGENS].round()
+        return agregado
+
+    def _variancia_total(self, valores):
+        """Variância do total estimado de `valores` (um por linha da amostra)."""
+        n_estratos = len(self.populacao)
+        soma = np.bincount(self.estrato, valores, n_estratos)
+        soma_quadrados = np.bincount(self.estrato, valores * valores, n_estratos)
+        n = self.alocacao.astype(float)
+        media = np.divide(soma, n, out=np.zeros(n_estratos), where=n > 0)
+        s2 = np.divide(soma_quadrados - n * media ** 2, n - 1, out=np.zeros(n_estratos), where=n > 1)
+        # Estratos inteiros (n = N) não têm erro de amostragem
+        fpc = 1 - np.divide(n, self.populacao, out=np.ones(n_estratos), where=self.populacao > 0)
+        return float(np.sum(np.divide(self.populacao ** 2 * fpc * np.maximum(s2, 0), n,
+                                      out=np.zeros(n_estratos), where=n > 0)))
+
+    def kpis(self, filtros):
+        """
+        {kpi: (estimativa, margem)} dos KPIs financeiros na seleção, com
+        margem do intervalo de 95% (estimativa ± margem).
+        """
+        dentro = filtros.mascara(self.df).to_numpy()
+        medidas = {coluna: self.medidas[coluna].to_numpy(dtype=float) * dentro for coluna in MEDIDAS}
+        totais = {coluna: float(np.dot(valores, self.peso)) for coluna, valores in medidas.items()}
+        resultado = {}
+        for kpi, (numerador, denominador) in KPIS.items():
+            if denominador is None:
+                estimativa = totais[numerador]
+                variancia = self._variancia_total(medidas[numerador])
+            elif totais[denominador] > 0:
+                estimativa = totais[numerador] / totais[denominador]
+                # Razão linearizada: resíduo y - R·x de cada linha da seleção
+                residuo = medidas[numerador] - estimativa * medidas[denominador]
+                variancia = self._variancia_total(residuo) / totais[denominador] ** 2
+            else:
+                estimativa, variancia = np.nan, np.nan
+            resultado[kpi] = (estimativa, Z_95 * np.sqrt(variancia))
+        return resultado
+
+
+def criar_amostra(df, limiar, tamanho=TAMANHO_AMOSTRA):
+    """Amostra estratificada para bases com pelo menos `limiar` linhas (0 desativa); senão None."""
+    if limiar <= 0 or len(df) < limiar or "success_category" not in df.columns:
+        return None
+    return AmostraEstratificada(df, tamanho)
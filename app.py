@@ -1,12 +1,40 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import warnings
-import pycountry # Adicionado: Necessário para o mapa mundi no Plotly
+from config import ABAS_PREGUICOSAS, CSV_URL, DIAGNOSTICO, FONTE_DADOS, ORCAMENTO_CACHE_FIGURAS_MB, TAMANHO_PAGINA_TABELA
+from dados import nomes_paises
+from estado_dados import carregar_estado
+from filtros import Filtros
+from graficos import (
+    criar_grafico_top_filmes,
+    criar_grafico_dispercao_nota_receita,
+    criar_grafico_evolucao_receita_anual,
+    criar_grafico_distribuicao_idiomas,
+    criar_grafico_filmes_por_ano,
+    criar_grafico_media_notas_ano,
+    criar_grafico_correlacao,
+    criar_grafico_decadas,
+    criar_grafico_sazonalidade,
+    criar_grafico_orcamento_vs_receita,
+    criar_grafico_distribuicao_notas,
+    criar_grafico_categorias_sucesso,
+    criar_grafico_top_roi,
+    criar_grafico_receita_mensal,
+    criar_grafico_filmes_mensal,
+)
+from tabela import ordenar_ate, pagina_tabela
+from exportacao import FORMATOS, exportar
+from cache_figuras import AUSENTE, MOTOR_JSON, CacheFiguras, tamanho_figura
+from pool_graficos import SPEC_SEM_REIMPORTACAO, PoolGraficos, TarefaGrafico
+from instrumentacao import (
+    CronometroRerun, configurar_log_json, contar_rerun, memoria_frame, registrar_json, rerun_de_fragmento
+)
+from sessao import bytes_da_sessao, resultados_da_sessao, rotulo_opcional
 warnings.filterwarnings('ignore')
+# O Streamlit cria um módulo __main__ novo a cada rerun: os trabalhadores do
+# pool de gráficos (spawn) não reexecutam este script (pool_graficos.marcar_principal)
+__spec__ = SPEC_SEM_REIMPORTACAO
 
 # =========================
 # CONFIGURAÇÃO DA PÁGINA
@@ -18,6 +46,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Tempos por seção deste rerun (lidos pelo harness de latência)
+cronometro = CronometroRerun()
+st.session_state["_tempos_secoes"] = cronometro.tempos
+# Reruns da sessão: completos e só de fragmentos (painel de diagnóstico)
+contagem_reruns = contar_rerun(st.session_state, "completo")
+# Painel de diagnóstico: para todos com CINE_DIAGNOSTICO=1, ou só nesta sessão com ?diagnostico=1
+diagnostico_ativo = DIAGNOSTICO or st.query_params.get("diagnostico") == "1"
+
 # =========================
 # ESTILOS CSS PERSONALIZADOS
 # =========================
@@ -65,492 +101,51 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # =========================
-# CARREGAR E PREPROCESSAR DADOS
+# CACHE DE FIGURAS
 # =========================
-@st.cache_data
-def carregar_dados():
-    CSV_URL = "https://raw.githubusercontent.com/luccasfsilva/projetopy/main/imdb_movies.csv"
-    try:
-        # CORRIGIDO: O arquivo pode ter sido renomeado, mas usaremos a URL fornecida
-        df = pd.read_csv(CSV_URL, parse_dates=['date_x'])
-        
-        # Limpeza e transformação
-        df["revenue"] = pd.to_numeric(df.get("revenue"), errors="coerce").fillna(0)
-        df["score"] = pd.to_numeric(df.get("score"), errors="coerce")
-        df["budget_x"] = pd.to_numeric(df.get("budget_x"), errors="coerce").fillna(0)
-        
-        # Extrair ano e mês
-        df["ano"] = df["date_x"].dt.year.fillna(0).astype(int)
-        df["mes"] = df["date_x"].dt.month.fillna(0).astype(int)
-        
-        # Calcular ROI
-        df["roi"] = np.where(
-            df["budget_x"] > 0,
-            (df["revenue"] - df["budget_x"]) / df["budget_x"] * 100,
-            0
-        )
-        
-        # Categorizar sucesso
-        conditions = [
-            df['revenue'] >= df['revenue'].quantile(0.8),
-            df['revenue'] >= df['revenue'].quantile(0.6),
-            df['revenue'] >= df['revenue'].quantile(0.4),
-            df['revenue'] < df['revenue'].quantile(0.4)
-        ]
-        choices = ['Blockbuster', 'High', 'Medium', 'Low']
-        df['success_category'] = np.select(conditions, choices, default='Low')
-        
-        return df
-    except Exception as e:
-        st.error(f"❌ Erro ao carregar o CSV. Verifique a URL ou a estrutura do arquivo.")
-        st.stop()
+@st.cache_resource
+def obter_cache_figuras():
+    """Cache LRU de figuras único por processo (compartilhado entre sessões)."""
+    return CacheFiguras(ORCAMENTO_CACHE_FIGURAS_MB * 1024 * 1024)
 
-df = carregar_dados()
-if df is None:
-    st.stop()
+cache_figuras = obter_cache_figuras()
 
-# =========================
-# DICIONÁRIO DE TRADUÇÃO DOS FILMES
-# =========================
-TRADUCOES_FILMES = {
-    # Filmes Populares
-    "Avatar: The Way of Water": "Avatar: O Caminho da Água",
-    "Avengers: Endgame": "Vingadores: Ultimato",
-    "Avatar": "Avatar",
-    "Titanic": "Titanic",
-    "Star Wars: Episode VII - The Force Awakens": "Star Wars: Episódio VII - O Despertar da Força",
-    "Avengers: Infinity War": "Vingadores: Guerra Infinita",
-    "Spider-Man: No Way Home": "Homem-Aranha: Sem Volta para Casa",
-    "Jurassic World": "Mundo Jurássico",
-    "The Lion King": "O Rei Leão",
-    "The Avengers": "Os Vingadores",
-    "Furious 7": "Velozes e Furiosos 7",
-    "Frozen II": "Frozen II",
-    "Top Gun: Maverick": "Top Gun: Maverick",
-    "Barbie": "Barbie",
-    "The Super Mario Bros. Movie": "Super Mario Bros.: O Filme",
-    "Avengers: Age of Ultron": "Vingadores: Era de Ultron",
-    "Black Panther": "Pantera Negra",
-    "Harry Potter and the Deathly Hallows: Part 2": "Harry Potter e as Relíquias da Morte: Parte 2",
-    "Star Wars: Episode VIII - The Last Jedi": "Star Wars: Episódio VIII - Os Últimos Jedi",
-    "Jurassic World: Fallen Kingdom": "Mundo Jurássico: Reino Ameaçado",
-    "Frozen": "Frozen: Uma Aventura Congelante",
-    "Beauty and the Beast": "A Bela e a Fera",
-    "Incredibles 2": "Os Incríveis 2",
-    "The Fate of the Furious": "O Destino de Velozes e Furiosos",
-    "Iron Man 3": "Homem de Ferro 3",
-    "Minions": "Minions",
-    "Captain America: Civil War": "Capitão América: Guerra Civil",
-    "Aquaman": "Aquaman",
-    "The Lord of the Rings: The Return of the King": "O Senhor dos Anéis: O Retorno do Rei",
-    "Spider-Man: Far From Home": "Homem-Aranha: Longe de Casa",
-    
-    # Filmes de Ação e Aventura
-    "Transformers: Dark of the Moon": "Transformers: O Lado Oculto da Lua",
-    "Skyfall": "007 - Operação Skyfall",
-    "Transformers: Age of Extinction": "Transformers: A Era da Extinção",
-    "The Dark Knight Rises": "Batman: O Cavaleiro das Trevas Ressurge",
-    "Toy Story 4": "Toy Story 4",
-    "Toy Story 3": "Toy Story 3",
-    "Pirates of the Caribbean: Dead Man's Chest": "Piratas do Caribe: O Baú da Morte",
-    "Rogue One: A Star Wars Story": "Rogue One: Uma História Star Wars",
-    "Pirates of the Caribbean: On Stranger Tides": "Piratas do Caribe: Navegando em Águas Misteriosas",
-    "Despicable Me 3": "Meu Malvado Favorito 3",
-    "Jumanji: Welcome to the Jungle": "Jumanji: Bem-vindo à Selva",
-    "Justice League": "Liga da Justiça",
-    "The Dark Knight": "Batman: O Cavaleiro das Trevas",
-    
-    # Filmes de Animação
-    "Finding Dory": "Procurando Dory",
-    "Zootopia": "Zootopia: Essa Cidade é o Bicho",
-    "Despicable Me 2": "Meu Malvado Favorito 2",
-    "The Grinch": "O Grinch",
-    "Finding Nemo": "Procurando Nemo",
-    "Shrek 2": "Shrek 2",
-    "The Secret Life of Pets": "A Vida Secreta dos Bichos",
-    "Inside Out": "Divertida Mente",
-    "The Incredibles": "Os Incríveis",
-    "Shrek the Third": "Shrek Terceiro",
-    "Shrek": "Shrek",
-    "Madagascar 3: Europe's Most Wanted": "Madagascar 3: Os Procurados",
-    "Monsters, Inc.": "Monstros S.A.",
-    "Up": "Up: Altas Aventuras",
-    "Spider-Man: Into the Spider-Verse": "Homem-Aranha no Aranhaverso",
-    
-    # Filmes Recentes
-    "Oppenheimer": "Oppenheimer",
-    "Guardians of the Galaxy Vol. 3": "Guardiões da Galáxia Vol. 3",
-    "Fast X": "Velozes e Furiosos 10",
-    "The Little Mermaid": "A Pequena Sereia",
-    "Elemental": "Elementos",
-    "Ant-Man and the Wasp: Quantumania": "Homem-Formiga e a Vespa: Quantumania",
-    "John Wick: Chapter 4": "John Wick 4: Baba Yaga",
-    "The Flash": "The Flash",
-    "Transformers: Rise of the Beasts": "Transformers: O Despertar das Feras",
-    "Spider-Man: Across the Spider-Verse": "Homem-Aranha: Através do Aranhaverso",
-    "Indiana Jones and the Dial of Destiny": "Indiana Jones e o Chamado do Destino",
-    "Mission: Impossible - Dead Reckoning Part One": "Missão: Impossível - Acerto de Contas Parte Um",
-    "The Marvels": "As Marvels",
-    "Wonka": "Wonka",
-    "Aquaman and the Lost Kingdom": "Aquaman e o Reino Perdido",
-    "The Hunger Games: The Ballad of Songbirds & Snakes": "Jogos Vorazes: A Cantiga dos Pássaros e das Serpentes",
-    
-    # Filmes Diversos
-    "The Lord of the Rings: The Two Towers": "O Senhor dos Anéis: As Duas Torres",
-    "The Lord of the Rings: The Fellowship of the Ring": "O Senhor dos Anéis: A Sociedade do Anel",
-    "The Matrix Reloaded": "Matrix Reloaded",
-    "The Twilight Saga: Breaking Dawn - Part 2": "A Saga Crepúsculo: Amanhecer - Parte 2",
-    "The Twilight Saga: New Moon": "A Saga Crepúsculo: Lua Nova",
-    "The Twilight Saga: Eclipse": "A Saga Crepúsculo: Eclipse",
-    "The Twilight Saga: Breaking Dawn - Part 1": "A Saga Crepúsculo: Amanhecer - Parte 1",
-    "The Hobbit: An Unexpected Journey": "O Hobbit: Uma Jornada Inesperada",
-    "The Hobbit: The Desolation of Smaug": "O Hobbit: A Desolação de Smaug",
-    "The Hobbit: The Battle of the Five Armies": "O Hobbit: A Batalha dos Cinco Exércitos",
-    "The Da Vinci Code": "O Código Da Vinci",
-    "The Chronicles of Narnia: The Lion, the Witch and the Wardrobe": "As Crônicas de Nárnia: O Leão, a Feiticeira e o Guarda-Roupa",
-    "The Passion of the Christ": "A Paixão de Cristo",
-    "The Exorcist": "O Exorcista",
-    "The Sound of Music": "A Noviça Rebelde",
-    "The Sting": "Um Golpe de Mestre",
-    "Butch Cassidy and the Sundance Kid": "Butch Cassidy e o Menino da Lua",
-    
-    # Filmes em Português (manter como estão)
-    "Cidade de Deus": "Cidade de Deus",
-    "Tropa de Elite": "Tropa de Elite",
-    "Central do Brasil": "Central do Brasil",
-    "O Auto da Compadecida": "O Auto da Compadecida",
-    "Lisbela e o Prisioneiro": "Lisbela e o Prisioneiro",
-}
+@st.cache_resource
+def obter_pool_graficos():
+    """Pool de construção de figuras (CINE_POOL_GRAFICOS), um por processo."""
+    return PoolGraficos()
+
+pool_graficos = obter_pool_graficos()
 
-def traduzir_nome_filme(nome_original):
-    if pd.isna(nome_original):
-        return nome_original
-    return TRADUCOES_FILMES.get(nome_original, nome_original)
+# Resultados desta sessão (ex.: busca da tabela), limitados por CINE_ORCAMENTO_SESSAO_MB
+resultados_sessao = resultados_da_sessao(st.session_state)
 
 # =========================
-# FUNÇÕES DE ANÁLISE DO COLAB (CORRIGIDAS)
+# CATÁLOGO NETFLIX (CINE_FONTE=netflix)
 # =========================
-def criar_grafico_top_filmes(df, top_n=10):
-    """Top filmes por receita - Gráfico 1 do Colab"""
-    top_filmes = df.nlargest(top_n, 'revenue')[['names', 'revenue', 'score']].copy()
-    
-    fig = px.bar(
-        top_filmes,
-        x='revenue',
-        y='names',
-        orientation='h',
-        title=f'🏆 Top {top_n} Filmes por Receita',
-        labels={'revenue': 'Receita (USD)', 'names': 'Filme'},
-        color='revenue',
-        color_continuous_scale='viridis',
-        hover_data=['score']
-    )
-    fig.update_layout(
-        yaxis={'categoryorder': 'total ascending'},
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        height=500
-    )
-    return fig
-
-def criar_grafico_dispercao_nota_receita(df):
-    """Relação entre nota e receita - Gráfico 2 do Colab (CORRIGIDO)"""
-    fig = px.scatter(
-        df,
-        x='score',
-        y='revenue',
-        title='🎯 Relação entre Nota e Receita',
-        labels={'score': 'Nota IMDb', 'revenue': 'Receita (USD)'},
-        hover_data=['names'],
-        # Removido trendline que causava o erro
-        color_discrete_sequence=['#FF6B6B']
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    return fig
-
-def criar_grafico_evolucao_receita_anual(df):
-    """Evolução da receita anual - Gráfico 3 do Colab"""
-    receita_anual = df.groupby('ano')['revenue'].sum().reset_index()
-    
-    fig = px.line(
-        receita_anual,
-        x='ano',
-        y='revenue',
-        title='📈 Evolução da Receita Anual da Indústria Cinematográfica',
-        labels={'ano': 'Ano', 'revenue': 'Receita Total (USD)'},
-        markers=True
-    )
-    fig.update_traces(line=dict(color='#4ECDC4', width=3))
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    return fig
-
-def criar_grafico_distribuicao_idiomas(df):
-    """Distribuição de idiomas - Gráfico 4 do Colab"""
-    idiomas = df['orig_lang'].value_counts().head(10).reset_index()
-    idiomas.columns = ['Idioma', 'Quantidade']
-    
-    fig = px.pie(
-        idiomas,
-        values='Quantidade',
-        names='Idioma',
-        title='🌎 Distribuição dos Idiomas Originais (Top 10)',
-        hole=0.4,
-        color_discrete_sequence=px.colors.sequential.Plasma
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    return fig
-
-def criar_grafico_filmes_por_ano(df):
-    """Quantidade de filmes por ano - Gráfico 5 do Colab"""
-    filmes_ano = df.groupby('ano').size().reset_index(name='quantidade')
-    
-    fig = px.bar(
-        filmes_ano,
-        x='ano',
-        y='quantidade',
-        title='🎬 Quantidade de Filmes por Ano',
-        labels={'ano': 'Ano', 'quantidade': 'Número de Filmes'},
-        color='quantidade',
-        color_continuous_scale='blues'
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        showlegend=False
-    )
-    return fig
-
-def criar_grafico_media_notas_ano(df):
-    """Média de notas por ano - Gráfico 6 do Colab"""
-    media_notas = df.groupby('ano')['score'].mean().reset_index()
-    
-    fig = px.line(
-        media_notas,
-        x='ano',
-        y='score',
-        title='⭐ Evolução da Média de Notas por Ano',
-        labels={'ano': 'Ano', 'score': 'Nota Média'},
-        markers=True
-    )
-    fig.update_traces(line=dict(color='#FFA726', width=3))
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    return fig
-
-def criar_grafico_correlacao(df):
-    """
-    Mapa Mundi de Receita por País. Substitui o mapa de calor de correlações
-    usando a coluna 'country' e o pacote 'pycountry' para códigos ISO3.
-    """
-
-    # Verifica presença da coluna 'country'
-    if "country" not in df.columns or df["country"].isnull().all():
-        st.warning("A coluna 'country' não foi encontrada ou está vazia.")
-        return None
-
-    # Agrega a receita total por país
-    df_country = df.groupby("country")["revenue"].sum().reset_index()
-    df_country.columns = ["country_raw", "value"]
-
-    def iso2_to_iso3(code):
-        """Converte códigos de país ISO2 para ISO3 usando pycountry."""
-        try:
-            if isinstance(code, str) and len(code) == 2:
-                # Tenta converter ISO2 para ISO3
-                return pycountry.countries.get(alpha_2=code.upper()).alpha_3
-            if isinstance(code, str) and len(code) == 3:
-                # Assume que já é ISO3
-                return code.upper()
-        except:
-            pass
-        return None
-
-    df_country["iso3"] = df_country["country_raw"].apply(iso2_to_iso3)
-    df_country = df_country.dropna(subset=["iso3"])
-
-    if df_country.empty:
-        st.warning("Não foi possível gerar o mapa mundi. Verifique os códigos de país (ISO2 ou ISO3) na coluna 'country'.")
-        return None
-
-    # ========== MAPA MUNDI ==========
-    fig = px.choropleth(
-        df_country,
-        locations="iso3",
-        color="value",
-        hover_name="country_raw",
-        color_continuous_scale="Plasma",
-        projection="natural earth",
-        title=f"🌍 Receita Total por País",
-        labels={"value": "Receita Total (USD)"}
-    )
-
-    fig.update_geos(
-        showcountries=True,
-        showcoastlines=True,
-        showland=True,
-        landcolor="#2d2d2d", # Cor escura para o continente
-        oceancolor="#1a1a1a" # Cor escura para o oceano
-    )
-
-    fig.update_layout(
-        margin=dict(r=0, t=50, l=0, b=0),
-        height=520,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-
-    return fig
+if FONTE_DADOS == "netflix":
+    from painel_netflix import renderizar_painel_netflix
+    renderizar_painel_netflix(cache_figuras, cronometro)
+    st.stop()
 
+# =========================
+# CARREGAR E PREPROCESSAR DADOS
+# =========================
+@st.cache_resource
+def carregar_dados():
+    """Dados tratados e estruturas de consulta, compartilhados por todas as sessões."""
+    try:
+        # Usa o snapshot Parquet local quando a fonte não mudou (ou está offline)
+        return carregar_estado(CSV_URL)
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar o CSV. Verifique a URL ou a estrutura do arquivo.")
+        st.stop()
 
-def criar_grafico_decadas(df):
-    """Análise por décadas - Gráfico 8 do Colab"""
-    df_copy = df.copy()
-    df_copy['decada'] = (df_copy['ano'] // 10) * 10
-    decada_stats = df_copy.groupby('decada').agg({
-        'revenue': 'sum', # Alterado para soma para refletir o total da década
-        'score': 'mean',
-        'names': 'count'
-    }).reset_index()
-    
-    # Filtra décadas com dados significativos
-    decada_stats = decada_stats[decada_stats['decada'] > 1900]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=decada_stats['decada'],
-        y=decada_stats['names'],
-        name='Número de Filmes',
-        marker_color='#4ECDC4'
-    ))
-    
-    # Normaliza a receita total para o eixo secundário
-    max_names = decada_stats['names'].max() if decada_stats['names'].max() > 0 else 1
-    max_revenue = decada_stats['revenue'].max() if decada_stats['revenue'].max() > 0 else 1
-    
-    fig.add_trace(go.Scatter(
-        x=decada_stats['decada'],
-        y=decada_stats['revenue'] / max_revenue * max_names, # Escala ajustada
-        name='Receita Total (escala ajustada)',
-        line=dict(color='#FF6B6B', width=3),
-        yaxis='y2'
-    ))
-    
-    fig.update_layout(
-        title='📊 Análise por Décadas: Quantidade de Filmes e Receita Total',
-        xaxis_title='Década',
-        yaxis_title='Número de Filmes',
-        yaxis2=dict(
-            title='Receita Total (escala ajustada)',
-            overlaying='y',
-            side='right',
-            range=[0, max_names * 1.05] # Ajusta o limite superior
-        ),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    return fig
-
-def criar_grafico_sazonalidade(df):
-    """Análise de sazonalidade - Gráfico 9 do Colab"""
-    if 'mes' in df.columns and not df['mes'].isnull().all():
-        sazonalidade = df.groupby('mes').agg({
-            'revenue': 'mean',
-            'score': 'mean',
-            'names': 'count'
-        }).reset_index()
-        
-        meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=[meses[m-1] for m in sazonalidade['mes']],
-            y=sazonalidade['revenue'],
-            name='Receita Média',
-            line=dict(color='#4ECDC4', width=3),
-            yaxis='y1'
-        ))
-        fig.add_trace(go.Bar(
-            x=[meses[m-1] for m in sazonalidade['mes']],
-            y=sazonalidade['names'],
-            name='Número de Filmes',
-            marker_color='rgba(255, 107, 107, 0.6)',
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='📅 Sazonalidade: Lançamentos e Receita por Mês',
-            xaxis_title='Mês',
-            yaxis_title='Receita Média (USD)',
-            yaxis2=dict(
-                title='Número de Filmes',
-                overlaying='y',
-                side='right'
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white')
-        )
-        return fig
-    return None
-
-def criar_grafico_orcamento_vs_receita(df):
-    """Relação orçamento vs receita - Gráfico adicional do Colab (CORRIGIDO)"""
-    df_filtrado = df[df['budget_x'] > 0]
-    if len(df_filtrado) > 0:
-        fig = px.scatter(
-            df_filtrado,
-            x='budget_x',
-            y='revenue',
-            title='💰 Relação entre Orçamento e Receita',
-            labels={'budget_x': 'Orçamento (USD)', 'revenue': 'Receita (USD)'},
-            hover_data=['names', 'score'],
-            color_discrete_sequence=['#FFA726']
-        )
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white')
-        )
-        return fig
-    return None
-
-def criar_grafico_distribuicao_notas(df):
-    """Distribuição de notas - Gráfico adicional do Colab"""
-    fig = px.histogram(
-        df,
-        x='score',
-        nbins=30,
-        title='📊 Distribuição das Notas dos Filmes',
-        labels={'score': 'Nota IMDb', 'count': 'Número de Filmes'},
-        color_discrete_sequence=['#4ECDC4']
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        showlegend=False
-    )
-    return fig
+estado_dados = carregar_dados()
+# Novas linhas da fonte entram pelo delta, sem recarregar tudo
+estado_dados.atualizar_em_segundo_plano()
+df, cubo, motor_filtros, indice_busca, consultas, amostra = estado_dados.atual()
+cronometro.marcar("carregar_dados")
 
 # =========================
 # BARRA LATERAL
@@ -560,65 +155,163 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Filtro de anos
-    st.markdown("#### 📅 Filtro por Ano")
-    # Filtra anos > 0 para evitar lixo de data
-    anos_disponiveis = sorted(df[df["ano"] > 0]["ano"].unique())
-    if len(anos_disponiveis) > 0:
-        ano_min_default = min(anos_disponiveis)
-        ano_max_default = max(anos_disponiveis)
-        ano_min, ano_max = st.select_slider(
-            "Selecione o intervalo de anos:",
-            options=anos_disponiveis,
-            value=(ano_min_default, ano_max_default)
-        )
-    else:
-        st.warning("Dados de ano inválidos ou incompletos.")
-        ano_min, ano_max = 0, datetime.now().year
+    # Os filtros formam um lote: mover os sliders não reexecuta o script;
+    # só o botão aplica a nova seleção (um rerun por alteração de filtros)
+    with st.form("filtros_barra_lateral", border=False):
+        # Filtro de anos
+        st.markdown("#### 📅 Filtro por Ano")
+        # Filtra anos > 0 para evitar lixo de data
+        anos_disponiveis = sorted(df[df["ano"] > 0]["ano"].unique())
+        if len(anos_disponiveis) > 0:
+            ano_min_default = min(anos_disponiveis)
+            ano_max_default = max(anos_disponiveis)
+            ano_min, ano_max = st.select_slider(
+                "Selecione o intervalo de anos:",
+                options=anos_disponiveis,
+                value=(ano_min_default, ano_max_default),
+                key="filtro_anos"
+            )
+        else:
+            st.warning("Dados de ano inválidos ou incompletos.")
+            ano_min, ano_max = 0, datetime.now().year
 
     
-    st.markdown("---")
-    
-    # Filtro de notas
-    st.markdown("#### ⭐ Filtro por Nota")
-    score_min, score_max = st.slider(
-        "Selecione a faixa de notas:",
-        min_value=0.0,
-        max_value=10.0,
-        value=(0.0, 10.0),
-        step=0.1
-    )
+        st.markdown("---")
     
-    st.markdown("---")
+        # Filtro de notas
+        st.markdown("#### ⭐ Filtro por Nota")
+        score_min, score_max = st.slider(
+            "Selecione a faixa de notas:",
+            min_value=0.0,
+            max_value=10.0,
+            value=(0.0, 10.0),
+            step=0.1,
+            key="filtro_notas"
+        )
     
-    # Filtro de receita
-    st.markdown("#### 💰 Filtro por Receita")
-    receita_max_global = df["revenue"].max()
-    receita_min, receita_max = st.slider(
-        "Selecione a faixa de receita:",
-        min_value=0.0,
-        max_value=float(receita_max_global),
-        value=(0.0, float(receita_max_global)),
-        step=1_000_000.0,
-        format="$%.0f"
-    )
+        st.markdown("---")
+    
+        # Filtro de receita
+        st.markdown("#### 💰 Filtro por Receita")
+        receita_max_global = df["revenue"].max()
+        receita_min, receita_max = st.slider(
+            "Selecione a faixa de receita:",
+            min_value=0.0,
+            max_value=float(receita_max_global),
+            value=(0.0, float(receita_max_global)),
+            step=1_000_000.0,
+            format="$%.0f",
+            key="filtro_receita"
+        )
+
+        st.form_submit_button("Aplicar filtros", type="primary", use_container_width=True)
+cronometro.marcar("barra_lateral")
 
 # Aplicar filtro principal
-df_filtrado = df[
-    (df["ano"] >= ano_min) &
-    (df["ano"] <= ano_max) &
-    (df["score"] >= score_min) &
-    (df["score"] <= score_max) &
-    (df["revenue"] >= receita_min) &
-    (df["revenue"] <= receita_max)
-].copy()
-
-# Aplicar tradução aos nomes dos filmes
-df_filtrado["names"] = df_filtrado["names"].apply(traduzir_nome_filme)
-
-if df_filtrado.empty:
+filtros = Filtros(ano_min, ano_max, score_min, score_max, receita_min, receita_max)
+linhas_filtradas = consultas.selecionar(filtros)
+
+if len(linhas_filtradas) == 0:
     st.error("Nenhum dado encontrado com os filtros selecionados.")
     st.stop()
+cronometro.marcar("filtro")
+
+# Agregações e recortes calculados sob demanda (no máximo uma vez por rerun):
+# quando todas as figuras vêm do cache, nenhum trabalho de pandas é feito.
+_agregados = {}
+
+def agregado(*por):
+    """Agregação da seleção pelas dimensões `por` (cubo ou SQL), memorizada durante o rerun."""
+    if por not in _agregados:
+        with cronometro.medir(f"agregado:{'+'.join(por) or 'total'}"):
+            _agregados[por] = consultas.agregar(filtros, por)
+    return _agregados[por]
+
+def quantis_filtrados(coluna, *qs):
+    """Quantis aproximados (erro relativo ≤ 1%) de `coluna` na seleção, pelos esboços do cubo."""
+    chave = ("quantis", coluna) + qs
+    if chave not in _agregados:
+        with cronometro.medir(f"quantis:{coluna}"):
+            _agregados[chave] = cubo.quantis(filtros, coluna, qs)
+    return _agregados[chave]
+
+def agregado_aproximado(*por):
+    """Agregação da seleção estimada pela amostra estratificada, memorizada durante o rerun."""
+    chave = ("aproximado",) + por
+    if chave not in _agregados:
+        with cronometro.medir(f"aproximado:{'+'.join(por) or 'total'}"):
+            _agregados[chave] = amostra.consultar(filtros, por)
+    return _agregados[chave]
+
+def chave_figura(id_grafico, parametros):
+    """Chave do cache de figuras: gráfico, versão dos dados, filtros e parâmetros."""
+    return (id_grafico, df.attrs.get("impressao_digital"), filtros, parametros)
+
+def figuras_em_cache(*pedidos):
+    """
+    Figuras de gráficos independentes, na ordem dos `pedidos` (a do layout).
+    Cada pedido é (id_grafico, preparar, parametros): `preparar()` roda na
+    thread do script só para os gráficos fora do cache (agregações
+    memorizadas) e devolve a TarefaGrafico que o pool de gráficos constrói.
+    """
+    chaves = [chave_figura(id_grafico, parametros) for id_grafico, _, parametros in pedidos]
+    figuras = [cache_figuras.obter(chave) for chave in chaves]
+    faltando = [i for i, figura in enumerate(figuras) if figura is AUSENTE]
+    tamanhos = {}
+    if faltando:
+        cronometro.contar("cache_figuras_falhas", len(faltando))
+        tarefas = [pedidos[i][1]() for i in faltando]
+        with cronometro.medir(f"graficos:{pool_graficos.modo}"):
+            construidas = pool_graficos.construir(tarefas)
+        for i, (figura, tamanho, segundos, segundos_json) in zip(faltando, construidas):
+            cronometro.somar(f"grafico:{pedidos[i][0]}", segundos)
+            cronometro.somar("serializar:figuras", segundos_json)
+            cache_figuras.guardar(chaves[i], figura, tamanho)
+            figuras[i] = figura
+            tamanhos[i] = tamanho
+    cronometro.contar("figuras", len(pedidos))
+    if diagnostico_ativo:
+        # Tamanho já medido na construção ou pelo cache
+        for i, chave in enumerate(chaves):
+            tamanho = tamanhos[i] if i in tamanhos else cache_figuras.tamanho(chave)
+            cronometro.contar("bytes_figuras", tamanho if tamanho is not None else tamanho_figura(figuras[i]))
+    return figuras
+
+def figura_em_cache(id_grafico, preparar, *parametros):
+    """Figura de um único gráfico pelo cache (gráfico, versão dos dados, filtros, parâmetros)."""
+    return figuras_em_cache((id_grafico, preparar, parametros))[0]
+
+def exibir_grafico(figura):
+    """st.plotly_chart com o tempo de serialização/envio medido."""
+    with cronometro.medir("exibir:plotly_chart"):
+        st.plotly_chart(figura, use_container_width=True)
+
+def avisar_aproximado(aviso):
+    """Legenda das estimativas da amostra no st.empty `aviso` (limpo quando chegam as exatas)."""
+    aviso.caption(f"≈ Estimativas pela amostra estratificada ({len(amostra):,} de {amostra.n_base:,} filmes, "
+                  "intervalo de 95%); calculando os valores exatos…")
+
+def figuras_progressivas(vazios, aviso, pedidos_de):
+    """
+    Exibe nos `vazios` (st.empty, na ordem dos pedidos) as figuras de
+    `pedidos_de(agregado)`. Com a amostra ativa e alguma figura fora do
+    cache, as de `pedidos_de(agregado_aproximado)` aparecem antes, com a
+    legenda em `aviso`, e são trocadas pelas exatas quando o cubo responde.
+    """
+    pedidos = pedidos_de(agregado)
+    if amostra is not None and any(cache_figuras.tamanho(chave_figura(id_grafico, parametros)) is None
+                                   for id_grafico, _, parametros in pedidos):
+        with cronometro.medir("graficos:aproximados"):
+            tarefas = [preparar() for _, preparar, _ in pedidos_de(agregado_aproximado)]
+            aproximadas = [tarefa.funcao(*tarefa.argumentos) for tarefa in tarefas]
+        avisar_aproximado(aviso)
+        for vazio, figura in zip(vazios, aproximadas):
+            with vazio:
+                exibir_grafico(figura)
+    for vazio, figura in zip(vazios, figuras_em_cache(*pedidos)):
+        with vazio:
+            exibir_grafico(figura)
+    aviso.empty()
 
 
 # =========================
@@ -626,226 +319,416 @@ if df_filtrado.empty:
 # =========================
 st.markdown('<h1 class="main-header">🎬 CineAnalytics</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Dashboard Completo com Todas as Análises do Colab</p>', unsafe_allow_html=True)
+cronometro.marcar("cabecalho")
 
 # =========================
 # SISTEMA DE ABAS COM TODOS OS GRÁFICOS DO COLAB
 # =========================
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "🏆 Top Filmes", 
-    "📈 Tendências Temporais", 
-    "🎯 Relações e Correlações",
-    "🌎 Distribuições",
-    "📊 Análise Financeira",
-    "📅 Sazonalidade",
-    "🔍 Dados Completos"
-])
-
-with tab1:
+# Cada aba é uma função; só a aba ativa é executada no modo preguiçoso.
+# As figuras de uma aba são pedidas juntas (figuras_em_cache), para que o
+# pool de gráficos as construa em paralelo, e exibidas na ordem do layout.
+@st.fragment
+def fragmento_top_filmes():
+    """
+    top_n e o gráfico que ele controla: mudar o slider reexecuta só este
+    fragmento, sobre a seleção (filtros, linhas) do último rerun completo.
+    """
+    if rerun_de_fragmento():
+        reruns = contar_rerun(st.session_state, "fragmento:top_filmes")
+        if DIAGNOSTICO:
+            # O painel de diagnóstico fica fora do fragmento: a contagem vai ao log
+            configurar_log_json()
+            registrar_json("rerun_fragmento", fragmento="top_filmes", reruns=reruns)
+    top_n = st.slider("Número de filmes:", 5, 20, key="top_n")
+    exibir_grafico(figura_em_cache("top_filmes", lambda: TarefaGrafico(
+        criar_grafico_top_filmes,
+        (df, consultas.maiores(filtros, linhas_filtradas, "revenue", top_n), top_n),
+        ("names", "revenue", "score")), top_n))
+
+def renderizar_aba_top_filmes():
+    """Aba 1: filmes mais populares"""
     st.markdown('<div class="section-header">🏆 Análise dos Filmes Mais Populares</div>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### Top Filmes por Receita")
-        top_n = st.slider("Número de filmes:", 5, 20, 10, key="top_n")
-        fig_top = criar_grafico_top_filmes(df_filtrado, top_n)
-        st.plotly_chart(fig_top, use_container_width=True)
+        fragmento_top_filmes()
+    fig_dist_notas = figura_em_cache("distribuicao_notas", lambda: TarefaGrafico(
+        criar_grafico_distribuicao_notas, (df, linhas_filtradas), ("score",)))
     
     with col2:
         st.markdown("#### Distribuição de Notas")
-        fig_dist_notas = criar_grafico_distribuicao_notas(df_filtrado)
-        st.plotly_chart(fig_dist_notas, use_container_width=True)
+        exibir_grafico(fig_dist_notas)
+
+def pedidos_tendencias(agregar):
+    """Gráficos da aba 2 sobre as agregações por ano de `agregar` (exatas ou da amostra)."""
+    return (
+        ("evolucao_receita_anual", lambda: TarefaGrafico(criar_grafico_evolucao_receita_anual, (agregar("ano"),)), ()),
+        ("filmes_por_ano", lambda: TarefaGrafico(criar_grafico_filmes_por_ano, (agregar("ano"),)), ()),
+        ("media_notas_ano", lambda: TarefaGrafico(criar_grafico_media_notas_ano, (agregar("ano"),)), ()),
+        ("decadas", lambda: TarefaGrafico(criar_grafico_decadas, (agregar("ano"),)), ()),
+    )
 
-with tab2:
+def renderizar_aba_tendencias():
+    """Aba 2: análise temporal e evolução"""
     st.markdown('<div class="section-header">📈 Análise Temporal e Evolução</div>', unsafe_allow_html=True)
+    aviso = st.empty()
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### Evolução da Receita Anual")
-        fig_evolucao_receita = criar_grafico_evolucao_receita_anual(df_filtrado)
-        st.plotly_chart(fig_evolucao_receita, use_container_width=True)
+        vazio_evolucao_receita = st.empty()
         
         st.markdown("#### Quantidade de Filmes por Ano")
-        fig_filmes_ano = criar_grafico_filmes_por_ano(df_filtrado)
-        st.plotly_chart(fig_filmes_ano, use_container_width=True)
+        vazio_filmes_ano = st.empty()
     
     with col2:
         st.markdown("#### Evolução das Notas Médias")
-        fig_media_notas = criar_grafico_media_notas_ano(df_filtrado)
-        st.plotly_chart(fig_media_notas, use_container_width=True)
+        vazio_media_notas = st.empty()
         
         st.markdown("#### Análise por Décadas")
-        fig_decadas = criar_grafico_decadas(df_filtrado)
-        st.plotly_chart(fig_decadas, use_container_width=True)
+        vazio_decadas = st.empty()
+    
+    figuras_progressivas([vazio_evolucao_receita, vazio_filmes_ano, vazio_media_notas, vazio_decadas],
+                         aviso, pedidos_tendencias)
 
-with tab3:
+def renderizar_aba_relacoes():
+    """Aba 3: relações entre variáveis"""
     st.markdown('<div class="section-header">🎯 Relações entre Variáveis</div>', unsafe_allow_html=True)
     
+    fig_dispersao, fig_orcamento_receita = figuras_em_cache(
+        ("dispersao_nota_receita", lambda: TarefaGrafico(
+            criar_grafico_dispercao_nota_receita, (df, linhas_filtradas), ("score", "revenue", "names")), ()),
+        ("orcamento_vs_receita", lambda: TarefaGrafico(
+            criar_grafico_orcamento_vs_receita, (df, linhas_filtradas), ("budget_x", "revenue", "names", "score")), ()),
+    )
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### Nota vs Receita")
-        fig_dispersao = criar_grafico_dispercao_nota_receita(df_filtrado)
         if fig_dispersao:
-            st.plotly_chart(fig_dispersao, use_container_width=True)
+            exibir_grafico(fig_dispersao)
         else:
             st.info("Não há dados suficientes para este gráfico")
     
     with col2:
         st.markdown("#### Orçamento vs Receita")
-        fig_orcamento_receita = criar_grafico_orcamento_vs_receita(df_filtrado)
         if fig_orcamento_receita:
-            st.plotly_chart(fig_orcamento_receita, use_container_width=True)
+            exibir_grafico(fig_orcamento_receita)
         else:
             st.info("Não há dados de orçamento suficientes")
 
-with tab4:
+def renderizar_aba_distribuicoes():
+    """Aba 4: distribuições e categorias"""
     st.markdown('<div class="section-header">🌎 Distribuições e Categorias</div>', unsafe_allow_html=True)
     
+    fig_idiomas, fig_success, fig_mapa = figuras_em_cache(
+        ("distribuicao_idiomas", lambda: TarefaGrafico(criar_grafico_distribuicao_idiomas, (agregado("orig_lang"),)), ()),
+        ("categorias_sucesso", lambda: TarefaGrafico(
+            criar_grafico_categorias_sucesso, (df, linhas_filtradas), ("success_category",)), ()),
+        # Usando a função criar_grafico_correlacao para o Mapa Mundi
+        ("mapa_paises", lambda: TarefaGrafico(criar_grafico_correlacao, (agregado("country_iso3"), nomes_paises())), ()),
+    )
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### Distribuição de Idiomas")
-        fig_idiomas = criar_grafico_distribuicao_idiomas(df_filtrado)
-        st.plotly_chart(fig_idiomas, use_container_width=True)
+        exibir_grafico(fig_idiomas)
     
     with col2:
         st.markdown("#### Categorias de Sucesso")
-        success_dist = df_filtrado['success_category'].value_counts()
-        if len(success_dist) > 0:
-            fig_success = px.pie(
-                values=success_dist.values,
-                names=success_dist.index,
-                title="Distribuição por Categoria de Sucesso",
-                hole=0.4,
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_success.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white')
-            )
-            st.plotly_chart(fig_success, use_container_width=True)
+        if fig_success:
+            exibir_grafico(fig_success)
         else:
             st.info("Não há dados para categorias de sucesso")
             
     st.markdown("---")
     st.markdown("#### Distribuição Geográfica de Receita")
-    # Usando a função criar_grafico_correlacao para o Mapa Mundi
-    fig_mapa = criar_grafico_correlacao(df_filtrado)
     if fig_mapa:
-        st.plotly_chart(fig_mapa, use_container_width=True)
+        exibir_grafico(fig_mapa)
     else:
         st.info("O mapa mundi não pôde ser gerado. Verifique a coluna 'country'.")
+    nao_resolvidos = df.attrs.get("paises_nao_resolvidos", [])
+    if nao_resolvidos:
+        st.caption(f"⚠️ Países não reconhecidos (fora do mapa): {', '.join(nao_resolvidos)}")
+
+METRICAS_FINANCEIRAS = {
+    "receita_total": ("💰 Receita Total", "${:,.0f}"),
+    "receita_media": ("📊 Receita Média", "${:,.0f}"),
+    "roi_medio": ("📈 ROI Médio", "{:.1f}%"),
+    "orcamento_medio": ("💸 Orçamento Médio", "${:,.0f}"),
+}
+
+def exibir_metricas_financeiras(valores, margens=None):
+    """KPIs da aba 5; com `margens` ({kpi: margem de 95%}), valores estimados ± margem."""
+    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+    for kpi, (rotulo, formato) in METRICAS_FINANCEIRAS.items():
+        valor = valores[kpi]
+        if pd.isna(valor):
+            texto = "N/A"
+        elif margens:
+            texto = f"≈ {formato.format(valor)} ± {formato.format(margens[kpi])}"
+        else:
+            texto = formato.format(valor)
+        st.metric(rotulo, texto)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-with tab5:
+def renderizar_aba_financeira():
+    """Aba 5: análise financeira"""
     st.markdown('<div class="section-header">📊 Análise Financeira Detalhada</div>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Métricas financeiras
-        if not df_filtrado.empty:
-            receita_total = df_filtrado["revenue"].sum()
-            receita_media = df_filtrado["revenue"].mean()
-            roi_medio = df_filtrado["roi"].mean()
-            orcamento_medio = df_filtrado[df_filtrado["budget_x"] > 0]["budget_x"].mean()
-            
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("💰 Receita Total", f"${receita_total:,.0f}")
-            st.metric("📊 Receita Média", f"${receita_media:,.0f}")
-            st.metric("📈 ROI Médio", f"{roi_medio:.1f}%")
-            st.metric("💸 Orçamento Médio", f"${orcamento_medio:,.0f}" if not pd.isna(orcamento_medio) else "N/A")
-            st.markdown('</div>', unsafe_allow_html=True)
+        if len(linhas_filtradas) > 0:
+            # Em bases grandes, estimativas da amostra primeiro; o cubo as substitui
+            vazio_metricas = st.empty()
+            aviso = st.empty()
+            if amostra is not None:
+                with cronometro.medir("aproximado:kpis"):
+                    estimados = amostra.kpis(filtros)
+                with vazio_metricas.container():
+                    exibir_metricas_financeiras({kpi: estimativa for kpi, (estimativa, _) in estimados.items()},
+                                                {kpi: margem for kpi, (_, margem) in estimados.items()})
+                avisar_aproximado(aviso)
+            totais = agregado().iloc[0]
+            with vazio_metricas.container():
+                exibir_metricas_financeiras({
+                    "receita_total": totais["receita_soma"],
+                    "receita_media": totais["receita_media"],
+                    "roi_medio": totais["roi_medio"],
+                    "orcamento_medio": totais["orcamento_medio"],
+                })
+            aviso.empty()
+
+            # Limites das categorias de sucesso recalculados para a seleção atual
+            q40, q60, q80 = quantis_filtrados("revenue", 0.4, 0.6, 0.8)
+            p25, p50, p75 = quantis_filtrados("score", 0.25, 0.5, 0.75)
+            st.caption(
+                f"Receita na seleção — 40%: ${q40:,.0f} · 60%: ${q60:,.0f} · 80%: ${q80:,.0f}  \n"
+                f"Notas — 25%: {p25:.1f} · mediana: {p50:.1f} · 75%: {p75:.1f}  \n"
+                "Quantis aproximados (erro relativo de até 1%)."
+            )
 
         else:
             st.info("Não há dados financeiros disponíveis")
     
     with col2:
         st.markdown("#### Top Filmes por ROI")
-        # Filtra filmes com ROI > 0 e orçamento > 0 para evitar distorções
-        df_roi = df_filtrado[(df_filtrado['roi'] > 0) & (df_filtrado['budget_x'] > 0)].nlargest(10, 'roi')
-        if not df_roi.empty:
-            fig_roi = px.bar(
-                df_roi,
-                x='roi',
-                y='names',
-                orientation='h',
-                title='📈 Top Filmes por ROI',
-                labels={'roi': 'ROI (%)', 'names': 'Filme'},
-                color='roi',
-                color_continuous_scale='viridis'
-            )
-            fig_roi.update_layout(
-                yaxis={'categoryorder': 'total ascending'},
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                height=400
-            )
-            st.plotly_chart(fig_roi, use_container_width=True)
+        fig_roi = figura_em_cache("top_roi", lambda: TarefaGrafico(
+            criar_grafico_top_roi,
+            (df, consultas.maiores(filtros, linhas_filtradas, "roi", 10, positivas=("roi", "budget_x"))),
+            ("names", "roi", "budget_x")))
+        if fig_roi:
+            exibir_grafico(fig_roi)
         else:
             st.info("Não há dados de ROI positivos disponíveis")
 
-with tab6:
+def renderizar_aba_sazonalidade():
+    """Aba 6: sazonalidade"""
     st.markdown('<div class="section-header">📅 Análise de Sazonalidade</div>', unsafe_allow_html=True)
     
-    fig_sazonalidade = criar_grafico_sazonalidade(df_filtrado)
+    fig_sazonalidade, fig_mensal, fig_count_mensal = figuras_em_cache(
+        ("sazonalidade", lambda: TarefaGrafico(criar_grafico_sazonalidade, (agregado("mes"),)), ()),
+        ("receita_mensal", lambda: TarefaGrafico(criar_grafico_receita_mensal, (agregado("mes"),)), ()),
+        ("filmes_mensal", lambda: TarefaGrafico(criar_grafico_filmes_mensal, (agregado("mes"),)), ()),
+    )
     if fig_sazonalidade:
-        st.plotly_chart(fig_sazonalidade, use_container_width=True)
+        exibir_grafico(fig_sazonalidade)
     else:
         st.info("Dados de sazonalidade não disponíveis (verifique a coluna 'date_x')")
     
     # Análise adicional de meses
-    if 'mes' in df_filtrado.columns:
+    if 'mes' in df.columns:
         col1, col2 = st.columns(2)
         
         with col1:
-            meses_ordenados = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            # CORREÇÃO: Usar a coluna 'mes' para agrupar, mas usar o mapeamento para Plotly
-            receita_mensal = df_filtrado.groupby('mes')['revenue'].mean().reset_index()
-            
-            if len(receita_mensal) > 0:
-                fig_mensal = px.bar(
-                    receita_mensal,
-                    x=receita_mensal['mes'].apply(lambda x: meses_ordenados[x-1]),
-                    y='revenue',
-                    title='💰 Receita Média por Mês',
-                    labels={'x': 'Mês', 'revenue': 'Receita Média'},
-                    color='revenue',
-                    color_continuous_scale='blues'
-                )
-                fig_mensal.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    xaxis={'categoryorder':'array', 'categoryarray': meses_ordenados} # Ordena os meses
-                )
-                st.plotly_chart(fig_mensal, use_container_width=True)
+            if fig_mensal:
+                exibir_grafico(fig_mensal)
         
         with col2:
-            filmes_mensal = df_filtrado.groupby('mes').size().reset_index(name='count')
-            
-            if len(filmes_mensal) > 0:
-                fig_count_mensal = px.bar(
-                    filmes_mensal,
-                    x=filmes_mensal['mes'].apply(lambda x: meses_ordenados[x-1]),
-                    y='count',
-                    title='🎬 Número de Filmes por Mês',
-                    labels={'x': 'Mês', 'count': 'Número de Filmes'},
-                    color='count',
-                    color_continuous_scale='greens'
-                )
-                fig_count_mensal.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    xaxis={'categoryorder':'array', 'categoryarray': meses_ordenados} # Ordena os meses
-                )
-                st.plotly_chart(fig_count_mensal, use_container_width=True)
+            if fig_count_mensal:
+                exibir_grafico(fig_count_mensal)
                 
-with tab7:
+def renderizar_aba_dados():
+    """Aba 7: dados completos"""
     st.markdown('<div class="section-header">🔍 Dados Completos</div>', unsafe_allow_html=True)
-    st.dataframe(df_filtrado)
+
+    # Só a página visível é enviada; busca (índice invertido) e ordenação rodam no servidor
+    colunas_visiveis = [coluna for coluna in df.columns if not coluna.startswith("_")]
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        busca = st.text_input("Buscar texto:", key="tabela_busca", placeholder="Título, elenco, sinopse...",
+                              help="Sem diferenciar acentos; vários termos são combinados (E) e o último vale como prefixo.")
+    with col2:
+        ordenar_por = st.selectbox("Ordenar por:", [None] + colunas_visiveis, key="tabela_ordenar",
+                                   format_func=rotulo_opcional)
+    with col3:
+        crescente = st.radio("Ordem:", ["Crescente", "Decrescente"], key="tabela_ordem") == "Crescente"
+    with col4:
+        opcoes_tamanho = sorted({25, 50, 100, 250, 500, TAMANHO_PAGINA_TABELA})
+        tamanho_pagina = st.selectbox("Linhas por página:", opcoes_tamanho, key="tabela_tamanho")
+    colunas = st.multiselect("Colunas:", colunas_visiveis, key="tabela_colunas")
+    if not colunas:
+        st.info("Selecione ao menos uma coluna.")
+        return
+
+    with cronometro.medir("tabela:busca"):
+        # Resultado da busca já vem por relevância (mantida quando não há ordenação).
+        # Fica nos resultados da sessão: trocar de página ou de ordenação não repete a busca
+        chave_busca = ("busca", df.attrs.get("impressao_digital"), filtros, busca)
+        linhas_busca = resultados_sessao.obter(chave_busca) if busca.strip() else linhas_filtradas
+        if linhas_busca is AUSENTE:
+            linhas_busca = indice_busca.buscar(busca, linhas_filtradas)
+            resultados_sessao.guardar(chave_busca, linhas_busca)
+    pagina = st.session_state.get("tabela_pagina", 1)
+    with cronometro.medir("tabela:pagina"):
+        pagina_df, total = pagina_tabela(df, linhas_busca, colunas, pagina, tamanho_pagina,
+                                         ordenar_por, crescente)
+    total_paginas = max(1, -(-total // tamanho_pagina))
+    if pagina > total_paginas:
+        # A busca ou o filtro encolheram o resultado: volta para a última página
+        pagina = total_paginas
+        pagina_df, total = pagina_tabela(df, linhas_busca, colunas, pagina, tamanho_pagina,
+                                         ordenar_por, crescente)
+        st.session_state["tabela_pagina"] = pagina
+
+    with cronometro.medir("exibir:dataframe"):
+        st.dataframe(pagina_df, use_container_width=True)
+    if diagnostico_ativo:
+        cronometro.contar("bytes_tabela", memoria_frame(pagina_df))
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Página:", min_value=1, max_value=total_paginas, step=1, key="tabela_pagina")
+    with col2:
+        inicio = (pagina - 1) * tamanho_pagina
+        st.caption(f"Mostrando {min(inicio + 1, total):,}–{min(inicio + tamanho_pagina, total):,} "
+                   f"de {total:,} filmes · página {pagina} de {total_paginas}")
+
+    with st.expander("⬇️ Exportar seleção"):
+        # Exporta filtros, busca, ordem e colunas atuais em blocos, direto da base
+        formato = st.radio("Formato:", list(FORMATOS), key="exportacao_formato", horizontal=True)
+        chave_exportacao = ("exportacao", df.attrs.get("impressao_digital"), filtros, busca,
+                            ordenar_por, crescente, tuple(colunas), formato)
+        caminho = resultados_sessao.obter(chave_exportacao)
+        if st.button(f"Preparar {formato.upper()} ({total:,} filmes)", key="exportacao_preparar"):
+            barra = st.progress(0.0, text="Exportando...")
+            with cronometro.medir("exportacao"):
+                linhas_exportadas = ordenar_ate(df, linhas_busca, ordenar_por, crescente, len(linhas_busca))
+                caminho = exportar(df, linhas_exportadas, colunas, formato,
+                                   progresso=lambda fracao: barra.progress(fracao, text="Exportando..."))
+            barra.empty()
+            resultados_sessao.guardar(chave_exportacao, caminho)
+        if caminho is not AUSENTE and caminho.exists():
+            tamanho = caminho.stat().st_size / 2**20
+            if st.get_option("server.enableStaticServing"):
+                # Servido do disco pelo servidor estático, sem passar pela memória do app
+                st.markdown(f'<a href="app/static/exportacoes/{caminho.name}" download="{caminho.name}">'
+                            f"📥 Baixar {caminho.name} ({tamanho:,.1f} MiB)</a>", unsafe_allow_html=True)
+            else:
+                with open(caminho, "rb") as arquivo:
+                    st.download_button(f"📥 Baixar ({tamanho:,.1f} MiB)", arquivo, file_name=caminho.name,
+                                       mime=FORMATOS[formato][0], key="exportacao_baixar")
+
+ABAS = {
+    "top_filmes": ("🏆 Top Filmes", renderizar_aba_top_filmes),
+    "tendencias": ("📈 Tendências Temporais", renderizar_aba_tendencias),
+    "relacoes": ("🎯 Relações e Correlações", renderizar_aba_relacoes),
+    "distribuicoes": ("🌎 Distribuições", renderizar_aba_distribuicoes),
+    "financeira": ("📊 Análise Financeira", renderizar_aba_financeira),
+    "sazonalidade": ("📅 Sazonalidade", renderizar_aba_sazonalidade),
+    "dados": ("🔍 Dados Completos", renderizar_aba_dados),
+}
+
+# Valores iniciais dos widgets das abas vêm só do Session State (os widgets
+# não recebem value/index/default, que conflitariam com a preservação abaixo)
+st.session_state.setdefault("top_n", 10)
+st.session_state.setdefault("tabela_tamanho", TAMANHO_PAGINA_TABELA)
+st.session_state.setdefault("tabela_colunas", [coluna for coluna in df.columns if not coluna.startswith("_")])
+
+if ABAS_PREGUICOSAS:
+    # Só a aba visível calcula e envia suas figuras. Widgets de abas ocultas
+    # deixam de ser renderizados, então seus valores são preservados à mão.
+    for chave in ("top_n", "tabela_busca", "tabela_ordenar", "tabela_ordem",
+                  "tabela_tamanho", "tabela_colunas", "tabela_pagina", "exportacao_formato"):
+        if chave in st.session_state:
+            st.session_state[chave] = st.session_state[chave]
+    aba_ativa = st.radio(
+        "Seção",
+        options=list(ABAS),
+        # Rótulos num dict próprio: ABAS guarda funções do script, que não devem ficar presas à sessão
+        format_func={chave: rotulo for chave, (rotulo, _) in ABAS.items()}.get,
+        horizontal=True,
+        key="aba_ativa",
+        label_visibility="collapsed"
+    )
+    cronometro.marcar("cabecalho")
+    ABAS[aba_ativa][1]()
+    cronometro.marcar(aba_ativa)
+else:
+    for container, (chave, (_, renderizar)) in zip(st.tabs([rotulo for rotulo, _ in ABAS.values()]), ABAS.items()):
+        with container:
+            renderizar()
+        cronometro.marcar(chave)
+
+# =========================
+# DIAGNÓSTICO (OPT-IN)
+# =========================
+@st.cache_resource(max_entries=4)
+def memoria_dados(impressao_digital, _df, _cubo):
+    """Bytes do DataFrame base e das células do cubo, medidos uma vez por versão."""
+    return {"dados_bytes": memoria_frame(_df), "cubo_bytes": memoria_frame(_cubo.celulas)}
+
+if diagnostico_ativo:
+    resumo = cronometro.resumo()
+    resumo["linhas"] = {"total": len(df), "filtradas": len(linhas_filtradas)}
+    resumo["backend"] = consultas.nome
+    resumo["motor_json"] = MOTOR_JSON
+    resumo["sessao"] = {
+        "bytes": bytes_da_sessao(st.session_state),
+        "resultados_bytes": resultados_sessao.bytes_usados,
+        "orcamento_bytes": resultados_sessao.orcamento_bytes,
+    }
+    resumo["reruns"] = dict(contagem_reruns)
+    resumo["memoria"] = memoria_dados(df.attrs.get("impressao_digital"), df, cubo)
+    resumo["cache_figuras"] = cache_figuras.estatisticas()
+    if DIAGNOSTICO:
+        configurar_log_json()
+        registrar_json("rerun", **resumo)
+    with st.sidebar.expander("🩺 Diagnóstico", expanded=False):
+        st.metric("Rerun", f"{resumo['total_segundos'] * 1000:,.0f} ms",
+                  help=f"Seção mais lenta: {resumo['secao_mais_lenta']} · backend: {resumo['backend']}")
+        tempos = [("seção", nome, segundos) for nome, segundos in resumo["secoes"].items()]
+        tempos += [("operação", nome, segundos) for nome, segundos in resumo["operacoes"].items()]
+        st.dataframe(
+            pd.DataFrame(tempos, columns=["tipo", "nome", "segundos"]).sort_values("segundos", ascending=False),
+            hide_index=True, use_container_width=True
+        )
+        estatisticas = resumo["cache_figuras"]
+        st.caption(
+            f"Cache de figuras: {estatisticas['itens']} itens · "
+            f"{estatisticas['bytes_usados'] / 2**20:,.1f} de {estatisticas['orcamento_bytes'] / 2**20:,.0f} MiB · "
+            f"acerto {estatisticas['taxa_acerto']:.0%} · "
+            f"falhas neste rerun: {resumo['contadores'].get('cache_figuras_falhas', 0)}"
+        )
+        st.caption(
+            f"Memória: dados {resumo['memoria']['dados_bytes'] / 2**20:,.1f} MiB · "
+            f"cubo {resumo['memoria']['cubo_bytes'] / 2**20:,.1f} MiB · "
+            f"payload {(resumo['contadores'].get('bytes_figuras', 0) + resumo['contadores'].get('bytes_tabela', 0)) / 2**10:,.0f} KiB"
+        )
+        st.caption(
+            f"Figuras: {resumo['contadores'].get('bytes_figuras', 0) / 2**10:,.0f} KiB de JSON ({resumo['motor_json']}) · "
+            f"serialização {resumo['operacoes'].get('serializar:figuras', 0.0) * 1000:,.1f} ms nas figuras construídas · "
+            f"envio {resumo['operacoes'].get('exibir:plotly_chart', 0.0) * 1000:,.1f} ms"
+        )
+        st.caption(
+            f"Sessão: {resumo['sessao']['bytes'] / 2**10:,.0f} KiB · resultados guardados "
+            f"{resumo['sessao']['resultados_bytes'] / 2**10:,.0f} KiB de {resumo['sessao']['orcamento_bytes'] / 2**20:,.0f} MiB"
+        )
+        st.caption(
+            f"Reruns nesta sessão: {resumo['reruns'].get('completo', 0)} completos · "
+            f"{sum(n for tipo, n in resumo['reruns'].items() if tipo.startswith('fragmento:'))} só de fragmentos"
+        )
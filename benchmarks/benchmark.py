@@ -0,0 +1,236 @@
+# =========================
+# BENCHMARK DE CARGA, FILTRO E GRÁFICOS
+# =========================
+# Mede, para cada tamanho de base sintética, o tempo e o pico de memória de
+# cada etapa do dashboard: leitura do CSV (fria, pelo snapshot e pelo
+# snapshot com uma parte incremental), índices,
+# filtro da barra lateral, busca textual e cada criar_grafico_*. Roda offline
+# e escreve uma linha JSON por etapa, para comparar execuções e achar o ponto
+# em que o dashboard deixa de ser interativo.
+#
+# Uso: python benchmarks/benchmark.py --tamanhos 10000 100000 1000000 --saida resultados.jsonl
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from busca import CAMPOS_BUSCA_IMDB, IndiceBusca  # noqa: E402
+from cache_figuras import tamanho_figura  # noqa: E402
+from consultas import BackendDuckDB  # noqa: E402
+from cubo import CuboOLAP  # noqa: E402
+from dados import atualizar_incremental, carregar_dados_tratados, enriquecer, nomes_paises  # noqa: E402
+from filtros import Filtros, MotorFiltros  # noqa: E402
+import graficos  # noqa: E402
+from gerar_dados import gravar_csv  # noqa: E402
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+# Acima deste tempo uma etapa já compromete a resposta de um rerun
+LIMITE_INTERATIVO_MS = 100
+# Fração final do CSV que chega como parte incremental do snapshot
+FRACAO_PARTE = 0.05
+
+
+def medir(funcao, repeticoes=3, preparar=None):
+    """
+    Executa `funcao` uma vez sob tracemalloc (pico de memória) e depois
+    `repeticoes` vezes sem rastreamento (tempo). Devolve o resultado da
+    primeira execução, a mediana em segundos e o pico em bytes.
+    Memória alocada fora do Python/NumPy (ex.: Arrow) não entra no pico.
+    """
+    if preparar:
+        preparar()
+    tracemalloc.start()
+    try:
+        resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return resultado, statistics.median(tempos), pico
+
+
+def filtros_padrao(df):
+    """Filtros iniciais do app (tudo selecionado), o pior caso de linhas."""
+    anos = df.loc[df["ano"] > 0, "ano"]
+    return Filtros(int(anos.min()), int(anos.max()), 0.0, 10.0, 0.0, float(df["revenue"].max()))
+
+
+def chamadas_graficos(df, linhas, cubo, filtros):
+    """Cada gráfico com as mesmas entradas que o app usa."""
+    por_ano = cubo.consultar(filtros, ["ano"])
+    por_mes = cubo.consultar(filtros, ["mes"])
+    por_idioma = cubo.consultar(filtros, ["orig_lang"])
+    por_pais = cubo.consultar(filtros, ["country_iso3"])
+    paises = nomes_paises()
+    return {
+        "criar_grafico_top_filmes": lambda: graficos.criar_grafico_top_filmes(df, linhas, 10),
+        "criar_grafico_dispercao_nota_receita": lambda: graficos.criar_grafico_dispercao_nota_receita(df, linhas),
+        "criar_grafico_evolucao_receita_anual": lambda: graficos.criar_grafico_evolucao_receita_anual(por_ano),
+        "criar_grafico_distribuicao_idiomas": lambda: graficos.criar_grafico_distribuicao_idiomas(por_idioma),
+        "criar_grafico_filmes_por_ano": lambda: graficos.criar_grafico_filmes_por_ano(por_ano),
+        "criar_grafico_media_notas_ano": lambda: graficos.criar_grafico_media_notas_ano(por_ano),
+        "criar_grafico_correlacao": lambda: graficos.criar_grafico_correlacao(por_pais, paises),
+        "criar_grafico_decadas": lambda: graficos.criar_grafico_decadas(por_ano),
+        "criar_grafico_sazonalidade": lambda: graficos.criar_grafico_sazonalidade(por_mes),
+        "criar_grafico_orcamento_vs_receita": lambda: graficos.criar_grafico_orcamento_vs_receita(df, linhas),
+        "criar_grafico_distribuicao_notas": lambda: graficos.criar_grafico_distribuicao_notas(df, linhas),
+        "criar_grafico_categorias_sucesso": lambda: graficos.criar_grafico_categorias_sucesso(df, linhas),
+        "criar_grafico_top_roi": lambda: graficos.criar_grafico_top_roi(df, linhas),
+        "criar_grafico_receita_mensal": lambda: graficos.criar_grafico_receita_mensal(por_mes),
+        "criar_grafico_filmes_mensal": lambda: graficos.criar_grafico_filmes_mensal(por_mes),
+    }
+
+
+def medir_snapshot_com_parte(csv, cache, completo, repeticoes, registrar):
+    """
+    Carga pelo snapshot mais uma parte incremental (as últimas FRACAO_PARTE
+    linhas do CSV). Os tipos das colunas precisam ser os mesmos da carga
+    completa: uma categórica que volta como object desfaz a economia de memória.
+    """
+    linhas_csv = csv.read_text(encoding="utf-8").splitlines(keepends=True)
+    base = csv.with_name(f"{csv.stem}-partes.csv")
+    base.write_text("".join(linhas_csv[:1 + int(len(linhas_csv[1:]) * (1 - FRACAO_PARTE))]), encoding="utf-8")
+    for arquivo in cache.glob("*"):
+        arquivo.unlink()
+    df = enriquecer(carregar_dados_tratados(base, cache))
+    base.write_text("".join(linhas_csv), encoding="utf-8")
+    atualizar_incremental(df, base, cache)
+    recarregado, segundos, pico = medir(lambda: carregar_dados_tratados(base, cache), repeticoes)
+    divergentes = {
+        coluna: (str(recarregado[coluna].dtype), str(completo[coluna].dtype))
+        for coluna in completo.columns if recarregado[coluna].dtype != completo[coluna].dtype
+    }
+    if divergentes:
+        raise RuntimeError(f"Snapshot com partes volta com tipos diferentes da carga completa: {divergentes}")
+    return registrar("carregar_snapshot_partes", segundos, pico,
+                     bytes_frame=int(recarregado.memory_usage(deep=True).sum()))
+
+
+def executar(n_linhas, diretorio, repeticoes, etapas=None):
+    """Gera a base de `n_linhas`, mede todas as etapas e devolve os registros."""
+    registros = []
+
+    def registrar(etapa, segundos, pico, **extras):
+        registro = {
+            "tamanho": n_linhas,
+            "etapa": etapa,
+            "segundos": round(segundos, 6),
+            "pico_memoria_bytes": pico,
+            "interativo": segundos * 1000 <= LIMITE_INTERATIVO_MS,
+            **extras,
+        }
+        registros.append(registro)
+        print(f"{n_linhas:>10} {etapa:<40} {segundos * 1000:>10.1f} ms {pico / 2**20:>9.1f} MiB", file=sys.stderr)
+        return registro
+
+    def deve_medir(etapa):
+        return etapas is None or etapa in etapas
+
+    csv = diretorio / f"imdb-{n_linhas}.csv"
+    if not csv.exists():
+        gravar_csv(n_linhas, csv)
+
+    # Leitura fria: sem snapshot, passa pelo CSV e grava o Parquet
+    cache_frio = diretorio / f"cache-frio-{n_linhas}"
+
+    def limpar_cache():
+        for arquivo in cache_frio.glob("*"):
+            arquivo.unlink()
+
+    bruto, segundos, pico = medir(lambda: carregar_dados_tratados(csv, cache_frio), 1, limpar_cache)
+    registrar("carregar_csv", segundos, pico)
+    if deve_medir("carregar_snapshot"):
+        _, segundos, pico = medir(lambda: carregar_dados_tratados(csv, cache_frio), repeticoes)
+        registrar("carregar_snapshot", segundos, pico)
+    if deve_medir("carregar_snapshot_partes"):
+        medir_snapshot_com_parte(csv, diretorio / f"cache-partes-{n_linhas}", bruto, repeticoes, registrar)
+
+    df, segundos, pico = medir(lambda: enriquecer(bruto), repeticoes)
+    registrar("enriquecer", segundos, pico)
+    cubo, segundos, pico = medir(lambda: CuboOLAP(df), 1)
+    registrar("indexar_cubo", segundos, pico, celulas=len(cubo))
+    motor, segundos, pico = medir(lambda: MotorFiltros(df), 1)
+    registrar("indexar_motor_filtros", segundos, pico)
+
+    filtros = filtros_padrao(df)
+    # Filtro original do app: máscara booleana + cópia do DataFrame
+    _, segundos, pico = medir(lambda: df[filtros.mascara(df)], repeticoes)
+    registrar("filtro_mascara", segundos, pico)
+    linhas, segundos, pico = medir(lambda: motor.selecionar(filtros), repeticoes)
+    registrar("filtro_motor", segundos, pico, linhas=len(linhas))
+    _, segundos, pico = medir(lambda: cubo.consultar(filtros, ["ano"]), repeticoes)
+    registrar("cubo_consultar_ano", segundos, pico)
+    _, segundos, pico = medir(lambda: cubo.quantis(filtros, "revenue", [0.4, 0.6, 0.8]), repeticoes)
+    registrar("cubo_quantis_receita", segundos, pico)
+
+    # Mesmas consultas empurradas para o DuckDB (se o pacote opcional existir)
+    try:
+        sql, segundos, pico = medir(lambda: BackendDuckDB(df, diretorio / f"duckdb-{n_linhas}"), 1)
+        registrar("duckdb_exportar", segundos, pico)
+    except ImportError:
+        sql = None
+    if sql is not None:
+        for etapa, consulta in (
+            ("duckdb_filtro", lambda: sql.selecionar(filtros)),
+            ("duckdb_agregar_ano", lambda: sql.agregar(filtros, ["ano"])),
+            ("duckdb_agregar_total", lambda: sql.agregar(filtros)),
+            ("duckdb_maiores_receita", lambda: sql.maiores(filtros, linhas, "revenue", 10)),
+        ):
+            if deve_medir(etapa):
+                _, segundos, pico = medir(consulta, repeticoes)
+                registrar(etapa, segundos, pico)
+
+    indice, segundos, pico = medir(lambda: IndiceBusca(df, CAMPOS_BUSCA_IMDB), 1)
+    registrar("indexar_busca", segundos, pico, termos=len(indice))
+    for etapa, consulta in (("busca_termo", "family"), ("busca_prefixo", "fam"), ("busca_varios_termos", "silva secret jo")):
+        if deve_medir(etapa):
+            resultado, segundos, pico = medir(lambda: indice.buscar(consulta, linhas), repeticoes)
+            registrar(etapa, segundos, pico, linhas=len(resultado))
+
+    for etapa, construtor in chamadas_graficos(df, linhas, cubo, filtros).items():
+        if not deve_medir(etapa):
+            continue
+        figura, segundos, pico = medir(construtor, repeticoes)
+        inicio = time.perf_counter()
+        bytes_figura = tamanho_figura(figura)
+        registrar(etapa, segundos, pico, bytes_figura=bytes_figura, segundos_serializacao=round(time.perf_counter() - inicio, 6))
+    return registros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do CineAnalytics sobre dados sintéticos.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--etapas", nargs="+", help="Mede só estas etapas (carga, índices e filtro sempre rodam)")
+    parser.add_argument("--diretorio", type=Path, help="Onde guardar os CSVs gerados (padrão: temporário)")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON lines (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = args.diretorio or Path(temporario)
+        diretorio.mkdir(parents=True, exist_ok=True)
+        registros = []
+        for n_linhas in args.tamanhos:
+            registros += executar(n_linhas, diretorio, args.repeticoes, set(args.etapas) if args.etapas else None)
+
+    linhas = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros)
+    if args.saida:
+        args.saida.write_text(linhas, encoding="utf-8")
+    else:
+        sys.stdout.write(linhas)
+
+
+if __name__ == "__main__":
+    main()
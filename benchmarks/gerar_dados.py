@@ -0,0 +1,79 @@
+# =========================
+# GERADOR DE DADOS SINTÉTICOS (ESQUEMA DO IMDb)
+# =========================
+# Produz CSVs com as mesmas colunas e formatos do imdb_movies.csv em qualquer
+# tamanho, sem acesso à internet. As distribuições imitam o arquivo real:
+# receitas com cauda longa, nomes repetidos, poucos países/idiomas dominantes.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+PAISES = ["US", "AU", "GB", "KR", "JP", "FR", "ES", "MX", "BR", "DE", "IT", "CN", "IN", "AR", "CA"]
+IDIOMAS = [" English", " Spanish", " Japanese", " Korean", " French", " Portuguese, Brazilian", " Italian", " German"]
+GENEROS = ["Drama", "Comedy", "Action, Adventure", "Horror, Thriller", "Animation, Family", "Documentary"]
+# Vocabulário das sinopses e do elenco (a busca textual precisa de texto variado)
+PALAVRAS = ("a young woman man family city war love secret journey mission friend father mother "
+            "detective killer ghost school island kingdom revenge dream power future past world "
+            "história amor ação família cidade segredo viagem missão coração sombra").split()
+NOMES = ("Ana Bruno Carla Diego Elena Felipe Gabriela Hugo Isabel João Kim Lucas Maria Nina "
+         "Otávio Paula Rafael Sofia Tomás Yuki").split()
+SOBRENOMES = "Silva Smith Santos Johnson Lee Park Tanaka Rossi Müller Dupont García Costa".split()
+
+
+def _pesos(n):
+    """Pesos decrescentes (Zipf) para as categorias."""
+    pesos = 1 / np.arange(1, n + 1)
+    return pesos / pesos.sum()
+
+
+def _frases(rng, palavras, n_palavras, n_linhas):
+    """`n_linhas` textos de `n_palavras` sorteadas com frequência Zipf."""
+    sorteio = rng.choice(np.array(palavras, dtype=object), (n_linhas, n_palavras), p=_pesos(len(palavras)))
+    return pd.Series(sorteio[:, 0]).str.cat([pd.Series(sorteio[:, i]) for i in range(1, n_palavras)], sep=" ")
+
+
+def _pessoa(rng, n_linhas):
+    return pd.Series(rng.choice(NOMES, n_linhas)) + " " + pd.Series(rng.choice(SOBRENOMES, n_linhas))
+
+
+def gerar_imdb(n_linhas, semente=0):
+    """DataFrame com `n_linhas` filmes sintéticos no formato do CSV bruto."""
+    rng = np.random.default_rng(semente)
+    datas = pd.Timestamp("1950-01-01") + pd.to_timedelta(rng.integers(0, 27_000, n_linhas), unit="D")
+    # Cerca de um terço dos títulos se repete (remakes, relançamentos)
+    n_titulos = max(n_linhas * 2 // 3, 1)
+    nota = np.round(rng.normal(6.5, 1.2, n_linhas).clip(0, 10), 1)
+    nota[rng.random(n_linhas) < 0.01] = np.nan
+    orcamento = np.round(rng.lognormal(17, 1.2, n_linhas), -3)
+    receita = np.round(orcamento * rng.lognormal(0.3, 1.0, n_linhas), -3)
+    receita[rng.random(n_linhas) < 0.05] = 0
+    return pd.DataFrame({
+        "names": pd.Series(rng.integers(0, n_titulos, n_linhas)).map("Filme {}".format),
+        "date_x": datas.strftime("%m/%d/%Y"),
+        "score": nota,
+        "genre": rng.choice(GENEROS, n_linhas, p=_pesos(len(GENEROS))),
+        "overview": _frases(rng, PALAVRAS, 12, n_linhas),
+        "crew": _pessoa(rng, n_linhas) + ", Personagem, " + _pessoa(rng, n_linhas) + ", Personagem",
+        "orig_title": pd.Series(rng.integers(0, n_titulos, n_linhas)).map("Original {}".format),
+        "status": " Released",
+        "orig_lang": rng.choice(IDIOMAS, n_linhas, p=_pesos(len(IDIOMAS))),
+        "budget_x": orcamento,
+        "revenue": receita,
+        "country": rng.choice(PAISES, n_linhas, p=_pesos(len(PAISES))),
+    })
+
+
+def gravar_csv(n_linhas, caminho, semente=0):
+    """Grava o CSV sintético em `caminho` e devolve o caminho."""
+    gerar_imdb(n_linhas, semente).to_csv(caminho, index=False)
+    return caminho
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um CSV sintético no esquema do IMDb.")
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("saida")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+    gravar_csv(args.linhas, args.saida, args.semente)
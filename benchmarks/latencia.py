@@ -0,0 +1,176 @@
+# =========================
+# HARNESS DE LATÊNCIA DO RERUN
+# =========================
+# Executa o app.py sem navegador (streamlit.testing AppTest) sobre uma base
+# local e mexe nos widgets como um usuário: intervalo de anos, faixas de nota
+# e receita e o top_n. Cada interação dispara um rerun completo do script; o
+# harness mede o tempo de ponta a ponta, a seção mais lenta (tempos marcados
+# pelo próprio app) e quantos elementos o rerun emitiu.
+#
+# Uso: python benchmarks/latencia.py --linhas 100000 --rodadas 5 --saida latencia.jsonl
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from gerar_dados import gravar_csv  # noqa: E402
+
+ABAS = ["top_filmes", "tendencias", "relacoes", "distribuicoes", "financeira", "sazonalidade", "dados"]
+
+
+def contar_elementos(no):
+    """Número de elementos (folhas) emitidos abaixo de `no` na árvore do AppTest."""
+    filhos = getattr(no, "children", None)
+    if filhos is None:
+        return 1
+    return sum(contar_elementos(filho) for filho in filhos.values())
+
+
+def mover_anos(app, rng):
+    widget = app.select_slider(key="filtro_anos")
+    anos = sorted(int(ano) for ano in widget.options)
+    inicio = int(rng.integers(0, max(len(anos) - 10, 1)))
+    fim = int(rng.integers(min(inicio + 10, len(anos) - 1), len(anos)))
+    widget.set_value((anos[inicio], anos[fim]))
+
+
+def mover_notas(app, rng):
+    app.slider(key="filtro_notas").set_value(
+        (round(float(rng.uniform(0, 5)), 1), round(float(rng.uniform(5, 10)), 1))
+    )
+
+
+def mover_receita(app, rng):
+    widget = app.slider(key="filtro_receita")
+    maximo = widget.max
+    passo = 1_000_000.0
+    widget.set_value((
+        float(rng.integers(0, 5)) * passo,
+        min(maximo, float(rng.integers(int(maximo * 0.2 // passo), int(maximo // passo) + 1)) * passo),
+    ))
+
+
+def mover_top_n(app, rng):
+    app.slider(key="top_n").set_value(int(rng.integers(5, 21)))
+
+
+INTERACOES = {
+    "anos": mover_anos,
+    "notas": mover_notas,
+    "receita": mover_receita,
+    "top_n": mover_top_n,
+}
+
+
+def percentil(valores, p):
+    return float(np.percentile(valores, p)) if valores else None
+
+
+def resumir(registros):
+    """p50/p95 por interação e no total, seção mais lenta e elementos por rerun."""
+    por_tipo = {}
+    for registro in registros:
+        por_tipo.setdefault(registro["interacao"], []).append(registro["segundos"])
+    tempos_secoes = {}
+    for registro in registros:
+        for secao, segundos in registro["tempos_secoes"].items():
+            tempos_secoes.setdefault(secao, []).append(segundos)
+    todos = [registro["segundos"] for registro in registros]
+    medias_secoes = {secao: float(np.mean(tempos)) for secao, tempos in tempos_secoes.items()}
+    return {
+        "reruns": len(registros),
+        "p50_segundos": percentil(todos, 50),
+        "p95_segundos": percentil(todos, 95),
+        "por_interacao": {
+            tipo: {"n": len(tempos), "p50_segundos": percentil(tempos, 50), "p95_segundos": percentil(tempos, 95)}
+            for tipo, tempos in por_tipo.items()
+        },
+        "secao_mais_lenta": max(medias_secoes, key=medias_secoes.get, default=None),
+        "media_segundos_por_secao": medias_secoes,
+        "elementos_por_interacao": {
+            tipo: float(np.mean([r["elementos"] for r in registros if r["interacao"] == tipo]))
+            for tipo in por_tipo
+        },
+    }
+
+
+def executar(csv, rodadas, abas, semente=0, timeout=300):
+    """Roda as interações em cada aba e devolve um registro por rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(semente)
+    app = AppTest.from_file(str(RAIZ / "app.py"), default_timeout=timeout)
+    registros = []
+
+    def rerun(interacao, aba):
+        inicio = time.perf_counter()
+        app.run()
+        segundos = time.perf_counter() - inicio
+        if app.exception:
+            raise RuntimeError(f"Exceção no app durante '{interacao}': {app.exception[0].value}")
+        tempos = dict(app.session_state["_tempos_secoes"]) if "_tempos_secoes" in app.session_state else {}
+        registro = {
+            "interacao": interacao,
+            "aba": aba,
+            "segundos": round(segundos, 6),
+            "elementos": contar_elementos(app._tree),
+            "graficos": len(app.get("plotly_chart")),
+            "tempos_secoes": {secao: round(valor, 6) for secao, valor in tempos.items()},
+            "secao_mais_lenta": max(tempos, key=tempos.get, default=None),
+        }
+        print(f"{aba:<14} {interacao:<8} {segundos * 1000:>9.1f} ms {registro['elementos']:>5} elementos"
+              f"  (mais lenta: {registro['secao_mais_lenta']})", file=sys.stderr)
+        return registro
+
+    # Primeira execução: carga dos dados e índices (fora das estatísticas)
+    aquecimento = rerun("inicial", ABAS[0])
+    print(f"carga inicial: {aquecimento['segundos']:.2f} s", file=sys.stderr)
+
+    for aba in abas:
+        if "aba_ativa" in app.session_state:
+            app.radio(key="aba_ativa").set_value(aba)
+        registros.append(rerun("aba", aba))
+        for _ in range(rodadas):
+            for interacao, mover in INTERACOES.items():
+                if interacao == "top_n" and aba != "top_filmes":
+                    continue
+                mover(app, rng)
+                registros.append(rerun(interacao, aba))
+    return registros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latência de rerun do dashboard, sem navegador.")
+    parser.add_argument("--csv", type=Path, help="CSV local no esquema do IMDb (padrão: base sintética)")
+    parser.add_argument("--linhas", type=int, default=100_000, help="Tamanho da base sintética")
+    parser.add_argument("--rodadas", type=int, default=5, help="Rodadas de interações por aba")
+    parser.add_argument("--abas", nargs="+", default=ABAS, choices=ABAS)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON lines com um registro por rerun")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporario:
+        csv = args.csv or gravar_csv(args.linhas, Path(temporario) / "imdb.csv")
+        # O app lê a configuração do ambiente: base local, cache isolado, sem
+        # verificação da fonte em segundo plano durante a medição
+        os.environ["CINE_CSV_URL"] = str(csv)
+        os.environ["CINE_CACHE_DIR"] = str(Path(temporario) / "cache")
+        os.environ["CINE_INTERVALO_ATUALIZACAO"] = "0"
+        registros = executar(csv, args.rodadas, args.abas, args.semente)
+
+    resumo = resumir(registros)
+    if args.saida:
+        args.saida.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros), encoding="utf-8")
+    print(json.dumps(resumo, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
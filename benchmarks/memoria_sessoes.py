@@ -0,0 +1,126 @@
+# =========================
+# MEMÓRIA POR SESSÃO CONCORRENTE
+# =========================
+# Abre N sessões do app.py (AppTest, sem navegador) sobre a mesma base, cada
+# uma com filtros, aba e busca próprias, e mantém vivo só o estado de cada
+# sessão, como o servidor faz com usuários conectados. Mede a memória retida
+# pelo processo (tracemalloc, após coleta de lixo) conforme N cresce: dados,
+# cubo e índices são do processo, então cada sessão a mais deve custar só o
+# seu estado, dentro de CINE_ORCAMENTO_SESSAO_MB.
+#
+# O cache de figuras é compartilhado e tem orçamento próprio
+# (CINE_CACHE_FIGURAS_MB); por padrão fica desligado aqui para não misturar
+# as duas medidas.
+#
+# Uso: python benchmarks/memoria_sessoes.py --linhas 100000 --sessoes 1 2 4 8 16
+# Sai com código 1 se o custo marginal por sessão passar do orçamento.
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from gerar_dados import gravar_csv  # noqa: E402
+from latencia import ABAS, INTERACOES  # noqa: E402
+
+BUSCAS = ["", "love", "war", "night", "the"]
+
+
+def abrir_sessao(rng, timeout):
+    """Executa uma sessão com seleção aleatória e devolve só o estado dela."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(RAIZ / "app.py"), default_timeout=timeout)
+    app.run()
+    aba = str(rng.choice(ABAS))
+    app.radio(key="aba_ativa").set_value(aba)
+    for interacao, mover in INTERACOES.items():
+        if interacao != "top_n" or aba == "top_filmes":
+            mover(app, rng)
+    app.run()
+    if aba == "dados":
+        app.text_input(key="tabela_busca").set_value(str(rng.choice(BUSCAS)))
+        app.run()
+    if app.exception:
+        raise RuntimeError(f"Exceção no app na aba '{aba}': {app.exception[0].value}")
+    # Só o SessionState, como o servidor guarda por usuário (o ScriptRunner
+    # e os globais do script são descartados ao fim de cada execução)
+    return aba, app.session_state._state
+
+
+def executar(contagens, semente=0, timeout=300):
+    """Memória retida com cada número de sessões abertas."""
+    from sessao import bytes_da_sessao
+
+    rng = np.random.default_rng(semente)
+    # Primeira sessão: carga dos dados, cubo e índices (memória do processo)
+    abrir_sessao(rng, timeout)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    estados, registros = [], []
+    for numero in range(1, max(contagens) + 1):
+        aba, estado = abrir_sessao(rng, timeout)
+        estados.append(estado)
+        if numero not in contagens:
+            continue
+        gc.collect()
+        retida = tracemalloc.get_traced_memory()[0] - base
+        registro = {
+            "sessoes": numero,
+            "memoria_bytes": retida,
+            "bytes_por_sessao": retida // numero,
+            "estado_medio_bytes": int(np.mean([bytes_da_sessao(e.filtered_state) for e in estados])),
+        }
+        registros.append(registro)
+        print(f"{numero:>3} sessões  {retida / 2**20:8.2f} MiB retidos"
+              f"  ({registro['bytes_por_sessao'] / 1024:.0f} KiB/sessão, última na aba {aba})", file=sys.stderr)
+    tracemalloc.stop()
+    return registros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memória retida por sessão concorrente do dashboard.")
+    parser.add_argument("--csv", type=Path, help="CSV local no esquema do IMDb (padrão: base sintética)")
+    parser.add_argument("--linhas", type=int, default=100_000, help="Tamanho da base sintética")
+    parser.add_argument("--sessoes", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--cache-figuras-mb", default="0", help="Orçamento do cache de figuras durante a medição")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporario:
+        csv = args.csv or gravar_csv(args.linhas, Path(temporario) / "imdb.csv")
+        os.environ["CINE_CSV_URL"] = str(csv)
+        os.environ["CINE_CACHE_DIR"] = str(Path(temporario) / "cache")
+        os.environ["CINE_INTERVALO_ATUALIZACAO"] = "0"
+        os.environ["CINE_CACHE_FIGURAS_MB"] = args.cache_figuras_mb
+        registros = executar(sorted(set(args.sessoes)), args.semente)
+
+    from config import ORCAMENTO_SESSAO_MB
+
+    orcamento = ORCAMENTO_SESSAO_MB * 2**20
+    sessoes = [r["sessoes"] for r in registros]
+    memoria = [r["memoria_bytes"] for r in registros]
+    # Inclinação da reta memória × sessões: custo de cada sessão a mais
+    marginal = float(np.polyfit(sessoes, memoria, 1)[0]) if len(registros) > 1 else float(memoria[0])
+    resumo = {
+        "registros": registros,
+        "bytes_por_sessao_adicional": int(marginal),
+        "orcamento_sessao_bytes": orcamento,
+        "dentro_do_orcamento": marginal <= orcamento,
+    }
+    print(json.dumps(resumo, ensure_ascii=False, indent=2))
+    return 0 if resumo["dentro_do_orcamento"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+# =========================
+# BUSCA TEXTUAL (ÍNDICE INVERTIDO)
+# =========================
+# Construído na carga sobre os campos de texto (título, elenco/equipe,
+# sinopse...) e atualizado pelo delta da ingestão incremental, que só
+# tokeniza as linhas novas. A tokenização roda no pyarrow: normalização
+# NFKD, remoção de acentos e minúsculas, de modo que "acao" encontra "Ação".
+# Cada termo tem uma lista de postings (linha, peso) em formato CSR e o
+# vocabulário fica ordenado, o que torna a busca por prefixo uma fatia
+# contígua. Uma consulta custa O(linhas + postings dos termos), sem varrer
+# o texto das linhas.
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Campos indexados e seus pesos no ranking
+CAMPOS_BUSCA_IMDB = {
+    "names": 3.0, "orig_title": 3.0, "crew": 2.0, "overview": 1.0,
+    "genre": 0.5, "orig_lang": 0.5, "country": 0.5,
+}
+CAMPOS_BUSCA_NETFLIX = {
+    "Title": 3.0, "Director": 2.0, "Cast": 2.0, "Description": 1.0,
+    "Type": 0.5, "Country": 0.5,
+}
+# O último termo da consulta é buscado como prefixo a partir deste tamanho
+MIN_PREFIXO = 2
+
+
+def _normalizar(textos):
+    """Minúsculas e sem acentos (NFKD sem as marcas combinantes)."""
+    return pc.utf8_lower(pc.replace_substring_regex(pc.utf8_normalize(textos, "NFKD"), r"\p{Mn}+", ""))
+
+
+def _termos_por_item(textos):
+    """
+    Termos normalizados de cada texto em formato CSR: os termos do texto i
+    são `termos[inicio[i]:inicio[i + 1]]` (array Arrow). Textos nulos ou só
+    com pontuação não têm termos.
+    """
+    listas = pc.split_pattern_regex(_normalizar(textos), r"[^\p{L}\p{N}]+")
+    termos = pc.list_flatten(listas)
+    item = pc.list_parent_indices(listas).to_numpy()
+    validos = pc.greater(pc.utf8_length(termos), 0).to_numpy(zero_copy_only=False)
+    inicio = np.concatenate([[0], np.cumsum(np.bincount(item[validos], minlength=len(textos)))])
+    return pc.filter(termos, validos), inicio
+
+
+def _expandir(documentos, itens, inicio):
+    """(documento, posição do termo) para cada item de cada documento."""
+    quantos = np.diff(inicio)[itens]
+    # Para cada ocorrência, as posições dos termos do seu item
+    deslocamento = np.repeat(inicio[itens] - np.cumsum(quantos) + quantos, quantos)
+    return np.repeat(documentos, quantos), deslocamento + np.arange(quantos.sum())
+
+
+def _tokenizar(textos):
+    """
+    Tokens de um array Arrow de textos: (documento de cada token, código do
+    token, vocabulário dos códigos). A normalização e a separação por
+    pontuação, que são caras, rodam só sobre as palavras distintas.
+    """
+    palavras = pc.utf8_split_whitespace(textos)
+    documentos = pc.list_parent_indices(palavras).to_numpy()
+    dicionario = pc.dictionary_encode(pc.list_flatten(palavras))
+    termos, inicio = _termos_por_item(dicionario.dictionary)
+    documentos, posicoes = _expandir(documentos, dicionario.indices.to_numpy(), inicio)
+    return documentos, posicoes, termos
+
+
+def tokenizar_consulta(consulta):
+    """Termos da consulta com a mesma normalização do índice."""
+    termos, _ = _termos_por_item(pa.array([consulta], type=pa.string()))
+    return termos.to_pylist()
+
+
+def _tokens_da_coluna(serie):
+    """Tokens de uma coluna; categorias são tokenizadas uma única vez."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = pa.array(serie.cat.categories.astype(str), type=pa.string())
+        documentos, posicoes, termos = _tokenizar(categorias)
+        inicio = np.concatenate([[0], np.cumsum(np.bincount(documentos, minlength=len(categorias)))])
+        codigos = serie.cat.codes.to_numpy()
+        linhas = np.flatnonzero(codigos >= 0)
+        linhas, posicoes_linha = _expandir(linhas, codigos[linhas], inicio)
+        return linhas, posicoes[posicoes_linha], termos
+    textos = pa.array(serie.astype("string[pyarrow]").array)
+    if isinstance(textos, pa.ChunkedArray):
+        textos = textos.combine_chunks()
+    return _tokenizar(textos)
+
+
+class IndiceBusca:
+    """Índice invertido com busca por prefixo e ranking por relevância (TF-IDF ponderado por campo)."""
+
+    def __init__(self, df, campos):
+        self.n_linhas = len(df)
+        linhas, termos, pesos, vocabularios = [], [], [], []
+        for coluna, peso in campos.items():
+            if coluna not in df.columns:
+                continue
+            linhas_coluna, codigos_coluna, vocabulario_coluna = _tokens_da_coluna(df[coluna])
+            # Códigos de cada coluna deslocados para um vocabulário concatenado
+            termos.append(codigos_coluna + sum(len(vocabulario) for vocabulario in vocabularios))
+            vocabularios.append(vocabulario_coluna.cast(pa.large_string()))
+            linhas.append(linhas_coluna)
+            pesos.append(np.full(len(linhas_coluna), peso, dtype=np.float32))
+        if not linhas:
+            self.vocabulario = np.array([], dtype=object)
+            self.inicio = np.zeros(1, dtype=np.int64)
+            self.linhas = np.array([], dtype=np.int32)
+            self.pesos = np.array([], dtype=np.float32)
+            return
+
+        # Vocabulário único em ordem lexicográfica: prefixos viram intervalos
+        # contíguos (a ordem dos bytes UTF-8 do Arrow é a mesma do Python)
+        dicionario = pc.dictionary_encode(pa.concat_arrays(vocabularios))
+        ordem_vocabulario = pc.array_sort_indices(dicionario.dictionary).to_numpy()
+        posto = np.empty(len(ordem_vocabulario), dtype=np.int64)
+        posto[ordem_vocabulario] = np.arange(len(ordem_vocabulario))
+        self.vocabulario = np.asarray(dicionario.dictionary.take(ordem_vocabulario).to_pylist(), dtype=object)
+        termo = posto[dicionario.indices.to_numpy()][np.concatenate(termos)]
+        linha = np.concatenate(linhas).astype(np.int64)
+        peso = np.concatenate(pesos)
+
+        # Um posting por (termo, linha), somando os pesos das ocorrências
+        chave = termo * max(self.n_linhas, 1) + linha
+        ordem = np.argsort(chave)
+        chave = chave[ordem]
+        inicio_grupo = np.flatnonzero(np.concatenate([[True], chave[1:] != chave[:-1]]))
+        self.pesos = np.add.reduceat(peso[ordem], inicio_grupo).astype(np.float32)
+        termo = chave[inicio_grupo] // max(self.n_linhas, 1)
+        self.linhas = (chave[inicio_grupo] % max(self.n_linhas, 1)).astype(np.int32)
+        self.inicio = np.searchsorted(termo, np.arange(len(self.vocabulario) + 1))
+
+    def aplicar_delta(self, atualizacao, campos):
+        """
+        Novo índice para `atualizacao.df`: só as linhas novas são tokenizadas.
+        Os postings das linhas mantidas são renumerados, os das removidas
+        descartados, e os vocabulários (ambos ordenados) são intercalados.
+        """
+        mantidas = np.ones(self.n_linhas, dtype=bool)
+        mantidas[atualizacao.removidas] = False
+        nova_posicao = np.cumsum(mantidas) - 1
+        postings_mantidos = mantidas[self.linhas]
+        termo = np.repeat(np.arange(len(self.vocabulario)), np.diff(self.inicio))[postings_mantidos]
+        linhas = [nova_posicao[self.linhas[postings_mantidos]]]
+        pesos = [self.pesos[postings_mantidos]]
+        vocabulario = self.vocabulario
+        termos = [termo]
+        if atualizacao.n_adicionadas:
+            delta = IndiceBusca(atualizacao.df.iloc[atualizacao.adicionadas], campos)
+            # Só os termos do delta são comparados (o vocabulário antigo não é reordenado)
+            posicao = np.searchsorted(self.vocabulario, delta.vocabulario)
+            existentes = posicao < len(self.vocabulario)
+            existentes[existentes] = self.vocabulario[posicao[existentes]] == delta.vocabulario[existentes]
+            insercoes = posicao[~existentes]
+            vocabulario = np.insert(self.vocabulario, insercoes, delta.vocabulario[~existentes])
+            # Código novo de cada termo antigo: desloca pelos termos inseridos antes dele
+            codigo_antigo = np.arange(len(self.vocabulario))
+            codigo_antigo += np.searchsorted(insercoes, codigo_antigo, side="right")
+            codigo_delta = np.empty(len(delta.vocabulario), dtype=np.int64)
+            codigo_delta[existentes] = codigo_antigo[posicao[existentes]]
+            codigo_delta[~existentes] = insercoes + np.arange(len(insercoes))
+            termos = [
+                codigo_antigo[termo],
+                codigo_delta[np.repeat(np.arange(len(delta.vocabulario)), np.diff(delta.inicio))],
+            ]
+            # As linhas novas ficam no fim do frame: depois de todas as mantidas
+            linhas.append(delta.linhas + (len(atualizacao.df) - atualizacao.n_adicionadas))
+            pesos.append(delta.pesos)
+        termo = np.concatenate(termos)
+        # Cada parte já está em ordem de (termo, linha): a ordenação estável por termo as intercala
+        ordem = np.argsort(termo, kind="stable")
+        termo = termo[ordem]
+        # Termos que só apareciam em linhas removidas saem do vocabulário
+        postings_por_termo = np.bincount(termo, minlength=len(vocabulario))
+        usados = postings_por_termo > 0
+
+        novo = object.__new__(IndiceBusca)
+        novo.n_linhas = len(atualizacao.df)
+        novo.vocabulario = vocabulario[usados]
+        novo.inicio = np.concatenate([[0], np.cumsum(postings_por_termo[usados])])
+        novo.linhas = np.concatenate(linhas)[ordem].astype(np.int32)
+        novo.pesos = np.concatenate(pesos)[ordem].astype(np.float32)
+        return novo
+
+    def __len__(self):
+        return len(self.vocabulario)
+
+    def _intervalo(self, termo, prefixo):
+        """Faixa [inicio, fim) do vocabulário que casa com `termo`."""
+        inicio = int(np.searchsorted(self.vocabulario, termo, side="left"))
+        if prefixo:
+            fim = int(np.searchsorted(self.vocabulario, termo + "\U0010ffff", side="left"))
+        else:
+            fim = inicio + int(inicio < len(self.vocabulario) and self.vocabulario[inicio] == termo)
+        return inicio, fim
+
+    def buscar(self, consulta, linhas=None, limite=None):
+        """
+        Posições das linhas que contêm todos os termos da consulta, da mais
+        para a menos relevante (empates na ordem das linhas). O último termo
+        vale como prefixo (busca enquanto se digita). Com `linhas`, só as
+        posições dessa seleção são consideradas.
+        """
+        termos = tokenizar_consulta(consulta)
+        if not termos:
+            return linhas if linhas is not None else np.arange(self.n_linhas)
+        pontuacao = np.zeros(self.n_linhas, dtype=np.float64)
+        encontrados = np.zeros(self.n_linhas, dtype=np.int32)
+        for i, termo in enumerate(termos):
+            prefixo = i == len(termos) - 1 and len(termo) >= MIN_PREFIXO
+            inicio, fim = self._intervalo(termo, prefixo)
+            postings = slice(self.inicio[inicio], self.inicio[fim])
+            pesos = np.bincount(self.linhas[postings], weights=self.pesos[postings], minlength=self.n_linhas)
+            presentes = pesos > 0
+            n_presentes = int(presentes.sum())
+            if n_presentes == 0:
+                return np.array([], dtype=np.intp)
+            idf = np.log1p(self.n_linhas / n_presentes)
+            pontuacao += idf * pesos
+            encontrados += presentes
+        candidatas = encontrados == len(termos)
+        if linhas is not None:
+            selecao = np.zeros(self.n_linhas, dtype=bool)
+            selecao[linhas] = True
+            candidatas &= selecao
+        resultado = np.flatnonzero(candidatas)
+        ordem = np.argsort(-pontuacao[resultado], kind="stable")
+        if limite is not None:
+            ordem = ordem[:limite]
+        return resultado[ordem]
@@ -0,0 +1,118 @@
+# =========================
+# CACHE DE FIGURAS (LRU COM ORÇAMENTO DE MEMÓRIA)
+# =========================
+# Guarda as figuras Plotly prontas, indexadas por (gráfico, versão dos dados,
+# filtros normalizados, parâmetros do gráfico). Uma única instância por
+# processo é compartilhada entre as sessões: combinações de filtros repetidas
+# devolvem a figura sem nenhum trabalho de pandas.
+import threading
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+
+import plotly.io as pio
+
+
+def _motor_json():
+    """
+    orjson quando instalado numa versão >= 3.9.6; senão o json da biblioteca
+    padrão. Nas anteriores, cada to_json de figura com arrays que o orjson não
+    serializa direto (texto, object) deixava a cópia desses arrays presa na
+    memória do processo.
+    """
+    try:
+        partes = version("orjson").split(".")[:3]
+    except PackageNotFoundError:
+        return "json"
+    return "orjson" if tuple(int(parte) for parte in partes if parte.isdigit()) >= (3, 9, 6) else "json"
+
+
+# Motor do JSON das figuras, também para o st.plotly_chart (motor padrão do Plotly)
+MOTOR_JSON = _motor_json()
+pio.json.config.default_engine = MOTOR_JSON
+
+# Marca de "não está no cache" (None é uma figura válida: gráfico sem dados)
+AUSENTE = object()
+
+
+def tamanho_figura(figura):
+    """Tamanho (bytes) do JSON que vai ao navegador, gerado como o st.plotly_chart gera."""
+    if figura is None:
+        return 0
+    return len(pio.to_json(figura, validate=False))
+
+
+class CacheFiguras:
+    """
+    Cache LRU de figuras limitado por um orçamento total em bytes. Com outra
+    função `medir` serve para outros valores (resultados por sessão, sessao.py).
+    """
+
+    def __init__(self, orcamento_bytes, medir=tamanho_figura):
+        self.orcamento_bytes = orcamento_bytes
+        self.medir = medir
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave):
+        """Figura guardada em `chave` ou AUSENTE (figuras podem ser None)."""
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0]
+            self.falhas += 1
+            return AUSENTE
+
+    def guardar(self, chave, figura, tamanho=None):
+        """Guarda a figura (tamanho medido aqui se não vier pronto) e aplica o orçamento."""
+        if tamanho is None:
+            tamanho = self.medir(figura)
+        if tamanho > self.orcamento_bytes:
+            return
+        with self._trava:
+            if chave in self._itens:
+                self.bytes_usados -= self._itens.pop(chave)[1]
+            self._itens[chave] = (figura, tamanho)
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.orcamento_bytes:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self.bytes_usados -= tamanho_removido
+                self.remocoes += 1
+
+    def obter_ou_criar(self, chave, construtor):
+        """Devolve a figura em cache ou chama `construtor()` e guarda o resultado."""
+        figura = self.obter(chave)
+        if figura is AUSENTE:
+            # Construção fora da trava: outras sessões não esperam por este gráfico
+            figura = construtor()
+            self.guardar(chave, figura)
+        return figura
+
+    def tamanho(self, chave):
+        """Bytes da figura guardada em `chave` (None se não estiver no cache)."""
+        with self._trava:
+            item = self._itens.get(chave)
+            return item[1] if item else None
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self.bytes_usados = 0
+
+    def estatisticas(self):
+        """Contadores de uso (para o painel de diagnóstico e logs)."""
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "bytes_usados": self.bytes_usados,
+                "orcamento_bytes": self.orcamento_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
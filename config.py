@@ -0,0 +1,80 @@
+# =========================
+# CONFIGURAÇÃO GERAL
+# =========================
+# Valores padrão do dashboard. Todos podem ser sobrescritos por variáveis de
+# ambiente (útil no Streamlit Cloud, em contêineres e nos testes locais).
+import os
+from pathlib import Path
+
+DIRETORIO_PROJETO = Path(__file__).resolve().parent
+
+# Fonte dos dados: URL remota ou caminho de um CSV local
+CSV_URL = os.environ.get(
+    "CINE_CSV_URL",
+    "https://raw.githubusercontent.com/luccasfsilva/projetopy/main/imdb_movies.csv",
+)
+
+# Conjunto de dados do dashboard: "imdb" (CSV_URL) ou "netflix" (catálogo local)
+FONTE_DADOS = os.environ.get("CINE_FONTE", "imdb").lower()
+NETFLIX_CSV = Path(os.environ.get("CINE_NETFLIX_CSV", DIRETORIO_PROJETO / "Netflix Dataset.csv"))
+
+# Snapshot colunar (Parquet) dos dados já tratados
+DIRETORIO_CACHE = Path(os.environ.get("CINE_CACHE_DIR", DIRETORIO_PROJETO / ".cache"))
+TIMEOUT_FONTE_SEGUNDOS = float(os.environ.get("CINE_TIMEOUT_FONTE", "5"))
+# Linhas por bloco na leitura tipada do CSV
+TAMANHO_BLOCO_CSV = int(os.environ.get("CINE_TAMANHO_BLOCO", "200000"))
+
+# Tabela de tradução dos títulos (CSV com colunas original,traducao)
+ARQUIVO_TRADUCOES = Path(os.environ.get("CINE_TRADUCOES", DIRETORIO_PROJETO / "traducoes_filmes.csv"))
+
+# Backend das consultas analíticas: "pandas" (cubo em memória) ou "duckdb"
+# (SQL sobre Parquet, pacote opcional); THREADS_DUCKDB = 0 usa todos os núcleos
+BACKEND_CONSULTAS = os.environ.get("CINE_BACKEND", "pandas").lower()
+THREADS_DUCKDB = int(os.environ.get("CINE_DUCKDB_THREADS", "0"))
+
+# Orçamento de memória do cache LRU de figuras (por processo)
+ORCAMENTO_CACHE_FIGURAS_MB = float(os.environ.get("CINE_CACHE_FIGURAS_MB", "64"))
+
+# Abas preguiçosas: só a aba visível é calculada em cada rerun ("0" volta ao st.tabs)
+ABAS_PREGUICOSAS = os.environ.get("CINE_ABAS_PREGUICOSAS", "1") != "0"
+
+# Dispersões: SVG até LIMIAR_WEBGL pontos, WebGL até LIMIAR_DENSIDADE e, acima
+# disso, mapa de densidade BINS_DENSIDADE x BINS_DENSIDADE calculado no servidor
+# mais no máximo MAX_PONTOS_ISOLADOS pontos de células com poucos filmes
+LIMIAR_WEBGL = int(os.environ.get("CINE_LIMIAR_WEBGL", "5000"))
+LIMIAR_DENSIDADE = int(os.environ.get("CINE_LIMIAR_DENSIDADE", "100000"))
+BINS_DENSIDADE = int(os.environ.get("CINE_BINS_DENSIDADE", "80"))
+LIMITE_CELULA_ISOLADA = int(os.environ.get("CINE_LIMITE_CELULA_ISOLADA", "2"))
+MAX_PONTOS_ISOLADOS = int(os.environ.get("CINE_MAX_PONTOS_ISOLADOS", "2000"))
+
+# Construção das figuras de uma aba: "serial", "threads" ou "processos"
+# (TRABALHADORES_GRAFICOS = 0 usa um trabalhador por núcleo)
+POOL_GRAFICOS = os.environ.get("CINE_POOL_GRAFICOS", "serial").lower()
+TRABALHADORES_GRAFICOS = int(os.environ.get("CINE_TRABALHADORES_GRAFICOS", "0"))
+
+# Orçamento dos resultados guardados por cada sessão (busca da tabela);
+# dados, índices e figuras são do processo
+ORCAMENTO_SESSAO_MB = float(os.environ.get("CINE_ORCAMENTO_SESSAO_MB", "8"))
+
+# Linhas por página na aba "Dados Completos"
+TAMANHO_PAGINA_TABELA = int(os.environ.get("CINE_TAMANHO_PAGINA", "50"))
+
+# Modo aproximado: bases com pelo menos LIMIAR_APROXIMADO linhas mostram
+# primeiro KPIs e gráficos temporais estimados por uma amostra estratificada
+# (ano × categoria de sucesso) de TAMANHO_AMOSTRA linhas e depois os valores
+# exatos (0 desativa)
+LIMIAR_APROXIMADO = int(os.environ.get("CINE_LIMIAR_APROXIMADO", "1000000"))
+TAMANHO_AMOSTRA = int(os.environ.get("CINE_TAMANHO_AMOSTRA", "50000"))
+
+# Exportação da seleção: linhas copiadas por bloco e espaço em disco dos
+# arquivos preparados (em static/, servidos pelo Streamlit direto do disco)
+DIRETORIO_EXPORTACOES = DIRETORIO_PROJETO / "static" / "exportacoes"
+TAMANHO_BLOCO_EXPORTACAO = int(os.environ.get("CINE_TAMANHO_BLOCO_EXPORTACAO", "100000"))
+ORCAMENTO_EXPORTACOES_MB = float(os.environ.get("CINE_EXPORTACOES_MB", "1024"))
+
+# Diagnóstico: "1" liga o painel de instrumentação para todos e emite uma linha
+# JSON por rerun em stderr. Sem ele, o painel aparece só com ?diagnostico=1
+DIAGNOSTICO = os.environ.get("CINE_DIAGNOSTICO", "0") == "1"
+
+# Intervalo (s) entre verificações da fonte para ingestão incremental (0 desativa)
+INTERVALO_ATUALIZACAO_SEGUNDOS = float(os.environ.get("CINE_INTERVALO_ATUALIZACAO", "3600"))
@@ -0,0 +1,175 @@
+# =========================
+# BACKENDS DE CONSULTA (PANDAS OU DUCKDB)
+# =========================
+# O app pede ao backend as linhas filtradas, as agregações por dimensão (que
+# alimentam os gráficos e os KPIs) e os maiores valores de uma coluna (top
+# receita/ROI). O backend pandas responde com o cubo e o motor de filtros em
+# memória; o backend DuckDB (opcional, CINE_BACKEND=duckdb) empurra filtros,
+# agrupamentos e ORDER BY ... LIMIT para um Parquet com as colunas analíticas
+# de cada versão dos dados, usando todos os núcleos. As respostas têm o mesmo
+# formato nos dois casos (somas iguais a menos do arredondamento de float).
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import BACKEND_CONSULTAS, DIRETORIO_CACHE, THREADS_DUCKDB
+from cubo import MEDIDAS, adicionar_medias
+from dados import _gravar_atomico
+from filtros import maiores
+
+logger = logging.getLogger(__name__)
+
+# Colunas exportadas para o Parquet do DuckDB (dimensões e medidas do cubo)
+COLUNAS_ANALITICAS = ["ano", "mes", "country", "orig_lang", "country_iso3", "score", "revenue", "budget_x", "roi"]
+_TIPOS_SQL = {
+    "int8": "TINYINT", "int16": "SMALLINT", "int32": "INTEGER", "int64": "BIGINT",
+    "float32": "FLOAT", "float64": "DOUBLE",
+}
+
+
+def _positivas(df, linhas, colunas):
+    """Posições da seleção com todas as `colunas` > 0."""
+    for coluna in colunas:
+        linhas = linhas[df[coluna].to_numpy()[linhas] > 0]
+    return linhas
+
+
+class BackendPandas:
+    """Consultas pelo cubo OLAP e pelo motor de filtros (tudo em memória)."""
+    nome = "pandas"
+
+    def __init__(self, df, cubo, motor_filtros):
+        self.df = df
+        self.cubo = cubo
+        self.motor_filtros = motor_filtros
+
+    def selecionar(self, filtros):
+        """Posições (crescentes) das linhas que passam em `filtros`."""
+        return self.motor_filtros.selecionar(filtros)
+
+    def agregar(self, filtros, por=()):
+        """Somas, contagens e médias da seleção agrupadas por `por` (formato de CuboOLAP.consultar)."""
+        return self.cubo.consultar(filtros, por)
+
+    def maiores(self, filtros, linhas, coluna, n, positivas=()):
+        """Posições das `n` linhas da seleção com maior `coluna` (só as com `positivas` > 0)."""
+        return maiores(self.df, _positivas(self.df, linhas, positivas), coluna, n)
+
+
+class BackendDuckDB:
+    """
+    Consultas SQL do DuckDB sobre um Parquet com as colunas analíticas da
+    versão dos dados. A coluna `_linha` liga cada registro à sua posição no
+    DataFrame, de modo que o resultado combina com as partes que continuam
+    em pandas (dispersões, tabela, busca).
+    """
+    nome = "duckdb"
+
+    def __init__(self, df, diretorio=DIRETORIO_CACHE, threads=THREADS_DUCKDB):
+        import duckdb
+
+        self.df = df
+        self.caminho = self._exportar(df, diretorio)
+        self._tipos = {coluna: _TIPOS_SQL.get(str(df[coluna].dtype), "DOUBLE") for coluna in ("ano", "score", "revenue")}
+        self._conexao = duckdb.connect()
+        self._conexao.execute(f"SET threads TO {threads or os.cpu_count() or 1}")
+        caminho_sql = str(self.caminho).replace("'", "''")
+        self._conexao.execute(f"CREATE VIEW filmes AS SELECT * FROM read_parquet('{caminho_sql}')")
+
+    @staticmethod
+    def _exportar(df, diretorio):
+        """Grava (uma vez por versão) o Parquet das colunas analíticas."""
+        caminho = diretorio / f"consultas-{df.attrs.get('impressao_digital', 'memoria')}-{len(df)}.parquet"
+        if not caminho.exists():
+            colunas = [coluna for coluna in COLUNAS_ANALITICAS if coluna in df.columns]
+            tabela = df[colunas].copy()
+            tabela["tem_nome"] = df["names"].notna().to_numpy()
+            tabela["_linha"] = np.arange(len(df), dtype=np.int32)
+            diretorio.mkdir(parents=True, exist_ok=True)
+            _gravar_atomico(caminho, lambda destino: tabela.to_parquet(destino, index=False))
+        return caminho
+
+    def _executar(self, sql, parametros=()):
+        # Um cursor por chamada: as sessões do Streamlit rodam em threads distintas
+        return self._conexao.cursor().execute(sql, list(parametros))
+
+    def _onde(self, filtros):
+        """Cláusula WHERE dos filtros (literais no tipo da coluna, como no pandas)."""
+        condicoes = []
+        parametros = []
+        for coluna, minimo, maximo in (
+            ("ano", filtros.ano_min, filtros.ano_max),
+            ("score", filtros.nota_min, filtros.nota_max),
+            ("revenue", filtros.receita_min, filtros.receita_max),
+        ):
+            tipo = self._tipos[coluna]
+            condicoes.append(f"{coluna} BETWEEN CAST(? AS {tipo}) AND CAST(? AS {tipo})")
+            # Widgets devolvem escalares NumPy, que o DuckDB não aceita como parâmetro
+            parametros += [np.asarray(minimo).item(), np.asarray(maximo).item()]
+        return " AND ".join(condicoes), parametros
+
+    def selecionar(self, filtros):
+        onde, parametros = self._onde(filtros)
+        linhas = self._executar(f"SELECT _linha FROM filmes WHERE {onde} ORDER BY _linha", parametros).fetchnumpy()["_linha"]
+        linhas = np.asarray(linhas, dtype=np.intp)
+        linhas.setflags(write=False)
+        return linhas
+
+    def agregar(self, filtros, por=()):
+        por = list(por)
+        onde, parametros = self._onde(filtros)
+        grupos = ", ".join(por)
+        sql = f"""
+            SELECT {grupos + ',' if por else ''}
+                count(*) AS n,
+                count(*) FILTER (WHERE tem_nome) AS n_nomes,
+                coalesce(sum(revenue), 0)::DOUBLE AS receita_soma,
+                coalesce(sum(score), 0)::DOUBLE AS nota_soma,
+                count(score) AS nota_n,
+                coalesce(sum(roi), 0)::DOUBLE AS roi_soma,
+                coalesce(sum(budget_x) FILTER (WHERE budget_x > 0), 0)::DOUBLE AS orcamento_soma,
+                count(*) FILTER (WHERE budget_x > 0) AS orcamento_n
+            FROM filmes WHERE {onde}
+            {'GROUP BY ' + grupos if por else ''}
+        """
+        agregado = self._executar(sql, parametros).df()
+        if por:
+            # Mesmos tipos e ordem do groupby do cubo (dimensões categóricas viram texto)
+            for coluna in por:
+                if not isinstance(self.df[coluna].dtype, pd.CategoricalDtype):
+                    agregado[coluna] = agregado[coluna].astype(self.df[coluna].dtype)
+            agregado = agregado.sort_values(por, na_position="last", kind="stable").reset_index(drop=True)
+        return adicionar_medias(agregado[por + MEDIDAS])
+
+    def maiores(self, filtros, linhas, coluna, n, positivas=()):
+        onde, parametros = self._onde(filtros)
+        condicoes = "".join(f" AND {positiva} > 0" for positiva in positivas)
+        sql = (
+            f"SELECT _linha FROM filmes WHERE {onde} AND {coluna} IS NOT NULL AND NOT isnan({coluna}){condicoes} "
+            f"ORDER BY {coluna} DESC, _linha LIMIT {int(n)}"
+        )
+        return np.asarray(self._executar(sql, parametros).fetchnumpy()["_linha"], dtype=np.intp)
+
+
+def remover_parquets_antigos(diretorio, manter):
+    """Apaga os Parquets do DuckDB de outras versões dos dados, exceto os caminhos em `manter`."""
+    for caminho in Path(diretorio).glob("consultas-*.parquet"):
+        if caminho not in manter:
+            caminho.unlink(missing_ok=True)
+
+
+def criar_backend(df, cubo, motor_filtros, diretorio=DIRETORIO_CACHE, nome=BACKEND_CONSULTAS):
+    """Backend configurado; sem o pacote duckdb (ou se ele falhar) volta ao pandas."""
+    if nome == "duckdb":
+        try:
+            return BackendDuckDB(df, diretorio)
+        except ImportError:
+            logger.warning("CINE_BACKEND=duckdb, mas o pacote duckdb não está instalado; usando pandas.")
+        except Exception as erro:
+            logger.warning("Falha ao iniciar o backend DuckDB (%s); usando pandas.", erro)
+    elif nome != "pandas":
+        logger.warning("Backend de consultas desconhecido: %s; usando pandas.", nome)
+    return BackendPandas(df, cubo, motor_filtros)
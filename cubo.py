@@ -0,0 +1,294 @@
+# =========================
+# CUBO OLAP PRÉ-AGREGADO
+# =========================
+# Construído uma vez por versão dos dados. Cada célula guarda somas e
+# contagens por (ano, mes, country, orig_lang, faixa de nota, faixa de
+# receita). Uma consulta filtrada soma as células inteiramente dentro dos
+# filtros e só volta às linhas originais nas faixas de borda (aquelas cujo
+# menor e maior valor observados o intervalo do slider separa), o que mantém
+# o resultado exato com custo proporcional ao número de células.
+#
+# Receita e nota também têm esboços de quantis (esboco_quantis) por célula
+# (ano, faixa de nota, faixa de receita), somados da mesma forma: quantis de
+# qualquer seleção saem sem ordenar as linhas filtradas.
+import numpy as np
+import pandas as pd
+
+from esboco_quantis import ALFA_PADRAO, EsbocoQuantis, chaves_baldes
+
+DIMENSOES = ["ano", "mes", "country", "orig_lang", "faixa_nota", "faixa_receita"]
+# Dimensões derivadas de outras (não criam células novas), usadas quando existem
+DIMENSOES_DERIVADAS = ["country_iso3"]
+MEDIDAS = ["n", "n_nomes", "receita_soma", "nota_soma", "nota_n", "roi_soma", "orcamento_soma", "orcamento_n"]
+N_FAIXAS = 16
+# Colunas com esboço de quantis e as dimensões das células desses esboços
+COLUNAS_QUANTIS = ("revenue", "score")
+DIMENSOES_QUANTIS = ["ano", "faixa_nota", "faixa_receita", "chave"]
+
+# Situação de uma faixa em relação a um intervalo do filtro
+FORA, PARCIAL, DENTRO = 0, 1, 2
+
+
+def _bordas_quantis(valores, n_faixas):
+    """Bordas internas das faixas, escolhidas para dividir as linhas por igual."""
+    validos = valores[~np.isnan(valores)]
+    if len(validos) == 0:
+        return np.array([], dtype=float)
+    return np.unique(np.quantile(validos, np.linspace(0, 1, n_faixas + 1)[1:-1]))
+
+
+def _faixas(valores, bordas):
+    """Índice da faixa de cada valor: 0 para NaN, 1..len(bordas)+1 para [borda_i, borda_i+1)."""
+    faixa = np.searchsorted(bordas, valores, side="right") + 1
+    faixa[np.isnan(valores)] = 0
+    return faixa
+
+
+def _extremos(valores, faixa, n_faixas):
+    """
+    (menor, maior) valor observado em cada faixa, no tipo da coluna para que
+    a comparação com os filtros seja a mesma de Filtros.mascara. Faixas
+    vazias (e a faixa 0, de NaN) ficam com (+inf, -inf).
+    """
+    tipo = np.result_type(valores.dtype, np.float32)
+    menor = np.full(n_faixas, np.inf, dtype=tipo)
+    maior = np.full(n_faixas, -np.inf, dtype=tipo)
+    validas = faixa > 0
+    np.minimum.at(menor, faixa[validas], valores[validas])
+    np.maximum.at(maior, faixa[validas], valores[validas])
+    return menor, maior
+
+
+def _classificar(extremos, minimo, maximo):
+    """
+    FORA/PARCIAL/DENTRO para cada faixa frente ao intervalo [minimo, maximo],
+    pelos extremos observados na faixa: as faixas das pontas (abertas até
+    ±inf) também ficam DENTRO quando o filtro cobre todos os seus valores.
+    """
+    menor, maior = extremos
+    situacao = np.where(
+        (menor >= minimo) & (maior <= maximo), DENTRO,
+        np.where((maior < minimo) | (menor > maximo), FORA, PARCIAL)
+    )
+    # Faixa 0 (NaN) nunca passa por um filtro de intervalo
+    situacao[0] = FORA
+    return situacao
+
+
+def medidas_por_linha(df):
+    """Medidas aditivas de cada linha; somadas, formam as células do cubo."""
+    orcamento = df["budget_x"].to_numpy()
+    return pd.DataFrame({
+        "n": 1,
+        "n_nomes": df["names"].notna().to_numpy(dtype=np.int64),
+        "receita_soma": df["revenue"].to_numpy(),
+        "nota_soma": df["score"].fillna(0).to_numpy(dtype=float),
+        "nota_n": df["score"].notna().to_numpy(dtype=np.int64),
+        "roi_soma": df["roi"].to_numpy(),
+        "orcamento_soma": np.where(orcamento > 0, orcamento, 0),
+        "orcamento_n": (orcamento > 0).astype(np.int64),
+    }, index=df.index)
+
+
+def adicionar_medias(agregado):
+    """Acrescenta as médias derivadas das somas e contagens."""
+    agregado["receita_media"] = agregado["receita_soma"] / agregado["n"]
+    agregado["nota_media"] = agregado["nota_soma"] / agregado["nota_n"].replace(0, np.nan)
+    agregado["roi_medio"] = agregado["roi_soma"] / agregado["n"]
+    agregado["orcamento_medio"] = agregado["orcamento_soma"] / agregado["orcamento_n"].replace(0, np.nan)
+    return agregado
+
+
+class CuboOLAP:
+    """Cubo de somas/contagens com consulta exata pelos filtros da barra lateral."""
+
+    def __init__(self, df, n_faixas=N_FAIXAS, alfa_quantis=ALFA_PADRAO):
+        self.df = df
+        self.alfa_quantis = alfa_quantis
+        nota = df["score"].to_numpy(dtype=float)
+        receita = df["revenue"].to_numpy(dtype=float)
+        self.bordas_nota = _bordas_quantis(nota, n_faixas)
+        self.bordas_receita = _bordas_quantis(receita, n_faixas)
+        faixa_nota = _faixas(nota, self.bordas_nota)
+        faixa_receita = _faixas(receita, self.bordas_receita)
+
+        dimensoes = DIMENSOES + [coluna for coluna in DIMENSOES_DERIVADAS if coluna in df.columns]
+        linhas = medidas_por_linha(df)
+        for coluna in dimensoes:
+            if coluna not in ("faixa_nota", "faixa_receita"):
+                linhas[coluna] = df[coluna].to_numpy()
+        linhas["faixa_nota"] = faixa_nota
+        linhas["faixa_receita"] = faixa_receita
+        self.celulas = (
+            linhas.groupby(dimensoes, dropna=False, observed=True, sort=False)[MEDIDAS].sum().reset_index()
+        )
+
+        self._dimensoes = dimensoes
+        self._indexar_linhas(faixa_nota, faixa_receita)
+        self._medir_extremos(faixa_nota, faixa_receita)
+        self.esbocos = {
+            coluna: self._baldes_de(df, coluna, faixa_nota, faixa_receita) for coluna in COLUNAS_QUANTIS
+        }
+
+    def _indexar_linhas(self, faixa_nota, faixa_receita):
+        """Linhas agrupadas por par (faixa_nota, faixa_receita), para as bordas."""
+        self._n_faixas_receita = len(self.bordas_receita) + 2
+        par = (faixa_nota * self._n_faixas_receita + faixa_receita).astype(np.int16)
+        # Ordenação estável de inteiros pequenos (radix sort): O(n)
+        self._ordem_linhas = np.argsort(par, kind="stable")
+        n_pares = (len(self.bordas_nota) + 2) * self._n_faixas_receita
+        self._inicio_par = np.searchsorted(par[self._ordem_linhas], np.arange(n_pares + 1))
+
+    def _medir_extremos(self, faixa_nota, faixa_receita):
+        """Menor e maior nota/receita observadas em cada faixa (para _classificar)."""
+        self.extremos_nota = _extremos(self.df["score"].to_numpy(), faixa_nota, len(self.bordas_nota) + 2)
+        self.extremos_receita = _extremos(self.df["revenue"].to_numpy(), faixa_receita, len(self.bordas_receita) + 2)
+
+    def _baldes_de(self, linhas_df, coluna, faixa_nota, faixa_receita, sinal=1):
+        """Contagem por (ano, faixa_nota, faixa_receita, balde de `coluna`)."""
+        baldes = pd.DataFrame({
+            "ano": linhas_df["ano"].to_numpy(),
+            "faixa_nota": faixa_nota,
+            "faixa_receita": faixa_receita,
+            "chave": chaves_baldes(linhas_df[coluna].to_numpy(dtype=float), self.alfa_quantis),
+            "n": np.full(len(linhas_df), sinal, dtype=np.int64),
+        })
+        return baldes.groupby(DIMENSOES_QUANTIS, sort=False)["n"].sum().reset_index()
+
+    def _celulas_de(self, linhas_df, sinal=1):
+        """Células (somas por dimensão) de um conjunto de linhas."""
+        linhas = medidas_por_linha(linhas_df) * sinal
+        for coluna in self._dimensoes:
+            if coluna not in ("faixa_nota", "faixa_receita"):
+                linhas[coluna] = linhas_df[coluna].to_numpy()
+        linhas["faixa_nota"] = _faixas(linhas_df["score"].to_numpy(dtype=float), self.bordas_nota)
+        linhas["faixa_receita"] = _faixas(linhas_df["revenue"].to_numpy(dtype=float), self.bordas_receita)
+        return linhas.groupby(self._dimensoes, dropna=False, observed=True, sort=False)[MEDIDAS].sum().reset_index()
+
+    def aplicar_delta(self, atualizacao, df_anterior):
+        """
+        Novo cubo para `atualizacao.df`, somando as células das linhas novas e
+        subtraindo as das removidas. O custo é proporcional às células e ao
+        delta (mais uma passada vetorizada para indexar as linhas e medir os
+        extremos de cada faixa); as faixas de nota/receita são mantidas.
+        """
+        novo = object.__new__(CuboOLAP)
+        novo.df = atualizacao.df
+        novo.bordas_nota = self.bordas_nota
+        novo.bordas_receita = self.bordas_receita
+        novo._dimensoes = self._dimensoes
+        partes = [
+            self.celulas,
+            self._celulas_de(df_anterior.iloc[atualizacao.removidas], sinal=-1),
+            self._celulas_de(atualizacao.df.iloc[atualizacao.adicionadas]),
+        ]
+        celulas = (
+            pd.concat(partes, ignore_index=True)
+            .groupby(self._dimensoes, dropna=False, observed=True, sort=False)[MEDIDAS].sum().reset_index()
+        )
+        novo.celulas = celulas[celulas["n"] > 0].reset_index(drop=True)
+        faixa_nota = _faixas(novo.df["score"].to_numpy(dtype=float), self.bordas_nota)
+        faixa_receita = _faixas(novo.df["revenue"].to_numpy(dtype=float), self.bordas_receita)
+        novo._indexar_linhas(faixa_nota, faixa_receita)
+        novo._medir_extremos(faixa_nota, faixa_receita)
+
+        novo.alfa_quantis = self.alfa_quantis
+        removidas = df_anterior.iloc[atualizacao.removidas]
+        adicionadas = atualizacao.df.iloc[atualizacao.adicionadas]
+        novo.esbocos = {}
+        for coluna, baldes in self.esbocos.items():
+            partes = [baldes]
+            for linhas_df, sinal in ((removidas, -1), (adicionadas, 1)):
+                partes.append(self._baldes_de(
+                    linhas_df, coluna,
+                    _faixas(linhas_df["score"].to_numpy(dtype=float), self.bordas_nota),
+                    _faixas(linhas_df["revenue"].to_numpy(dtype=float), self.bordas_receita),
+                    sinal,
+                ))
+            somados = pd.concat(partes, ignore_index=True).groupby(DIMENSOES_QUANTIS, sort=False)["n"].sum()
+            novo.esbocos[coluna] = somados[somados > 0].reset_index()
+        return novo
+
+    def __len__(self):
+        return len(self.celulas)
+
+    def _linhas_de_borda(self, situacao_nota, situacao_receita):
+        situacao_par = np.minimum.outer(situacao_nota, situacao_receita).ravel()
+        pares = np.flatnonzero(situacao_par == PARCIAL)
+        if len(pares) == 0:
+            return np.array([], dtype=np.intp)
+        return np.concatenate([
+            self._ordem_linhas[self._inicio_par[p]:self._inicio_par[p + 1]] for p in pares
+        ])
+
+    def _situacoes(self, filtros):
+        return (
+            _classificar(self.extremos_nota, filtros.nota_min, filtros.nota_max),
+            _classificar(self.extremos_receita, filtros.receita_min, filtros.receita_max),
+        )
+
+    def _dentro(self, tabela, filtros, situacao_nota, situacao_receita):
+        """Células de `tabela` inteiramente dentro dos filtros."""
+        ano = tabela["ano"].to_numpy()
+        return (
+            (ano >= filtros.ano_min) & (ano <= filtros.ano_max) &
+            (situacao_nota[tabela["faixa_nota"].to_numpy()] == DENTRO) &
+            (situacao_receita[tabela["faixa_receita"].to_numpy()] == DENTRO)
+        )
+
+    def _borda(self, filtros, situacao_nota, situacao_receita):
+        """Linhas das faixas de borda que passam no filtro exato."""
+        borda = self.df.iloc[self._linhas_de_borda(situacao_nota, situacao_receita)]
+        return borda[filtros.mascara(borda)]
+
+    def esboco(self, coluna):
+        """Esboço de quantis de `coluna` sobre todas as linhas (soma das células)."""
+        baldes = self.esbocos[coluna]
+        return EsbocoQuantis.de_chaves(baldes["chave"].to_numpy(), baldes["n"].to_numpy(), self.alfa_quantis)
+
+    def quantis(self, filtros, coluna, qs):
+        """
+        Quantis `qs` de `coluna` ("revenue" ou "score") nas linhas que passam
+        em `filtros`, com erro relativo de até `alfa_quantis` (ver
+        esboco_quantis). Células internas entram pelas contagens dos baldes;
+        só as linhas das faixas de borda são lidas.
+        """
+        situacao_nota, situacao_receita = self._situacoes(filtros)
+        baldes = self.esbocos[coluna]
+        dentro = self._dentro(baldes, filtros, situacao_nota, situacao_receita)
+        borda = self._borda(filtros, situacao_nota, situacao_receita)
+        esboco = EsbocoQuantis.de_chaves(
+            np.concatenate([
+                baldes["chave"].to_numpy()[dentro],
+                chaves_baldes(borda[coluna].to_numpy(dtype=float), self.alfa_quantis),
+            ]),
+            np.concatenate([baldes["n"].to_numpy()[dentro], np.ones(len(borda), dtype=np.int64)]),
+            self.alfa_quantis,
+        )
+        return esboco.quantis(qs)
+
+    def consultar(self, filtros, por=()):
+        """
+        Somas, contagens e médias das linhas que passam em `filtros`,
+        agrupadas pelas dimensões em `por` (vazio = total geral).
+        """
+        por = list(por)
+        situacao_nota, situacao_receita = self._situacoes(filtros)
+        celulas = self.celulas
+        dentro = self._dentro(celulas, filtros, situacao_nota, situacao_receita)
+        partes = [celulas.loc[dentro, por + MEDIDAS]]
+
+        # Faixas de borda: aplica o filtro exato só nas linhas dessas faixas
+        borda = self._borda(filtros, situacao_nota, situacao_receita)
+        if len(borda) > 0:
+            linhas = medidas_por_linha(borda)
+            for coluna in por:
+                linhas[coluna] = borda[coluna].to_numpy()
+            partes.append(linhas[por + MEDIDAS])
+
+        juntas = pd.concat(partes, ignore_index=True)
+        if por:
+            agregado = juntas.groupby(por, dropna=False, observed=True)[MEDIDAS].sum().reset_index()
+        else:
+            agregado = juntas[MEDIDAS].sum().to_frame().T
+        return adicionar_medias(agregado)
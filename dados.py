@@ -0,0 +1,665 @@
+# =========================
+# CARGA, TRATAMENTO E SNAPSHOT DOS DADOS
+# =========================
+# Funções puras (sem Streamlit) para ler o CSV de filmes, aplicar a limpeza e
+# manter um snapshot colunar em disco. Cada conjunto de dados entra por um
+# adaptador (FonteDados); o IMDb é o padrão e o catálogo Netflix fica em
+# netflix.py, servido pelo mesmo pipeline de snapshot. O snapshot é identificado por uma
+# impressão digital da fonte (ETag/Last-Modified da URL ou mtime do arquivo)
+# e do código de transformação: reinícios e novas réplicas leem o Parquet em
+# milissegundos e só reconstroem quando uma das duas muda.
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from config import ARQUIVO_TRADUCOES, CSV_URL, DIRETORIO_CACHE, TAMANHO_BLOCO_CSV, TIMEOUT_FONTE_SEGUNDOS
+from esboco_quantis import EsbocoQuantis, chaves_baldes
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato do snapshot mudar sem mudança de código
+VERSAO_SNAPSHOT = 2
+# Partes incrementais acumuladas antes de reescrever o snapshot inteiro
+MAX_PARTES_SNAPSHOT = 8
+
+
+# =========================
+# ESQUEMA DO CSV DO IMDb
+# =========================
+# Tipos finais de cada coluna. Textos repetidos viram categorias, textos
+# longos e quase únicos usam strings Arrow; as colunas numéricas são lidas
+# por inferência e convertidas com errors="coerce" em transformar_linhas.
+ESQUEMA_IMDB = {
+    "names": "category",
+    "genre": "category",
+    "overview": "string[pyarrow]",
+    "crew": "string[pyarrow]",
+    "orig_title": "string[pyarrow]",
+    "status": "category",
+    "orig_lang": "category",
+    "country": "category",
+}
+
+
+def _tipo_pandas(tipo):
+    """Strings Arrow voltam como string[pyarrow] (sem cópia); o resto segue o padrão do to_pandas."""
+    if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def ler_csv(origem, tamanho_bloco=TAMANHO_BLOCO_CSV):
+    """
+    Lê o CSV bruto (URL ou caminho local) em blocos, já com os tipos do
+    esquema. Cada bloco vira uma tabela Arrow assim que é lido (o bloco do
+    pandas é descartado) e a conversão final libera cada coluna Arrow depois
+    de convertê-la, para que o pico de memória fique perto do tamanho final.
+    """
+    tabelas = [
+        pa.Table.from_pandas(bloco, preserve_index=False)
+        for bloco in pd.read_csv(origem, dtype=ESQUEMA_IMDB, parse_dates=['date_x'], chunksize=tamanho_bloco)
+    ]
+    # Dicionários das categorias e tipos inferidos podem variar entre blocos
+    tabela = pa.concat_tables(tabelas, promote_options="permissive")
+    del tabelas
+    return tabela.to_pandas(self_destruct=True, split_blocks=True, types_mapper=_tipo_pandas)
+
+
+def _inteiro_estreito(serie):
+    """Menor tipo inteiro que comporta os valores."""
+    return pd.to_numeric(serie, downcast="integer")
+
+
+def _float_estreito(serie):
+    """float32 quando a conversão é exata para todos os valores; senão float64."""
+    reduzida = serie.astype("float32")
+    exata = (reduzida.astype("float64") == serie) | serie.isna()
+    return reduzida if exata.all() else serie
+
+
+def transformar_linhas(df):
+    """Limpeza e colunas derivadas que só dependem da própria linha (ano, mes, roi)."""
+    # Limpeza e transformação
+    df["revenue"] = pd.to_numeric(df.get("revenue"), errors="coerce").fillna(0)
+    df["score"] = _float_estreito(pd.to_numeric(df.get("score"), errors="coerce"))
+    df["budget_x"] = pd.to_numeric(df.get("budget_x"), errors="coerce").fillna(0)
+
+    # Extrair ano e mês
+    df["ano"] = _inteiro_estreito(df["date_x"].dt.year.fillna(0).astype(int))
+    df["mes"] = _inteiro_estreito(df["date_x"].dt.month.fillna(0).astype(int))
+
+    # Calcular ROI
+    df["roi"] = np.where(
+        df["budget_x"] > 0,
+        (df["revenue"] - df["budget_x"]) / df["budget_x"] * 100,
+        0
+    )
+    return df
+
+
+# Quantis de receita que separam as categorias de sucesso
+QUANTIS_SUCESSO = (0.4, 0.6, 0.8)
+
+
+def limites_de_esboco(esboco):
+    """Limites de sucesso a partir do esboço de quantis da receita."""
+    return tuple(float(limite) for limite in esboco.quantis(QUANTIS_SUCESSO))
+
+
+def limites_sucesso(receita):
+    """
+    Quantis 40/60/80% da receita que separam as categorias de sucesso, pelo
+    mesmo esboço mesclável do cubo (erro relativo ≤ ALFA_PADRAO, sem ordenar).
+    """
+    return limites_de_esboco(EsbocoQuantis.de_valores(receita))
+
+
+def categorizar_sucesso(df, limites):
+    """Categoria de sucesso de cada linha a partir dos limites de receita."""
+    q40, q60, q80 = limites
+    conditions = [
+        df['revenue'] >= q80,
+        df['revenue'] >= q60,
+        df['revenue'] >= q40,
+        df['revenue'] < q40
+    ]
+    choices = ['Blockbuster', 'High', 'Medium', 'Low']
+    df['success_category'] = pd.Categorical(
+        np.select(conditions, choices, default='Low'), categories=choices
+    )
+    return df
+
+
+def transformar_dados(df):
+    """Limpeza e colunas derivadas (ano, mes, roi, success_category)."""
+    transformar_linhas(df)
+    # Categorizar sucesso
+    return categorizar_sucesso(df, limites_sucesso(df['revenue']))
+
+
+def hash_linhas(bruto):
+    """
+    Hash de conteúdo de cada linha do CSV bruto (identidade para a ingestão
+    incremental). Linhas idênticas repetidas recebem hashes distintos.
+    """
+    hashes = pd.util.hash_pandas_object(bruto, index=False).to_numpy()
+    ocorrencia = pd.Series(hashes).groupby(hashes).cumcount().to_numpy().astype(np.uint64)
+    return hashes ^ (ocorrencia * np.uint64(0x9E3779B97F4A7C15))
+
+
+# Funções cujo código entra na impressão digital do snapshot
+_ETAPAS_TRANSFORMACAO = (ler_csv, _inteiro_estreito, _float_estreito, transformar_linhas, chaves_baldes, EsbocoQuantis, limites_de_esboco, limites_sucesso, categorizar_sucesso, transformar_dados, hash_linhas)
+
+
+# =========================
+# ADAPTADORES DE CONJUNTOS DE DADOS
+# =========================
+class FonteDados:
+    """
+    Como ler e transformar um conjunto de dados. O pipeline de snapshot
+    (carregar_dados_tratados) é o mesmo para todos os adaptadores.
+    """
+    # Prefixo dos arquivos de snapshot
+    nome = ""
+    # Funções cujo código entra na impressão digital do snapshot
+    etapas = ()
+
+    def ler(self, origem):
+        raise NotImplementedError
+
+    def transformar(self, bruto):
+        raise NotImplementedError
+
+    def finalizar(self, df):
+        """Colunas que dependem de todas as linhas (após aplicar partes incrementais)."""
+        return df
+
+    def anotar(self, df):
+        """Metadados extras em df.attrs."""
+
+
+class FonteIMDb(FonteDados):
+    """CSV de filmes do IMDb (padrão do dashboard)."""
+    nome = "filmes"
+    etapas = _ETAPAS_TRANSFORMACAO
+
+    def ler(self, origem):
+        return ler_csv(origem)
+
+    def transformar(self, bruto):
+        return transformar_dados(bruto)
+
+    def finalizar(self, df):
+        # Os limites de sucesso dependem de todas as linhas
+        return categorizar_sucesso(df, limites_sucesso(df["revenue"]))
+
+    def anotar(self, df):
+        df.attrs.setdefault("limites_sucesso", limites_sucesso(df["revenue"]))
+
+
+FONTE_IMDB = FonteIMDb()
+
+
+# =========================
+# IMPRESSÕES DIGITAIS
+# =========================
+def _eh_url(origem):
+    return str(origem).startswith(("http://", "https://"))
+
+
+def impressao_digital_transformacao(etapas=_ETAPAS_TRANSFORMACAO):
+    """Hash do código de leitura/transformação e da versão do snapshot."""
+    h = hashlib.sha256(f"v{VERSAO_SNAPSHOT}|pandas {pd.__version__}".encode())
+    for etapa in etapas:
+        h.update(inspect.getsource(etapa).encode())
+    return h.hexdigest()
+
+
+def impressao_digital_fonte(origem, timeout=TIMEOUT_FONTE_SEGUNDOS):
+    """
+    Identifica a versão atual da fonte sem baixá-la.
+
+    URLs usam ETag/Last-Modified/Content-Length de uma requisição HEAD;
+    arquivos locais usam tamanho e data de modificação. Retorna None quando a
+    fonte não informa nada confiável (o snapshot é então reconstruído) e
+    levanta OSError quando a fonte está inacessível (modo offline).
+    """
+    if _eh_url(origem):
+        requisicao = urllib.request.Request(origem, method="HEAD")
+        with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+            partes = [resposta.headers.get(h, "") for h in ("ETag", "Last-Modified", "Content-Length")]
+        return "|".join(partes) if any(partes) else None
+    estado = os.stat(origem)
+    return f"{estado.st_size}|{estado.st_mtime_ns}"
+
+
+# =========================
+# SNAPSHOT EM DISCO
+# =========================
+def _caminhos_snapshot(origem, diretorio, fonte=FONTE_IMDB):
+    chave_origem = hashlib.sha256(str(origem).encode()).hexdigest()[:12]
+    chave_transf = impressao_digital_transformacao(fonte.etapas)[:12]
+    base = Path(diretorio) / f"{fonte.nome}-{chave_origem}-{chave_transf}"
+    return base.with_suffix(".parquet"), base.with_suffix(".json")
+
+
+def _ler_metadados(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_atomico(caminho, escrever):
+    """Escreve em arquivo temporário e renomeia (seguro entre réplicas)."""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        escrever(temporario)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _gravar_metadados(caminho_meta, metadados):
+    _gravar_atomico(caminho_meta, lambda destino: Path(destino).write_text(json.dumps(metadados), encoding="utf-8"))
+
+
+def _gravar_snapshot(df, caminho_parquet, caminho_meta, impressao_fonte, fonte=FONTE_IMDB):
+    """Grava o snapshot e seus metadados (sem partes). Retorna False se não conseguiu."""
+    metadados = {
+        "fonte": impressao_fonte,
+        "transformacao": impressao_digital_transformacao(fonte.etapas),
+        "linhas": len(df),
+        "criado_em": datetime.now(timezone.utc).isoformat(),
+        "partes": [],
+    }
+    try:
+        _gravar_atomico(caminho_parquet, lambda destino: df.to_parquet(destino, index=False))
+        _gravar_metadados(caminho_meta, metadados)
+        return True
+    except OSError as erro:
+        # Sem permissão de escrita o app continua funcionando, só sem snapshot
+        logger.warning("Não foi possível gravar o snapshot em %s: %s", caminho_parquet, erro)
+        return False
+
+
+def _ler_parquet(caminho):
+    """
+    Lê um Parquet mantendo as strings no armazenamento Arrow do esquema
+    (pd.read_parquet as devolveria como objetos Python).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tipos = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+    return pq.read_table(caminho).to_pandas(types_mapper=tipos.get)
+
+
+def _ler_snapshot(caminho_parquet, metadados=None, fonte=FONTE_IMDB):
+    """Snapshot base mais as partes incrementais registradas nos metadados."""
+    try:
+        df = _ler_parquet(caminho_parquet)
+        partes = (metadados or {}).get("partes", [])
+        for parte in partes:
+            removidas = np.array([int(h) for h in parte["removidas"]], dtype=np.uint64)
+            df = df[~df["_hash_linha"].isin(removidas)]
+            novas = _ler_parquet(caminho_parquet.parent / parte["arquivo"])
+            # Categorias das partes (títulos novos) unidas às da base: mesmos tipos da carga completa
+            df = _concatenar([df, novas])
+        if partes:
+            df = fonte.finalizar(df)
+        return df
+    except Exception as erro:
+        logger.warning("Snapshot ilegível em %s: %s", caminho_parquet, erro)
+        return None
+
+
+def carregar_dados_tratados(origem=CSV_URL, diretorio=DIRETORIO_CACHE, fonte=FONTE_IMDB):
+    """
+    Retorna o DataFrame tratado pelo adaptador `fonte`, usando o snapshot em
+    disco sempre que possível.
+
+    - fonte e código inalterados: lê o Parquet, sem baixar nem reprocessar o CSV;
+    - fonte inacessível (offline): usa o último snapshot compatível;
+    - caso contrário: lê o CSV, transforma e grava um novo snapshot.
+    """
+    caminho_parquet, caminho_meta = _caminhos_snapshot(origem, diretorio, fonte)
+    metadados = _ler_metadados(caminho_meta)
+    snapshot_existe = metadados is not None and caminho_parquet.exists()
+
+    try:
+        impressao_fonte = impressao_digital_fonte(origem)
+    except OSError as erro:
+        if not snapshot_existe:
+            raise
+        logger.warning("Fonte indisponível (%s); usando snapshot de %s", erro, metadados.get("criado_em"))
+        impressao_fonte = metadados.get("fonte")
+        df = _ler_snapshot(caminho_parquet, metadados, fonte)
+        if df is None:
+            raise
+        return _anotar(df, impressao_fonte, fonte)
+
+    if snapshot_existe and impressao_fonte is not None and metadados.get("fonte") == impressao_fonte:
+        df = _ler_snapshot(caminho_parquet, metadados, fonte)
+        if df is not None:
+            return _anotar(df, impressao_fonte, fonte)
+
+    try:
+        bruto = fonte.ler(origem)
+    except OSError:
+        # A fonte respondeu ao HEAD mas o download falhou: snapshot antigo serve
+        df = _ler_snapshot(caminho_parquet, metadados, fonte) if snapshot_existe else None
+        if df is None:
+            raise
+        return _anotar(df, metadados.get("fonte"), fonte)
+    hashes = hash_linhas(bruto)
+    df = fonte.transformar(bruto)
+    df["_hash_linha"] = hashes
+
+    _gravar_snapshot(df, caminho_parquet, caminho_meta, impressao_fonte, fonte)
+    return _anotar(df, impressao_fonte, fonte)
+
+
+def _anotar(df, impressao_fonte, fonte=FONTE_IMDB):
+    """Guarda em df.attrs a versão dos dados (usada como chave de caches)."""
+    if impressao_fonte is None:
+        # Fonte sem validadores: a versão passa a ser o hash do conteúdo
+        impressao_fonte = str(pd.util.hash_pandas_object(df, index=False).sum())
+    df.attrs["fonte"] = impressao_fonte
+    fonte.anotar(df)
+    df.attrs["impressao_digital"] = hashlib.sha256(
+        f"{impressao_fonte}|{impressao_digital_transformacao(fonte.etapas)}".encode()
+    ).hexdigest()[:16]
+    return df
+
+
+# =========================
+# TRADUÇÃO DOS TÍTULOS
+# =========================
+def carregar_traducoes(caminho=ARQUIVO_TRADUCOES):
+    """Tabela original -> título em português (CSV com colunas original,traducao)."""
+    try:
+        tabela = pd.read_csv(caminho, dtype=str, keep_default_na=False)
+    except FileNotFoundError:
+        logger.warning("Arquivo de traduções não encontrado: %s", caminho)
+        return {}
+    return dict(zip(tabela["original"], tabela["traducao"]))
+
+
+def traduzir_nomes(nomes, traducoes):
+    """
+    Converte os títulos em coluna categórica já traduzida.
+
+    A tradução é feita uma vez por título distinto (categoria) e as linhas só
+    têm os códigos remapeados; títulos sem tradução mantêm o nome original.
+    """
+    nomes = nomes.astype("category")
+    categorias = nomes.cat.categories.to_series()
+    rotulos = categorias.map(traducoes).fillna(categorias)
+    codigos_rotulos, rotulos_unicos = pd.factorize(rotulos)
+    codigos = nomes.cat.codes.to_numpy()
+    novos_codigos = np.where(codigos >= 0, codigos_rotulos[codigos], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(novos_codigos, categories=rotulos_unicos),
+        index=nomes.index,
+        name=nomes.name,
+    )
+
+
+# =========================
+# RESOLUÇÃO DE CÓDIGOS DE PAÍS
+# =========================
+@functools.lru_cache(maxsize=1)
+def tabela_paises():
+    """ISO2, ISO3 e nome de todos os países (pycountry é importado só aqui, uma vez)."""
+    import pycountry
+    return pd.DataFrame(
+        [
+            (pais.alpha_2, pais.alpha_3, pais.name, getattr(pais, "common_name", pais.name))
+            for pais in pycountry.countries
+        ],
+        columns=["iso2", "iso3", "nome", "nome_comum"],
+    )
+
+
+# Nomes por extenso que o pycountry não conhece: nomes comuns antigos
+# ("Turkey" virou "Türkiye") e estados extintos, atribuídos ao sucessor
+APELIDOS_PAISES = {
+    "CZECH REPUBLIC": "CZE",
+    "RUSSIA": "RUS",
+    "TURKEY": "TUR",
+    "VATICAN CITY": "VAT",
+    "SOVIET UNION": "RUS",
+    "USSR": "RUS",
+    "EAST GERMANY": "DEU",
+    "WEST GERMANY": "DEU",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _indice_paises():
+    tabela = tabela_paises()
+    indice = dict(APELIDOS_PAISES)
+    # Nomes comuns ("Iran", "Vietnam") para fontes que trazem o país por extenso
+    for coluna in ("nome_comum", "nome", "iso3", "iso2"):
+        indice.update(zip(tabela[coluna].str.upper(), tabela["iso3"]))
+    return indice
+
+
+def nomes_paises():
+    """Dicionário ISO3 -> nome do país (rótulos do mapa)."""
+    tabela = tabela_paises()
+    return dict(zip(tabela["iso3"], tabela["nome"]))
+
+
+def resolver_paises(paises):
+    """
+    Converte a coluna de países (ISO2, ISO3, nome em inglês ou um dos
+    APELIDOS_PAISES) em uma coluna categórica ISO3, resolvendo cada valor
+    distinto uma única vez.
+
+    Retorna a coluna e a lista ordenada dos valores que não foram reconhecidos.
+    """
+    indice = _indice_paises()
+    paises = paises.astype("category")
+    categorias = paises.cat.categories.to_series()
+    iso3 = categorias.astype(str).str.strip().str.upper().map(indice)
+    nao_resolvidos = sorted(categorias[iso3.isna()].astype(str))
+    if nao_resolvidos:
+        logger.warning("Países não reconhecidos: %s", ", ".join(nao_resolvidos))
+    codigos_iso3, iso3_unicos = pd.factorize(iso3)
+    codigos = paises.cat.codes.to_numpy()
+    novos_codigos = np.where(codigos >= 0, codigos_iso3[codigos], -1)
+    coluna = pd.Series(
+        pd.Categorical.from_codes(novos_codigos, categories=iso3_unicos),
+        index=paises.index,
+        name="country_iso3",
+    )
+    return coluna, nao_resolvidos
+
+
+# =========================
+# ENRIQUECIMENTO NA CARGA
+# =========================
+def enriquecer(df, traducoes=None):
+    """Títulos traduzidos (categórica) e códigos ISO3 dos países."""
+    if traducoes is None:
+        traducoes = carregar_traducoes()
+    # Tradução resolvida uma vez por título distinto (coluna categórica)
+    df["names"] = traduzir_nomes(df["names"], traducoes)
+    # Códigos ISO3 resolvidos uma vez por país distinto (para o mapa mundi)
+    df["country_iso3"], df.attrs["paises_nao_resolvidos"] = resolver_paises(df["country"])
+    return df
+
+
+def _concatenar(partes):
+    """Concatena frames preservando colunas categóricas (une as categorias)."""
+    partes = [parte for parte in partes if len(parte) > 0] or partes[:1]
+    juntas = pd.concat(partes, ignore_index=True)
+    for coluna in partes[0].columns:
+        if isinstance(partes[0][coluna].dtype, pd.CategoricalDtype):
+            juntas[coluna] = pd.api.types.union_categoricals(
+                [parte[coluna].astype("category") for parte in partes], ignore_order=True
+            )
+    return juntas
+
+
+# =========================
+# INGESTÃO INCREMENTAL
+# =========================
+class AtualizacaoDados:
+    """Resultado de uma ingestão incremental."""
+
+    def __init__(self, df, removidas, n_adicionadas, categorias_recalculadas):
+        self.df = df
+        # Posições (no frame anterior) das linhas removidas ou alteradas
+        self.removidas = removidas
+        # As linhas novas ficam no fim do novo frame
+        self.n_adicionadas = n_adicionadas
+        self.categorias_recalculadas = categorias_recalculadas
+
+    @property
+    def adicionadas(self):
+        return np.arange(len(self.df) - self.n_adicionadas, len(self.df))
+
+
+def _gravar_parte(delta, hashes_removidos, limites, origem, diretorio, impressao_fonte):
+    """Registra o delta como uma parte do snapshot (ou o compacta com os `limites` de sucesso)."""
+    caminho_parquet, caminho_meta = _caminhos_snapshot(origem, diretorio)
+    metadados = _ler_metadados(caminho_meta)
+    if metadados is None or not caminho_parquet.exists():
+        return
+    try:
+        partes = metadados.setdefault("partes", [])
+        if len(partes) >= MAX_PARTES_SNAPSHOT:
+            # Muitas partes: reescreve o snapshot inteiro (raro)
+            base = _ler_snapshot(caminho_parquet, metadados)
+            base = base[~base["_hash_linha"].isin(hashes_removidos)]
+            compactado = _concatenar([base, delta])
+            categorizar_sucesso(compactado, limites)
+            if not _gravar_snapshot(compactado, caminho_parquet, caminho_meta, impressao_fonte):
+                return
+            # Os metadados novos já não citam as partes; uma réplica que ainda
+            # leia os antigos cai no CSV (snapshot ilegível) e segue funcionando
+            for parte in partes:
+                (caminho_parquet.parent / parte["arquivo"]).unlink(missing_ok=True)
+            return
+        nome_parte = f"{caminho_parquet.stem}-parte-{len(partes) + 1:04d}.parquet"
+        _gravar_atomico(caminho_parquet.parent / nome_parte, lambda destino: delta.to_parquet(destino, index=False))
+        partes.append({"arquivo": nome_parte, "removidas": [str(h) for h in hashes_removidos]})
+        metadados["fonte"] = impressao_fonte
+        metadados["linhas"] = metadados.get("linhas", 0) + len(delta) - len(hashes_removidos)
+        _gravar_metadados(caminho_meta, metadados)
+    except OSError as erro:
+        logger.warning("Não foi possível gravar a parte incremental do snapshot: %s", erro)
+
+
+def atualizar_incremental(df_atual, origem=CSV_URL, diretorio=DIRETORIO_CACHE, traducoes=None, esboco_receita=None):
+    """
+    Ingestão incremental: compara o hash de conteúdo de cada linha da fonte
+    com o frame atual e só transforma as linhas novas ou alteradas.
+
+    Retorna None quando a fonte não mudou; senão um AtualizacaoDados com o
+    novo frame (linhas mantidas na ordem original, seguidas das novas) e as
+    posições removidas, para que cubo e índices sejam atualizados pelo delta.
+    A leitura do CSV ainda percorre a fonte inteira para detectar o delta.
+
+    `esboco_receita` é o esboço de quantis da receita de `df_atual` (o do
+    cubo): os novos limites de sucesso saem dele mesclado com o delta, sem
+    reler a coluna inteira.
+    """
+    impressao_fonte = impressao_digital_fonte(origem)
+    if impressao_fonte is not None and impressao_fonte == df_atual.attrs.get("fonte"):
+        return None
+
+    bruto = ler_csv(origem)
+    hashes = hash_linhas(bruto)
+    hashes_atuais = df_atual["_hash_linha"].to_numpy()
+    mantidas = pd.Series(hashes_atuais).isin(hashes).to_numpy()
+    novas = ~pd.Series(hashes).isin(hashes_atuais).to_numpy()
+    removidas = np.flatnonzero(~mantidas)
+    if len(removidas) == 0 and not novas.any():
+        df_atual.attrs["fonte"] = impressao_fonte
+        return None
+
+    # Transformações só no delta
+    delta = transformar_linhas(bruto[novas].reset_index(drop=True))
+    delta["_hash_linha"] = hashes[novas]
+    if esboco_receita is None:
+        esboco_receita = EsbocoQuantis.de_valores(df_atual["revenue"])
+    limites_antigos = df_atual.attrs.get("limites_sucesso") or limites_de_esboco(esboco_receita)
+    # Os quantis de receita são globais: o esboço soma as linhas novas e subtrai as removidas
+    limites = limites_de_esboco(
+        esboco_receita
+        .mesclar(EsbocoQuantis.de_valores(delta["revenue"], esboco_receita.alfa))
+        .mesclar(EsbocoQuantis.de_valores(df_atual["revenue"].to_numpy()[removidas], esboco_receita.alfa), sinal=-1)
+    )
+    categorizar_sucesso(delta, limites_antigos)
+    _gravar_parte(delta, hashes_atuais[removidas], limites, origem, diretorio, impressao_fonte)
+
+    enriquecido = enriquecer(delta.copy(), traducoes)
+    df_novo = _concatenar([df_atual.iloc[np.flatnonzero(mantidas)], enriquecido[df_atual.columns]])
+
+    # Só recategoriza tudo se os limites mudarem
+    recalculadas = limites != tuple(limites_antigos)
+    if recalculadas:
+        categorizar_sucesso(df_novo, limites)
+    df_novo.attrs = dict(df_atual.attrs)
+    df_novo.attrs["limites_sucesso"] = limites
+    df_novo.attrs["paises_nao_resolvidos"] = sorted(
+        set(df_atual.attrs.get("paises_nao_resolvidos", [])) | set(enriquecido.attrs.get("paises_nao_resolvidos", []))
+    )
+    _anotar(df_novo, impressao_fonte)
+    return AtualizacaoDados(df_novo, removidas, int(novas.sum()), recalculadas)
+
+
+# =========================
+# RELATÓRIO DE MEMÓRIA
+# =========================
+def relatorio_memoria(antes, depois):
+    """Bytes por coluna de dois frames (ex.: leitura inferida x tipada)."""
+    relatorio = pd.DataFrame({
+        "tipo_antes": antes.dtypes.astype(str),
+        "bytes_antes": antes.memory_usage(deep=True, index=False),
+        "tipo_depois": depois.dtypes.astype(str),
+        "bytes_depois": depois.memory_usage(deep=True, index=False),
+    })
+    relatorio.loc["TOTAL", ["bytes_antes", "bytes_depois"]] = relatorio[["bytes_antes", "bytes_depois"]].sum()
+    relatorio["reducao_%"] = (1 - relatorio["bytes_depois"] / relatorio["bytes_antes"]) * 100
+    return relatorio
+
+
+def relatorio_memoria_fonte(origem=CSV_URL):
+    """Compara a leitura antiga (tipos inferidos) com a leitura tipada em blocos."""
+    inferido = pd.read_csv(origem, parse_dates=['date_x'])
+    inferido["revenue"] = pd.to_numeric(inferido.get("revenue"), errors="coerce").fillna(0)
+    inferido["score"] = pd.to_numeric(inferido.get("score"), errors="coerce")
+    inferido["budget_x"] = pd.to_numeric(inferido.get("budget_x"), errors="coerce").fillna(0)
+    inferido["ano"] = inferido["date_x"].dt.year.fillna(0).astype(int)
+    inferido["mes"] = inferido["date_x"].dt.month.fillna(0).astype(int)
+    tipado = transformar_dados(ler_csv(origem))
+    colunas = [coluna for coluna in tipado.columns if coluna in inferido.columns]
+    return relatorio_memoria(inferido[colunas], tipado[colunas])
+
+
+if __name__ == "__main__":
+    import sys
+
+    pd.set_option("display.width", 120)
+    print(relatorio_memoria_fonte(sys.argv[1] if len(sys.argv) > 1 else CSV_URL))
@@ -0,0 +1,98 @@
+# =========================
+# ESBOÇO DE QUANTIS MESCLÁVEL (DDSketch)
+# =========================
+# Cada valor cai num balde logarítmico de razão gama = (1+α)/(1-α) do seu
+# módulo (negativos em baldes espelhados, ~0 num balde próprio);
+# o esboço guarda só a contagem de cada balde. Dois esboços se mesclam somando
+# as contagens, o que permite mantê-los por célula do cubo, somá-los para
+# qualquer combinação de filtros e atualizá-los com o delta da ingestão.
+#
+# Garantia: para o quantil q, o valor devolvido difere no máximo α (erro
+# relativo) do elemento de posição floor(q * (n - 1)) da amostra ordenada.
+# O custo da consulta depende do número de baldes, não do número de linhas.
+import numpy as np
+
+ALFA_PADRAO = 0.01
+# Módulos abaixo deste limite (incluindo zero) vão para o balde CHAVE_ZERO
+MENOR_INDEXAVEL = 1e-9
+# Chaves > 0 são positivos, < 0 negativos (espelhados): a ordem das chaves
+# segue a ordem dos valores. O deslocamento cobre todo o intervalo do float64.
+DESLOCAMENTO = 2 ** 20
+CHAVE_ZERO = 0
+CHAVE_NAN = np.iinfo(np.int32).max
+
+
+def chaves_baldes(valores, alfa=ALFA_PADRAO):
+    """Balde de cada valor (int32); CHAVE_NAN para ausentes."""
+    valores = np.asarray(valores, dtype=float)
+    log_gama = np.log((1 + alfa) / (1 - alfa))
+    chaves = np.full(len(valores), CHAVE_ZERO, dtype=np.int32)
+    modulo = np.abs(valores)
+    indexaveis = modulo >= MENOR_INDEXAVEL
+    chave = np.ceil(np.log(modulo[indexaveis]) / log_gama).astype(np.int32) + DESLOCAMENTO
+    chaves[indexaveis] = np.where(valores[indexaveis] < 0, -chave, chave)
+    chaves[np.isnan(valores)] = CHAVE_NAN
+    return chaves
+
+
+class EsbocoQuantis:
+    """Contagens por balde logarítmico; quantis com erro relativo ≤ alfa."""
+
+    def __init__(self, alfa=ALFA_PADRAO):
+        self.alfa = alfa
+        self.gama = (1 + alfa) / (1 - alfa)
+        self.chaves = np.array([], dtype=np.int32)
+        self.contagens = np.array([], dtype=np.int64)
+
+    @classmethod
+    def de_chaves(cls, chaves, contagens=None, alfa=ALFA_PADRAO):
+        """Esboço a partir de baldes (repetidos ou não) e suas contagens."""
+        esboco = cls(alfa)
+        chaves = np.asarray(chaves, dtype=np.int32)
+        contagens = np.ones(len(chaves), dtype=np.int64) if contagens is None else np.asarray(contagens, dtype=np.int64)
+        validas = chaves != CHAVE_NAN
+        unicas, inversas = np.unique(chaves[validas], return_inverse=True)
+        somas = np.bincount(inversas, weights=contagens[validas], minlength=len(unicas)).astype(np.int64)
+        manter = somas > 0
+        esboco.chaves = unicas[manter]
+        esboco.contagens = somas[manter]
+        return esboco
+
+    @classmethod
+    def de_valores(cls, valores, alfa=ALFA_PADRAO):
+        """Esboço dos `valores` (ausentes são ignorados)."""
+        return cls.de_chaves(chaves_baldes(valores, alfa), alfa=alfa)
+
+    @property
+    def n(self):
+        return int(self.contagens.sum())
+
+    def mesclar(self, outro, sinal=1):
+        """
+        Novo esboço com as contagens dos dois (mesmo alfa). Com sinal=-1 as
+        contagens de `outro` são subtraídas (linhas removidas de `self`).
+        """
+        if outro.alfa != self.alfa:
+            raise ValueError("Só é possível mesclar esboços com o mesmo alfa.")
+        return EsbocoQuantis.de_chaves(
+            np.concatenate([self.chaves, outro.chaves]),
+            np.concatenate([self.contagens, sinal * outro.contagens]),
+            self.alfa,
+        )
+
+    def valores_baldes(self, chaves):
+        """Valor representativo de cada balde (meio relativo do intervalo)."""
+        chaves = np.asarray(chaves)
+        expoente = np.abs(chaves).astype(float) - DESLOCAMENTO
+        valores = np.sign(chaves) * 2 * np.power(self.gama, expoente) / (self.gama + 1)
+        return np.where(chaves == CHAVE_ZERO, 0.0, valores)
+
+    def quantis(self, qs):
+        """Estimativas dos quantis `qs` (NaN se o esboço estiver vazio)."""
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        total = self.n
+        if total == 0:
+            return np.full(len(qs), np.nan)
+        posicao = np.floor(qs * (total - 1))
+        balde = np.searchsorted(np.cumsum(self.contagens), posicao, side="right")
+        return self.valores_baldes(self.chaves[balde])
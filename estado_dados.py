@@ -0,0 +1,151 @@
+# =========================
+# VERSÃO CORRENTE DOS DADOS (COMPARTILHADA PELO PROCESSO)
+# =========================
+# Guarda o DataFrame, o cubo, o motor de filtros, o índice de busca, o
+# backend de consultas e a amostra estratificada da versão atual. Cada rerun
+# pega a versão inteira de uma vez (leitura atômica), e a ingestão
+# incremental publica uma versão nova derivada da anterior pelo delta:
+# cubo, motor de filtros e índice de busca são atualizados pelo delta; a
+# amostra e o Parquet do backend DuckDB são refeitos a cada versão (custam
+# uma passada sobre as colunas analíticas, sem tokenizar nem reagrupar).
+#
+# Uma versão existe uma vez por processo e é lida por todas as sessões: seus
+# arrays NumPy ficam somente leitura, de modo que uma escrita acidental de uma
+# sessão falha (ValueError) em vez de alterar os dados das outras. As sessões
+# trabalham com posições de linhas e resultados pequenos (sessao.py).
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from amostra import criar_amostra
+from busca import CAMPOS_BUSCA_IMDB, IndiceBusca
+from config import CSV_URL, DIRETORIO_CACHE, INTERVALO_ATUALIZACAO_SEGUNDOS, LIMIAR_APROXIMADO
+from consultas import criar_backend, remover_parquets_antigos
+from cubo import CuboOLAP
+from dados import atualizar_incremental, carregar_dados_tratados, enriquecer
+from filtros import MotorFiltros
+
+logger = logging.getLogger(__name__)
+
+# amostra é None em bases abaixo de LIMIAR_APROXIMADO
+VersaoDados = namedtuple("VersaoDados", ["df", "cubo", "motor_filtros", "indice_busca", "consultas", "amostra"])
+
+
+def congelar(valor):
+    """
+    Marca como somente leitura os arrays NumPy de `valor`: arrays, colunas de
+    DataFrames/Series (blocos, códigos de categóricas, dados e máscaras de
+    arrays anuláveis), dicionários, listas e tuplas deles. Arrays do Arrow já
+    são imutáveis; arrays de objetos ficam graváveis, porque rotinas em Cython
+    do pandas (ex.: memory_usage) exigem buffer gravável para eles. Devolve `valor`.
+    """
+    if isinstance(valor, np.ndarray):
+        if valor.dtype != object:
+            valor.setflags(write=False)
+    elif isinstance(valor, (pd.DataFrame, pd.Series)):
+        for array in valor._mgr.arrays:
+            congelar(array)
+            # Categóricas e datas guardam um _ndarray; anuláveis, _data e _mask
+            internos = ("_ndarray", "_data", "_mask") if hasattr(array, "_mask") else ("_ndarray",)
+            for interno in internos:
+                if isinstance(getattr(array, interno, None), np.ndarray):
+                    congelar(getattr(array, interno))
+        # Series já entregues por df[coluna] guardam visões criadas antes
+        if isinstance(valor, pd.DataFrame):
+            valor._clear_item_cache()
+    elif isinstance(valor, dict):
+        for item in valor.values():
+            congelar(item)
+    elif isinstance(valor, (list, tuple)):
+        for item in valor:
+            congelar(item)
+    return valor
+
+
+class EstadoDados:
+    """Dados tratados e estruturas derivadas, atualizados de forma incremental."""
+
+    def __init__(self, df, origem=CSV_URL, diretorio=DIRETORIO_CACHE, intervalo=INTERVALO_ATUALIZACAO_SEGUNDOS):
+        self.origem = origem
+        self.diretorio = diretorio
+        self.intervalo = intervalo
+        self._versao = self._versao_de(df, CuboOLAP(df), MotorFiltros(df))
+        remover_parquets_antigos(self.diretorio, {getattr(self._versao.consultas, "caminho", None)})
+        self._trava = threading.Lock()
+        self._ultima_verificacao = time.monotonic()
+        self._atualizando = False
+
+    def atual(self):
+        """Versão corrente (df, cubo, motor_filtros, indice_busca, consultas, amostra); não muda durante o uso."""
+        return self._versao
+
+    def _versao_de(self, df, cubo, motor_filtros, indice_busca=None):
+        """Completa uma versão com as estruturas reconstruídas a cada mudança dos dados e a congela."""
+        if indice_busca is None:
+            indice_busca = IndiceBusca(df, CAMPOS_BUSCA_IMDB)
+        # Sorteada de novo a cada versão: os estratos mudam com as linhas
+        amostra = criar_amostra(df, LIMIAR_APROXIMADO)
+        for estrutura in (df, vars(cubo), vars(motor_filtros), vars(indice_busca), vars(amostra) if amostra else None):
+            congelar(estrutura)
+        return VersaoDados(
+            df, cubo, motor_filtros, indice_busca,
+            criar_backend(df, cubo, motor_filtros, self.diretorio), amostra,
+        )
+
+    def atualizar(self):
+        """Aplica o delta da fonte, se houver. Retorna True quando a versão mudou."""
+        anterior = self._versao
+        atualizacao = atualizar_incremental(
+            anterior.df, self.origem, self.diretorio, esboco_receita=anterior.cubo.esboco("revenue")
+        )
+        if atualizacao is None:
+            return False
+        # Backend e amostra são reconstruídos na thread de atualização, fora dos reruns
+        self._versao = self._versao_de(
+            atualizacao.df,
+            anterior.cubo.aplicar_delta(atualizacao, anterior.df),
+            anterior.motor_filtros.aplicar_delta(atualizacao),
+            anterior.indice_busca.aplicar_delta(atualizacao, CAMPOS_BUSCA_IMDB),
+        )
+        # Um rerun em andamento ainda pode consultar a versão anterior: o seu
+        # Parquet só é apagado na próxima atualização
+        remover_parquets_antigos(
+            self.diretorio, {getattr(versao.consultas, "caminho", None) for versao in (anterior, self._versao)}
+        )
+        logger.info(
+            "Dados atualizados: %d linhas novas/alteradas, %d removidas%s",
+            atualizacao.n_adicionadas,
+            len(atualizacao.removidas),
+            " (categorias de sucesso recalculadas)" if atualizacao.categorias_recalculadas else "",
+        )
+        return True
+
+    def atualizar_em_segundo_plano(self):
+        """Dispara a verificação da fonte numa thread, no máximo a cada `intervalo` segundos."""
+        if self.intervalo <= 0:
+            return
+        with self._trava:
+            if self._atualizando or time.monotonic() - self._ultima_verificacao < self.intervalo:
+                return
+            self._atualizando = True
+            self._ultima_verificacao = time.monotonic()
+        threading.Thread(target=self._atualizar_protegido, name="atualizacao-dados", daemon=True).start()
+
+    def _atualizar_protegido(self):
+        try:
+            self.atualizar()
+        except Exception as erro:
+            # Fonte fora do ar ou CSV inválido: a versão atual continua valendo
+            logger.warning("Falha na atualização incremental: %s", erro)
+        finally:
+            with self._trava:
+                self._atualizando = False
+
+
+def carregar_estado(origem=CSV_URL):
+    """Dados tratados (snapshot Parquet quando a fonte não mudou) e suas estruturas, fora do Streamlit."""
+    return EstadoDados(enriquecer(carregar_dados_tratados(origem)), origem)
@@ -0,0 +1,131 @@
+# =========================
+# EXPORTAÇÃO DA SELEÇÃO (CSV / PARQUET EM BLOCOS)
+# =========================
+# A aba "Dados Completos" exporta a seleção atual (filtros, busca e ordem)
+# direto da base compartilhada e das posições das linhas: cada bloco copia
+# no máximo TAMANHO_BLOCO_EXPORTACAO linhas, só das colunas escolhidas, e é
+# gravado antes do próximo ser montado. Nenhuma cópia da seleção inteira é
+# materializada.
+#
+# Os arquivos ficam em static/exportacoes com nome derivado do conteúdo
+# (versão dos dados, linhas, colunas e formato): sessões que pedem a mesma
+# exportação reaproveitam o arquivo, e o servidor estático do Streamlit o
+# envia do disco em pedaços. O static/ é público, por isso o nome é um HMAC
+# com uma chave aleatória do processo: sem ela não dá para adivinhar o nome
+# da exportação de outra sessão.
+#
+# O link só aparece com o arquivo completo: o Streamlit não tem resposta em
+# streaming para downloads, então o primeiro byte chega depois da exportação
+# inteira (a barra de progresso mostra o andamento).
+import hashlib
+import hmac
+import os
+import secrets
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from config import DIRETORIO_EXPORTACOES, ORCAMENTO_EXPORTACOES_MB, TAMANHO_BLOCO_EXPORTACAO
+from dados import _gravar_atomico
+
+# formato -> (tipo MIME, extensão)
+FORMATOS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+# Chave dos nomes dos arquivos (trocada a cada processo; a poda apaga os antigos)
+_CHAVE_NOMES = secrets.token_bytes(32)
+
+
+def blocos_selecao(df, linhas, colunas, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+    """Fatias da seleção com só as `colunas`, de até `tamanho_bloco` linhas cada."""
+    posicoes = [df.columns.get_loc(coluna) for coluna in colunas]
+    for inicio in range(0, len(linhas), tamanho_bloco):
+        yield df.iloc[linhas[inicio:inicio + tamanho_bloco], posicoes]
+
+
+def tabelas_selecao(df, linhas, colunas, esquema, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO, progresso=None):
+    """Blocos da seleção como tabelas Arrow no `esquema`; `progresso` recebe a fração já entregue."""
+    entregues = 0
+    for bloco in blocos_selecao(df, linhas, colunas, tamanho_bloco):
+        yield pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False)
+        entregues += len(bloco)
+        if progresso:
+            progresso(entregues / len(linhas))
+
+
+def esquema_selecao(df, colunas):
+    """Esquema Arrow das `colunas` da base (categorias como dicionário), igual em todos os blocos."""
+    return pa.Schema.from_pandas(df.iloc[:0][list(colunas)], preserve_index=False)
+
+
+def escrever_csv(df, linhas, colunas, destino, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO, progresso=None):
+    """Grava a seleção em CSV (UTF-8) com o escritor do pyarrow, um bloco por vez."""
+    esquema = esquema_selecao(df, colunas)
+    # Datas da base não têm fração de segundo: sem os nove zeros dos nanossegundos
+    esquema_csv = pa.schema([
+        campo.with_type(pa.timestamp("s")) if pa.types.is_timestamp(campo.type) else campo
+        for campo in esquema
+    ])
+    opcoes = pa_csv.WriteOptions(quoting_style="needed")
+    with pa_csv.CSVWriter(destino, esquema_csv, write_options=opcoes) as escritor:
+        for tabela in tabelas_selecao(df, linhas, colunas, esquema, tamanho_bloco, progresso):
+            escritor.write_table(tabela.cast(esquema_csv, safe=False))
+
+
+def escrever_parquet(df, linhas, colunas, destino, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO, progresso=None):
+    """Grava a seleção em Parquet, um row group por bloco."""
+    esquema = esquema_selecao(df, colunas)
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for tabela in tabelas_selecao(df, linhas, colunas, esquema, tamanho_bloco, progresso):
+            escritor.write_table(tabela)
+
+
+ESCRITORES = {"csv": escrever_csv, "parquet": escrever_parquet}
+
+
+def nome_exportacao(df, linhas, colunas, formato):
+    """Nome do arquivo pelo conteúdo (versão dos dados, posições, colunas e formato), assinado com a chave do processo."""
+    conteudo = hmac.new(_CHAVE_NOMES, digestmod=hashlib.sha256)
+    conteudo.update(str(df.attrs.get("impressao_digital")).encode())
+    conteudo.update(linhas.astype("int64", copy=False).tobytes())
+    conteudo.update("\x1f".join(colunas).encode())
+    conteudo.update(formato.encode())
+    return f"filmes-{conteudo.hexdigest()[:32]}{FORMATOS[formato][1]}"
+
+
+def podar_exportacoes(diretorio=DIRETORIO_EXPORTACOES, orcamento_mb=ORCAMENTO_EXPORTACOES_MB, manter=None):
+    """Remove os arquivos usados há mais tempo até caberem no orçamento."""
+    arquivos = sorted(
+        (caminho for caminho in Path(diretorio).glob("filmes-*") if caminho != manter),
+        key=lambda caminho: caminho.stat().st_mtime,
+    )
+    total = sum(caminho.stat().st_size for caminho in Path(diretorio).glob("filmes-*"))
+    for caminho in arquivos:
+        if total <= orcamento_mb * 2**20:
+            break
+        total -= caminho.stat().st_size
+        caminho.unlink(missing_ok=True)
+
+
+def exportar(df, linhas, colunas, formato, diretorio=DIRETORIO_EXPORTACOES,
+             tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO, progresso=None):
+    """
+    Caminho do arquivo com a seleção exportada, gravando-o se ainda não existe.
+
+    `linhas` são posições na base, já na ordem desejada. Um arquivo já
+    preparado (por esta ou outra sessão) é reaproveitado.
+    """
+    caminho = Path(diretorio) / nome_exportacao(df, linhas, colunas, formato)
+    if caminho.exists():
+        # Marca como usado recentemente para a poda
+        os.utime(caminho)
+    else:
+        _gravar_atomico(caminho, lambda destino: ESCRITORES[formato](
+            df, linhas, colunas, destino, tamanho_bloco, progresso))
+        # mkstemp cria o arquivo só para o dono; o servidor estático precisa ler
+        os.chmod(caminho, 0o644)
+        podar_exportacoes(diretorio, manter=caminho)
+    return caminho
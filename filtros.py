@@ -0,0 +1,124 @@
+# =========================
+# ESTADO DOS FILTROS DA BARRA LATERAL
+# =========================
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Filtros:
+    """Faixas selecionadas na barra lateral (intervalos fechados)."""
+    ano_min: int
+    ano_max: int
+    nota_min: float
+    nota_max: float
+    receita_min: float
+    receita_max: float
+
+    def mascara(self, df):
+        """Máscara booleana de referência, idêntica ao filtro original do app."""
+        return (
+            (df["ano"] >= self.ano_min) &
+            (df["ano"] <= self.ano_max) &
+            (df["score"] >= self.nota_min) &
+            (df["score"] <= self.nota_max) &
+            (df["revenue"] >= self.receita_min) &
+            (df["revenue"] <= self.receita_max)
+        )
+
+
+# =========================
+# MOTOR DE FILTROS INDEXADO
+# =========================
+# Índices ordenados das colunas filtradas, construídos uma vez por versão dos
+# dados. Cada intervalo vira uma fatia contígua do índice por busca binária;
+# a fatia mais seletiva é conferida contra as outras duas colunas e o
+# resultado é o conjunto de posições das linhas (sem copiar o DataFrame).
+COLUNAS_INDEXADAS = ("ano", "score", "revenue")
+
+
+class MotorFiltros:
+    """Resolve os filtros da barra lateral em posições de linhas (row ids)."""
+
+    def __init__(self, df):
+        self.n_linhas = len(df)
+        self._valores = {}
+        self._indices = {}
+        for coluna in COLUNAS_INDEXADAS:
+            valores = df[coluna].to_numpy()
+            ordem = np.argsort(valores, kind="stable")
+            self._valores[coluna] = valores
+            # NaN fica no fim da ordenação e nunca cai dentro de um intervalo
+            self._indices[coluna] = (ordem, valores[ordem])
+
+    def aplicar_delta(self, atualizacao):
+        """
+        Novo motor para `atualizacao.df` sem reordenar tudo: as linhas mantidas
+        conservam a ordem do índice (só as posições são renumeradas) e as
+        novas entram por busca binária. Empates continuam em ordem de posição,
+        como na ordenação estável original.
+        """
+        novo = object.__new__(MotorFiltros)
+        df = atualizacao.df
+        novo.n_linhas = len(df)
+        novo._valores = {}
+        novo._indices = {}
+        mantidas = np.ones(self.n_linhas, dtype=bool)
+        mantidas[atualizacao.removidas] = False
+        nova_posicao = np.cumsum(mantidas) - 1
+        n_mantidas = int(mantidas.sum())
+        for coluna in COLUNAS_INDEXADAS:
+            ordem, ordenados = self._indices[coluna]
+            continua = mantidas[ordem]
+            ordem = nova_posicao[ordem[continua]]
+            ordenados = ordenados[continua]
+            valores = df[coluna].to_numpy()
+            novos = valores[n_mantidas:]
+            ordem_novos = np.argsort(novos, kind="stable")
+            insercao = np.searchsorted(ordenados, novos[ordem_novos], side="right")
+            novo._valores[coluna] = valores
+            novo._indices[coluna] = (
+                np.insert(ordem, insercao, n_mantidas + ordem_novos),
+                np.insert(ordenados, insercao, novos[ordem_novos]),
+            )
+        return novo
+
+    def _intervalos(self, filtros):
+        return {
+            "ano": (filtros.ano_min, filtros.ano_max),
+            "score": (filtros.nota_min, filtros.nota_max),
+            "revenue": (filtros.receita_min, filtros.receita_max),
+        }
+
+    def _fatia(self, coluna, minimo, maximo):
+        ordem, ordenados = self._indices[coluna]
+        inicio = np.searchsorted(ordenados, minimo, side="left")
+        fim = np.searchsorted(ordenados, maximo, side="right")
+        return ordem[inicio:max(inicio, fim)]
+
+    def selecionar(self, filtros):
+        """
+        Posições (em ordem crescente) das linhas que passam em `filtros`.
+        Equivale exatamente a `np.flatnonzero(filtros.mascara(df))`.
+        """
+        intervalos = self._intervalos(filtros)
+        fatias = {coluna: self._fatia(coluna, *faixa) for coluna, faixa in intervalos.items()}
+        mais_seletiva = min(fatias, key=lambda coluna: len(fatias[coluna]))
+        linhas = np.sort(fatias[mais_seletiva])
+        for coluna, (minimo, maximo) in intervalos.items():
+            if coluna == mais_seletiva or len(linhas) == 0:
+                continue
+            valores = self._valores[coluna][linhas]
+            linhas = linhas[(valores >= minimo) & (valores <= maximo)]
+        linhas.setflags(write=False)
+        return linhas
+
+
+def maiores(df, linhas, coluna, n):
+    """Posições das `n` linhas da seleção com maior `coluna` (como nlargest, keep='first')."""
+    valores = df[coluna].to_numpy()[linhas]
+    validos = ~np.isnan(valores)
+    candidatas = linhas[validos]
+    ordem = np.argsort(-valores[validos], kind="stable")[:n]
+    return candidatas[ordem]
@@ -0,0 +1,638 @@
+# =========================
+# GRÁFICOS DO DASHBOARD
+# =========================
+# Construtores das figuras Plotly. Recebem o DataFrame base e as posições das
+# linhas filtradas (ou agregados já consultados no cubo) e não dependem do
+# Streamlit, para poderem ser usados em benchmarks e relatórios offline.
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from config import BINS_DENSIDADE, LIMIAR_DENSIDADE, LIMIAR_WEBGL, LIMITE_CELULA_ISOLADA, MAX_PONTOS_ISOLADOS
+from filtros import maiores
+
+# =========================
+# TEMA E PAYLOAD DAS FIGURAS
+# =========================
+# O tema escuro é um template registrado no Plotly ("cineanalytics"), que
+# relatórios offline podem combinar com outros ("plotly_dark+cineanalytics").
+# Nos gráficos ele entra como layout da figura, sem trocar o template padrão
+# (no app, o do Streamlit, cujas cores o navegador troca pelas do tema ativo):
+# combinar templates custaria alguns ms por figura. Os dados vão ao navegador
+# como arrays NumPy numéricos, arredondados à precisão exibida, e arrays de
+# texto Unicode, sem a validação e a limpeza elemento a elemento que o Plotly
+# faz em listas e arrays de objetos; o JSON sai pelo orjson quando instalado.
+TEMA = "cineanalytics"
+pio.templates[TEMA] = go.layout.Template(layout=dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='white')
+))
+_LAYOUT_TEMA = pio.templates[TEMA].layout.to_plotly_json()
+
+# Casas decimais com que cada coluna é exibida (e enviada)
+CASAS_DECIMAIS = {'score': 1, 'revenue': 0, 'budget_x': 0, 'roi': 1}
+
+def _aplicar_tema(fig, **layout):
+    """Layout do tema e os ajustes da figura numa única atualização (o template padrão continua)."""
+    fig.update_layout(_LAYOUT_TEMA, **layout)
+    return fig
+
+def _valores(serie):
+    """Array numérico compacto da coluna: arredondado e inteiro quando não há casas nem nulos."""
+    valores = serie.to_numpy(dtype=float)
+    casas = CASAS_DECIMAIS.get(serie.name)
+    if casas is None:
+        return valores
+    valores = np.round(valores, casas)
+    if casas == 0 and np.isfinite(valores).all():
+        return valores.astype(np.int64)
+    return valores
+
+def _textos(serie):
+    """Textos como array Unicode do NumPy, que o Plotly valida e serializa sem iterar (nulos viram texto vazio)."""
+    return serie.astype(object).where(serie.notna(), '').to_numpy(dtype=str)
+
+def _traco_pontos(pontos, x, y, hover, labels, cor, webgl=False, **traco):
+    """
+    Traço de uma dispersão só com os arrays desenhados e os do hover: a
+    primeira coluna de texto do hover vai em `text`, as numéricas em `customdata`.
+    """
+    rotulo = lambda coluna: labels.get(coluna, coluna)
+    texto = next((coluna for coluna in hover if not pd.api.types.is_numeric_dtype(pontos[coluna])), None)
+    numericos = [coluna for coluna in hover if pd.api.types.is_numeric_dtype(pontos[coluna])]
+    hovertemplate = f"{rotulo(x)}=%{{x}}<br>{rotulo(y)}=%{{y}}"
+    if texto is not None:
+        hovertemplate += f"<br>{rotulo(texto)}=%{{text}}"
+    hovertemplate += "".join(f"<br>{rotulo(coluna)}=%{{customdata[{i}]}}" for i, coluna in enumerate(numericos))
+    return (go.Scattergl if webgl else go.Scatter)(
+        x=_valores(pontos[x]),
+        y=_valores(pontos[y]),
+        text=_textos(pontos[texto]) if texto is not None else None,
+        customdata=np.column_stack([_valores(pontos[coluna]) for coluna in numericos]) if numericos else None,
+        mode='markers',
+        marker_color=cor,
+        hovertemplate=hovertemplate + "<extra></extra>",
+        **traco
+    )
+
+def _histograma(valores, nbins, titulo, rotulo_x, rotulo_y, cor):
+    """Histograma com as contagens calculadas no servidor (só as barras vão ao navegador)."""
+    valores = valores[~np.isnan(valores)]
+    contagens, bordas = np.histogram(valores, bins=nbins)
+    largura = bordas[1] - bordas[0]
+    fig = go.Figure(go.Bar(
+        x=np.round((bordas[:-1] + bordas[1:]) / 2, 4),
+        y=contagens,
+        width=largura,
+        customdata=np.column_stack([np.round(bordas[:-1], 4), np.round(bordas[1:], 4)]),
+        marker_color=cor,
+        hovertemplate=f"{rotulo_x}=%{{customdata[0]}}–%{{customdata[1]}}<br>{rotulo_y}=%{{y}}<extra></extra>"
+    ))
+    return _aplicar_tema(
+        fig,
+        title=titulo,
+        xaxis_title=rotulo_x,
+        yaxis_title=rotulo_y,
+        bargap=0,
+        showlegend=False
+    )
+
+# =========================
+# FUNÇÕES DE ANÁLISE DO COLAB (CORRIGIDAS)
+# =========================
+def criar_grafico_top_filmes(df, linhas, top_n=10):
+    """Top filmes por receita - Gráfico 1 do Colab"""
+    top_filmes = df.iloc[maiores(df, linhas, 'revenue', top_n)][['names', 'revenue', 'score']].copy()
+    top_filmes['names'] = top_filmes['names'].astype(object)
+    
+    fig = px.bar(
+        top_filmes,
+        x='revenue',
+        y='names',
+        orientation='h',
+        title=f'🏆 Top {top_n} Filmes por Receita',
+        labels={'revenue': 'Receita (USD)', 'names': 'Filme'},
+        color='revenue',
+        color_continuous_scale='viridis',
+        hover_data=['score']
+    )
+    _aplicar_tema(
+        fig,
+        yaxis={'categoryorder': 'total ascending'},
+        height=500
+    )
+    return fig
+
+def _grafico_dispersao(df, linhas, x, y, hover, titulo, labels, cor):
+    """
+    Dispersão que escala com o volume: SVG para poucos pontos, WebGL acima de
+    LIMIAR_WEBGL e, acima de LIMIAR_DENSIDADE, um mapa de densidade 2D
+    calculado no servidor com os pontos isolados (outliers) mantidos.
+    """
+    if len(linhas) <= LIMIAR_DENSIDADE:
+        pontos = df[[x, y] + hover].iloc[linhas]
+        fig = go.Figure(_traco_pontos(pontos, x, y, hover, labels, cor, webgl=len(linhas) > LIMIAR_WEBGL))
+        fig.update_layout(title=titulo, xaxis_title=labels[x], yaxis_title=labels[y])
+        return fig
+
+    valores_x = df[x].to_numpy(dtype=float)[linhas]
+    valores_y = df[y].to_numpy(dtype=float)[linhas]
+    contagens, bordas_x, bordas_y = np.histogram2d(valores_x, valores_y, bins=BINS_DENSIDADE)
+
+    # Pontos em células quase vazias continuam visíveis (com hover)
+    celula_x = np.clip(np.searchsorted(bordas_x, valores_x, side='right') - 1, 0, BINS_DENSIDADE - 1)
+    celula_y = np.clip(np.searchsorted(bordas_y, valores_y, side='right') - 1, 0, BINS_DENSIDADE - 1)
+    isolados = np.flatnonzero(contagens[celula_x, celula_y] <= LIMITE_CELULA_ISOLADA)
+    if len(isolados) > MAX_PONTOS_ISOLADOS:
+        isolados = isolados[np.argsort(-valores_y[isolados], kind='stable')[:MAX_PONTOS_ISOLADOS]]
+    pontos = df[[x, y] + hover].iloc[linhas[isolados]]
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=np.round((bordas_x[:-1] + bordas_x[1:]) / 2, 4),
+        y=np.round((bordas_y[:-1] + bordas_y[1:]) / 2, 4),
+        z=np.where(contagens.T > 0, contagens.T, np.nan),
+        colorscale='Plasma',
+        colorbar=dict(title='Filmes'),
+        hovertemplate=f"{labels[x]}: %{{x:,.2f}}<br>{labels[y]}: %{{y:,.0f}}<br>Filmes: %{{z}}<extra></extra>",
+        name='Densidade'
+    ))
+    fig.add_trace(_traco_pontos(pontos, x, y, hover, labels, cor, webgl=True, marker_size=4, name='Pontos isolados'))
+    fig.update_layout(
+        title=f"{titulo} ({len(linhas):,} filmes, densidade)",
+        xaxis_title=labels[x],
+        yaxis_title=labels[y]
+    )
+    return fig
+
+def criar_grafico_dispercao_nota_receita(df, linhas):
+    """Relação entre nota e receita - Gráfico 2 do Colab (CORRIGIDO)"""
+    fig = _grafico_dispersao(
+        df,
+        linhas,
+        x='score',
+        y='revenue',
+        hover=['names'],
+        titulo='🎯 Relação entre Nota e Receita',
+        labels={'score': 'Nota IMDb', 'revenue': 'Receita (USD)'},
+        # Removido trendline que causava o erro
+        cor='#FF6B6B'
+    )
+    _aplicar_tema(fig)
+    return fig
+
+def criar_grafico_evolucao_receita_anual(por_ano):
+    """Evolução da receita anual - Gráfico 3 do Colab"""
+    receita_anual = por_ano[['ano', 'receita_soma']].rename(columns={'receita_soma': 'revenue'})
+    
+    fig = px.line(
+        receita_anual,
+        x='ano',
+        y='revenue',
+        title='📈 Evolução da Receita Anual da Indústria Cinematográfica',
+        labels={'ano': 'Ano', 'revenue': 'Receita Total (USD)'},
+        markers=True
+    )
+    fig.update_traces(line=dict(color='#4ECDC4', width=3))
+    _aplicar_tema(fig)
+    return fig
+
+def criar_grafico_distribuicao_idiomas(por_idioma):
+    """Distribuição de idiomas - Gráfico 4 do Colab"""
+    idiomas = (
+        por_idioma.dropna(subset=['orig_lang'])
+        .sort_values('n', ascending=False, kind='stable')
+        .head(10)[['orig_lang', 'n']]
+    )
+    idiomas.columns = ['Idioma', 'Quantidade']
+    
+    fig = px.pie(
+        idiomas,
+        values='Quantidade',
+        names='Idioma',
+        title='🌎 Distribuição dos Idiomas Originais (Top 10)',
+        hole=0.4,
+        color_discrete_sequence=px.colors.sequential.Plasma
+    )
+    _aplicar_tema(fig)
+    return fig
+
+def criar_grafico_filmes_por_ano(por_ano):
+    """Quantidade de filmes por ano - Gráfico 5 do Colab"""
+    filmes_ano = por_ano[['ano', 'n']].rename(columns={'n': 'quantidade'})
+    
+    fig = px.bar(
+        filmes_ano,
+        x='ano',
+        y='quantidade',
+        title='🎬 Quantidade de Filmes por Ano',
+        labels={'ano': 'Ano', 'quantidade': 'Número de Filmes'},
+        color='quantidade',
+        color_continuous_scale='blues'
+    )
+    _aplicar_tema(
+        fig,
+        showlegend=False
+    )
+    return fig
+
+def criar_grafico_media_notas_ano(por_ano):
+    """Média de notas por ano - Gráfico 6 do Colab"""
+    media_notas = por_ano[['ano', 'nota_media']].rename(columns={'nota_media': 'score'})
+    
+    fig = px.line(
+        media_notas,
+        x='ano',
+        y='score',
+        title='⭐ Evolução da Média de Notas por Ano',
+        labels={'ano': 'Ano', 'score': 'Nota Média'},
+        markers=True
+    )
+    fig.update_traces(line=dict(color='#FFA726', width=3))
+    _aplicar_tema(fig)
+    return fig
+
+def criar_grafico_correlacao(por_pais, nomes_paises):
+    """
+    Mapa Mundi de Receita por País. Substitui o mapa de calor de correlações
+    usando a coluna 'country_iso3', resolvida uma única vez na carga dos dados.
+    """
+
+    # Receita total por código ISO3, já agregada pelo cubo
+    df_country = por_pais.dropna(subset=["country_iso3"])[["country_iso3", "receita_soma"]]
+    df_country.columns = ["iso3", "value"]
+    df_country["country_raw"] = df_country["iso3"].map(nomes_paises)
+
+    if df_country.empty:
+        return None
+
+    # ========== MAPA MUNDI ==========
+    fig = px.choropleth(
+        df_country,
+        locations="iso3",
+        color="value",
+        hover_name="country_raw",
+        color_continuous_scale="Plasma",
+        projection="natural earth",
+        title=f"🌍 Receita Total por País",
+        labels={"value": "Receita Total (USD)"}
+    )
+
+    fig.update_geos(
+        showcountries=True,
+        showcoastlines=True,
+        showland=True,
+        landcolor="#2d2d2d", # Cor escura para o continente
+        oceancolor="#1a1a1a" # Cor escura para o oceano
+    )
+
+    _aplicar_tema(
+        fig,
+        margin=dict(r=0, t=50, l=0, b=0),
+        height=520
+    )
+
+    return fig
+
+
+def criar_grafico_decadas(por_ano):
+    """Análise por décadas - Gráfico 8 do Colab"""
+    decada_stats = (
+        por_ano.assign(decada=(por_ano['ano'] // 10) * 10)
+        .groupby('decada')[['receita_soma', 'nota_soma', 'nota_n', 'n_nomes']].sum()
+        .reset_index()
+    )
+    decada_stats['revenue'] = decada_stats['receita_soma'] # Soma para refletir o total da década
+    decada_stats['score'] = decada_stats['nota_soma'] / decada_stats['nota_n'].replace(0, np.nan)
+    decada_stats['names'] = decada_stats['n_nomes']
+    
+    # Filtra décadas com dados significativos
+    decada_stats = decada_stats[decada_stats['decada'] > 1900]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=decada_stats['decada'],
+        y=decada_stats['names'],
+        name='Número de Filmes',
+        marker_color='#4ECDC4'
+    ))
+    
+    # Normaliza a receita total para o eixo secundário
+    max_names = decada_stats['names'].max() if decada_stats['names'].max() > 0 else 1
+    max_revenue = decada_stats['revenue'].max() if decada_stats['revenue'].max() > 0 else 1
+    
+    fig.add_trace(go.Scatter(
+        x=decada_stats['decada'],
+        y=decada_stats['revenue'] / max_revenue * max_names, # Escala ajustada
+        name='Receita Total (escala ajustada)',
+        line=dict(color='#FF6B6B', width=3),
+        yaxis='y2'
+    ))
+    
+    _aplicar_tema(
+        fig,
+        title='📊 Análise por Décadas: Quantidade de Filmes e Receita Total',
+        xaxis_title='Década',
+        yaxis_title='Número de Filmes',
+        yaxis2=dict(
+            title='Receita Total (escala ajustada)',
+            overlaying='y',
+            side='right',
+            range=[0, max_names * 1.05] # Ajusta o limite superior
+        )
+    )
+    return fig
+
+def criar_grafico_sazonalidade(por_mes):
+    """Análise de sazonalidade - Gráfico 9 do Colab"""
+    if 'mes' in por_mes.columns and not por_mes['mes'].isnull().all():
+        sazonalidade = por_mes[['mes', 'receita_media', 'nota_media', 'n_nomes']].rename(
+            columns={'receita_media': 'revenue', 'nota_media': 'score', 'n_nomes': 'names'}
+        )
+        
+        meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
+                 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=[meses[m-1] for m in sazonalidade['mes']],
+            y=sazonalidade['revenue'],
+            name='Receita Média',
+            line=dict(color='#4ECDC4', width=3),
+            yaxis='y1'
+        ))
+        fig.add_trace(go.Bar(
+            x=[meses[m-1] for m in sazonalidade['mes']],
+            y=sazonalidade['names'],
+            name='Número de Filmes',
+            marker_color='rgba(255, 107, 107, 0.6)',
+            yaxis='y2'
+        ))
+        
+        _aplicar_tema(
+            fig,
+            title='📅 Sazonalidade: Lançamentos e Receita por Mês',
+            xaxis_title='Mês',
+            yaxis_title='Receita Média (USD)',
+            yaxis2=dict(
+                title='Número de Filmes',
+                overlaying='y',
+                side='right'
+            )
+        )
+        return fig
+    return None
+
+def criar_grafico_orcamento_vs_receita(df, linhas):
+    """Relação orçamento vs receita - Gráfico adicional do Colab (CORRIGIDO)"""
+    linhas_orcamento = linhas[df['budget_x'].to_numpy()[linhas] > 0]
+    if len(linhas_orcamento) > 0:
+        fig = _grafico_dispersao(
+            df,
+            linhas_orcamento,
+            x='budget_x',
+            y='revenue',
+            hover=['names', 'score'],
+            titulo='💰 Relação entre Orçamento e Receita',
+            labels={'budget_x': 'Orçamento (USD)', 'revenue': 'Receita (USD)'},
+            cor='#FFA726'
+        )
+        _aplicar_tema(fig)
+        return fig
+    return None
+
+def criar_grafico_distribuicao_notas(df, linhas):
+    """Distribuição de notas - Gráfico adicional do Colab"""
+    return _histograma(
+        df['score'].to_numpy(dtype=float)[linhas],
+        nbins=30,
+        titulo='📊 Distribuição das Notas dos Filmes',
+        rotulo_x='Nota IMDb',
+        rotulo_y='Número de Filmes',
+        cor='#4ECDC4'
+    )
+
+def criar_grafico_categorias_sucesso(df, linhas):
+    """Distribuição por categoria de sucesso"""
+    success_dist = df['success_category'].iloc[linhas].value_counts()
+    # Categórica: value_counts lista também as categorias sem filmes
+    success_dist = success_dist[success_dist > 0]
+    if len(success_dist) == 0:
+        return None
+    fig = px.pie(
+        values=success_dist.values,
+        names=success_dist.index,
+        title="Distribuição por Categoria de Sucesso",
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    _aplicar_tema(fig)
+    return fig
+
+def criar_grafico_top_roi(df, linhas):
+    """Top filmes por ROI (somente ROI e orçamento positivos, para evitar distorções)"""
+    linhas_roi = linhas[
+        (df['roi'].to_numpy()[linhas] > 0) & (df['budget_x'].to_numpy()[linhas] > 0)
+    ]
+    df_roi = df.iloc[maiores(df, linhas_roi, 'roi', 10)].copy()
+    if df_roi.empty:
+        return None
+    df_roi['names'] = df_roi['names'].astype(object)
+    fig = px.bar(
+        df_roi,
+        x='roi',
+        y='names',
+        orientation='h',
+        title='📈 Top Filmes por ROI',
+        labels={'roi': 'ROI (%)', 'names': 'Filme'},
+        color='roi',
+        color_continuous_scale='viridis'
+    )
+    _aplicar_tema(
+        fig,
+        yaxis={'categoryorder': 'total ascending'},
+        height=400
+    )
+    return fig
+
+MESES_ORDENADOS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+                   'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+def criar_grafico_receita_mensal(por_mes):
+    """Receita média por mês"""
+    # CORREÇÃO: Usar a coluna 'mes' para agrupar, mas usar o mapeamento para Plotly
+    receita_mensal = por_mes[['mes', 'receita_media']].rename(columns={'receita_media': 'revenue'})
+    if len(receita_mensal) == 0:
+        return None
+    fig = px.bar(
+        receita_mensal,
+        x=receita_mensal['mes'].apply(lambda x: MESES_ORDENADOS[x-1]),
+        y='revenue',
+        title='💰 Receita Média por Mês',
+        labels={'x': 'Mês', 'revenue': 'Receita Média'},
+        color='revenue',
+        color_continuous_scale='blues'
+    )
+    _aplicar_tema(
+        fig,
+        xaxis={'categoryorder':'array', 'categoryarray': MESES_ORDENADOS} # Ordena os meses
+    )
+    return fig
+
+def criar_grafico_filmes_mensal(por_mes):
+    """Número de filmes por mês"""
+    filmes_mensal = por_mes[['mes', 'n']].rename(columns={'n': 'count'})
+    if len(filmes_mensal) == 0:
+        return None
+    fig = px.bar(
+        filmes_mensal,
+        x=filmes_mensal['mes'].apply(lambda x: MESES_ORDENADOS[x-1]),
+        y='count',
+        title='🎬 Número de Filmes por Mês',
+        labels={'x': 'Mês', 'count': 'Número de Filmes'},
+        color='count',
+        color_continuous_scale='greens'
+    )
+    _aplicar_tema(
+        fig,
+        xaxis={'categoryorder':'array', 'categoryarray': MESES_ORDENADOS} # Ordena os meses
+    )
+    return fig
+
+
+# =========================
+# GRÁFICOS DO CATÁLOGO NETFLIX
+# =========================
+def criar_grafico_netflix_titulos_por_ano(df, linhas):
+    """Títulos lançados por ano, separados em filmes e séries"""
+    selecao = df[['ano', 'Category']].iloc[linhas]
+    por_ano = (
+        selecao[selecao['ano'] > 0]
+        .groupby(['ano', 'Category'], observed=True).size()
+        .reset_index(name='quantidade')
+    )
+    if por_ano.empty:
+        return None
+    fig = px.bar(
+        por_ano,
+        x='ano',
+        y='quantidade',
+        color='Category',
+        title='📺 Títulos por Ano de Lançamento',
+        labels={'ano': 'Ano', 'quantidade': 'Títulos', 'Category': 'Tipo'},
+        color_discrete_sequence=['#E50914', '#4ECDC4']
+    )
+    _aplicar_tema(
+        fig,
+        barmode='stack'
+    )
+    return fig
+
+def criar_grafico_netflix_ranking(contagens, titulo, rotulo, top_n=15, cor='#E50914'):
+    """Ranking dos valores mais frequentes de uma tabela-ponte (gêneros, países, elenco)"""
+    ranking = contagens.head(top_n)
+    if ranking.empty:
+        return None
+    fig = px.bar(
+        x=ranking.to_numpy(),
+        y=ranking.index.astype(str),
+        orientation='h',
+        title=titulo,
+        labels={'x': 'Títulos', 'y': rotulo},
+        color_discrete_sequence=[cor]
+    )
+    _aplicar_tema(
+        fig,
+        yaxis={'categoryorder': 'total ascending'},
+        height=500
+    )
+    return fig
+
+def criar_grafico_netflix_mapa(contagens_paises, iso3_por_pais, nomes_paises):
+    """Mapa Mundi com o número de títulos por país de produção"""
+    por_pais = (
+        contagens_paises.rename(index=iso3_por_pais)
+        .loc[lambda serie: serie.index.notna()]
+        .groupby(level=0).sum()
+    )
+    if por_pais.empty:
+        return None
+    df_paises = pd.DataFrame({'iso3': por_pais.index, 'value': por_pais.to_numpy()})
+    df_paises['country_raw'] = df_paises['iso3'].map(nomes_paises)
+    fig = px.choropleth(
+        df_paises,
+        locations='iso3',
+        color='value',
+        hover_name='country_raw',
+        color_continuous_scale='Reds',
+        projection='natural earth',
+        title='🌍 Títulos por País de Produção',
+        labels={'value': 'Títulos'}
+    )
+    fig.update_geos(
+        showcountries=True,
+        showcoastlines=True,
+        showland=True,
+        landcolor="#2d2d2d",
+        oceancolor="#1a1a1a"
+    )
+    _aplicar_tema(
+        fig,
+        margin=dict(r=0, t=50, l=0, b=0),
+        height=520
+    )
+    return fig
+
+def criar_grafico_netflix_duracao_filmes(df, linhas):
+    """Distribuição da duração dos filmes (minutos)"""
+    minutos = df['duracao_min'].to_numpy()[linhas]
+    minutos = minutos[~np.isnan(minutos)]
+    if len(minutos) == 0:
+        return None
+    return _histograma(
+        minutos,
+        nbins=40,
+        titulo='⏱️ Duração dos Filmes',
+        rotulo_x='Duração (min)',
+        rotulo_y='Filmes',
+        cor='#E50914'
+    )
+
+def criar_grafico_netflix_temporadas(df, linhas):
+    """Número de temporadas das séries"""
+    temporadas = df['temporadas'].to_numpy()[linhas]
+    temporadas = temporadas[~np.isnan(temporadas)].astype(int)
+    if len(temporadas) == 0:
+        return None
+    valores, contagens = np.unique(temporadas, return_counts=True)
+    fig = px.bar(
+        x=valores,
+        y=contagens,
+        title='📺 Séries por Número de Temporadas',
+        labels={'x': 'Temporadas', 'y': 'Séries'},
+        color_discrete_sequence=['#4ECDC4']
+    )
+    _aplicar_tema(
+        fig,
+        xaxis=dict(dtick=1)
+    )
+    return fig
+
+def criar_grafico_netflix_classificacao(df, linhas):
+    """Distribuição da classificação indicativa"""
+    classificacao = df['Rating'].iloc[linhas].value_counts()
+    classificacao = classificacao[classificacao > 0]
+    if len(classificacao) == 0:
+        return None
+    fig = px.pie(
+        values=classificacao.values,
+        names=classificacao.index.astype(str),
+        title='🔞 Classificação Indicativa',
+        hole=0.4,
+        color_discrete_sequence=px.colors.sequential.Reds_r
+    )
+    _aplicar_tema(fig)
+    return fig
@@ -0,0 +1,108 @@
+# =========================
+# INSTRUMENTAÇÃO DO RERUN
+# =========================
+# Tempo de cada seção de um rerun do script. O app marca o fim de cada seção
+# (carga, barra lateral, filtro, aba renderizada) e guarda os tempos em
+# st.session_state, onde o harness de latência e o diagnóstico os leem.
+# Operações internas (consultas ao cubo, construção de gráficos, tabela) são
+# medidas à parte, junto com contadores como acertos do cache de figuras.
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+CHAVE_RERUNS = "_contagem_reruns"
+
+
+class CronometroRerun:
+    """Tempos (s) por seção de um rerun, medidos entre marcas consecutivas."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self._ultima_marca = self.inicio
+        self.tempos = {}
+        self.operacoes = {}
+        self.contadores = {}
+
+    def marcar(self, secao):
+        """Encerra `secao`: soma o tempo decorrido desde a marca anterior."""
+        agora = time.perf_counter()
+        self.tempos[secao] = self.tempos.get(secao, 0.0) + agora - self._ultima_marca
+        self._ultima_marca = agora
+
+    @contextmanager
+    def medir(self, operacao):
+        """Soma a duração do bloco em `operacoes[operacao]` (não afeta as marcas)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.somar(operacao, time.perf_counter() - inicio)
+
+    def somar(self, operacao, segundos):
+        """Soma uma duração medida fora do script (ex.: num trabalhador do pool)."""
+        self.operacoes[operacao] = self.operacoes.get(operacao, 0.0) + segundos
+
+    def contar(self, contador, quantidade=1):
+        self.contadores[contador] = self.contadores.get(contador, 0) + quantidade
+
+    def total(self):
+        """Tempo desde o início do rerun."""
+        return time.perf_counter() - self.inicio
+
+    def mais_lenta(self):
+        """Nome da seção mais demorada (None se nada foi marcado)."""
+        return max(self.tempos, key=self.tempos.get, default=None)
+
+    def resumo(self):
+        """Tempos, operações e contadores do rerun num dicionário serializável."""
+        return {
+            "total_segundos": round(self.total(), 6),
+            "secao_mais_lenta": self.mais_lenta(),
+            "secoes": {secao: round(segundos, 6) for secao, segundos in self.tempos.items()},
+            "operacoes": {operacao: round(segundos, 6) for operacao, segundos in self.operacoes.items()},
+            "contadores": dict(self.contadores),
+        }
+
+
+# =========================
+# CONTAGEM DE RERUNS DA SESSÃO
+# =========================
+def rerun_de_fragmento():
+    """True quando o Streamlit reexecuta só um fragmento, não o script inteiro."""
+    contexto = get_script_run_ctx()
+    return bool(contexto and contexto.fragment_ids_this_run)
+
+
+def contar_rerun(estado, tipo):
+    """Soma um rerun do `tipo` ("completo", "fragmento:<nome>") na contagem da sessão."""
+    contagem = estado.setdefault(CHAVE_RERUNS, {})
+    contagem[tipo] = contagem.get(tipo, 0) + 1
+    return contagem
+
+
+# =========================
+# MEMÓRIA E LOG ESTRUTURADO
+# =========================
+def memoria_frame(df):
+    """Bytes ocupados pelo DataFrame (conteúdo de strings e categorias incluído)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def configurar_log_json():
+    """Envia as linhas JSON do diagnóstico para stderr (uma vez por processo)."""
+    if not logger.handlers:
+        manipulador = logging.StreamHandler()
+        manipulador.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(manipulador)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def registrar_json(evento, **campos):
+    """Uma linha JSON com o `evento` e seus campos, para coletores de log."""
+    logger.info(json.dumps({"evento": evento, "instante": time.time(), **campos}, ensure_ascii=False, default=str))
@@ -0,0 +1,171 @@
+# =========================
+# CATÁLOGO NETFLIX (Netflix Dataset.csv)
+# =========================
+# Adaptador do CSV do catálogo Netflix para o pipeline de snapshot de
+# dados.py. Datas e durações são convertidas de forma vetorizada; os campos
+# multivalorados (elenco, países, gêneros) viram tabelas-ponte normalizadas
+# em formato CSR, construídas uma vez por versão dos dados, em vez de separar
+# as strings a cada consulta.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from busca import CAMPOS_BUSCA_NETFLIX, IndiceBusca
+from config import DIRETORIO_CACHE, NETFLIX_CSV
+from dados import FonteDados, _inteiro_estreito, carregar_dados_tratados, hash_linhas, resolver_paises
+
+ESQUEMA_NETFLIX = {
+    "Show_Id": "string[pyarrow]",
+    "Category": "category",
+    "Title": "string[pyarrow]",
+    "Director": "string[pyarrow]",
+    "Cast": "string[pyarrow]",
+    "Country": "string[pyarrow]",
+    "Release_Date": "string[pyarrow]",
+    "Rating": "category",
+    "Duration": "string[pyarrow]",
+    "Type": "string[pyarrow]",
+    "Description": "string[pyarrow]",
+}
+FORMATO_DATA = "%B %d, %Y"
+# Campos multivalorados (separados por vírgula) e o nome da ponte de cada um
+CAMPOS_MULTIVALORADOS = {"elenco": "Cast", "paises": "Country", "generos": "Type"}
+
+
+def ler_csv_netflix(origem):
+    """Lê o CSV do catálogo com os tipos do esquema."""
+    return pd.read_csv(origem, dtype=ESQUEMA_NETFLIX)
+
+
+def transformar_netflix(bruto):
+    """Data de lançamento, ano/mês e duração em minutos (filmes) ou temporadas (séries)."""
+    df = bruto.copy()
+    data = pd.to_datetime(df["Release_Date"].str.strip(), format=FORMATO_DATA, errors="coerce")
+    df["data_lancamento"] = data
+    df["ano"] = _inteiro_estreito(data.dt.year.fillna(0).astype(int))
+    df["mes"] = _inteiro_estreito(data.dt.month.fillna(0).astype(int))
+
+    # "93 min" ou "4 Seasons": número e unidade numa única extração
+    duracao = df["Duration"].astype(object).str.extract(r"^\s*(\d+)\s*(min|Seasons?)\s*$")
+    numero = pd.to_numeric(duracao[0], errors="coerce")
+    df["duracao_min"] = numero.where(duracao[1] == "min").astype("float32")
+    df["temporadas"] = numero.where(duracao[1].str.startswith("Season", na=False)).astype("float32")
+    return df
+
+
+class FonteNetflix(FonteDados):
+    """Catálogo Netflix empacotado no repositório."""
+    nome = "netflix"
+    etapas = (ler_csv_netflix, _inteiro_estreito, transformar_netflix, hash_linhas)
+
+    def ler(self, origem):
+        return ler_csv_netflix(origem)
+
+    def transformar(self, bruto):
+        return transformar_netflix(bruto)
+
+
+FONTE_NETFLIX = FonteNetflix()
+
+
+# =========================
+# TABELAS-PONTE (CAMPOS MULTIVALORADOS)
+# =========================
+class Ponte:
+    """
+    Relação linha -> valores de um campo multivalorado em formato CSR: os
+    valores da linha i são `valores[codigos[inicio[i]:inicio[i + 1]]]`. Um
+    índice invertido (linhas de cada valor) é mantido ao lado.
+    """
+
+    def __init__(self, valores, inicio, codigos):
+        self.valores = valores
+        self.inicio = inicio
+        self.codigos = codigos
+        linha_da_entrada = np.repeat(np.arange(len(inicio) - 1), np.diff(inicio))
+        ordem = np.argsort(codigos, kind="stable")
+        self._linhas_por_valor = linha_da_entrada[ordem]
+        self._inicio_valor = np.searchsorted(codigos[ordem], np.arange(len(valores) + 1))
+
+    @classmethod
+    def de_coluna(cls, serie, separador=","):
+        """Separa a coluna uma única vez e normaliza os valores (códigos por valor distinto)."""
+        listas = serie.astype(object).str.split(separador)
+        # explode mantém a ordem das linhas; ausentes viram um único item NaN
+        linhas = np.arange(len(serie)).repeat(listas.str.len().to_numpy(dtype=float, na_value=1).astype(int))
+        itens = listas.explode().str.strip()
+        validos = itens.notna().to_numpy() & (itens != "").to_numpy()
+        codigos, valores = pd.factorize(itens[validos])
+        por_linha = np.bincount(linhas[validos], minlength=len(serie))
+        inicio = np.concatenate([[0], np.cumsum(por_linha)])
+        return cls(pd.Index(valores), inicio, codigos.astype(np.int32))
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def _entradas(self, linhas):
+        """Máscara das entradas que pertencem às `linhas` selecionadas."""
+        selecionadas = np.zeros(len(self.inicio) - 1, dtype=bool)
+        selecionadas[linhas] = True
+        return np.repeat(selecionadas, np.diff(self.inicio))
+
+    def contagens(self, linhas=None):
+        """Número de linhas (da seleção) com cada valor, em ordem decrescente."""
+        codigos = self.codigos if linhas is None else self.codigos[self._entradas(linhas)]
+        contagem = np.bincount(codigos, minlength=len(self.valores))
+        return pd.Series(contagem, index=self.valores).loc[lambda serie: serie > 0].sort_values(ascending=False)
+
+    def linhas_com(self, valor):
+        """Posições (crescentes) das linhas que têm `valor`."""
+        codigo = self.valores.get_indexer([valor])[0]
+        if codigo < 0:
+            return np.array([], dtype=np.intp)
+        return self._linhas_por_valor[self._inicio_valor[codigo]:self._inicio_valor[codigo + 1]]
+
+    def valores_da_linha(self, linha):
+        return list(self.valores[self.codigos[self.inicio[linha]:self.inicio[linha + 1]]])
+
+    def como_tabela(self):
+        """Tabela-ponte normalizada (linha, codigo) e a dimensão de valores."""
+        linha = np.repeat(np.arange(len(self.inicio) - 1), np.diff(self.inicio))
+        return pd.DataFrame({"linha": linha, "codigo": self.codigos}), self.valores.to_frame(index=False, name="valor")
+
+
+@dataclass(frozen=True)
+class FiltrosNetflix:
+    """Seleção da barra lateral do catálogo (também usada como chave de cache)."""
+    ano_min: int
+    ano_max: int
+    categorias: tuple
+    genero: str = None
+    pais: str = None
+
+
+class CatalogoNetflix:
+    """Catálogo tratado, as tabelas-ponte dos campos multivalorados e o índice de busca."""
+
+    def __init__(self, df):
+        self.df = df
+        self.pontes = {nome: Ponte.de_coluna(df[coluna]) for nome, coluna in CAMPOS_MULTIVALORADOS.items()}
+        # Países do catálogo vêm por nome: resolvidos para ISO3 uma vez por valor distinto
+        paises = self.pontes["paises"].valores
+        iso3, self.paises_nao_resolvidos = resolver_paises(pd.Series(paises, dtype=object))
+        self.iso3_por_pais = dict(zip(paises, iso3.astype(object)))
+        self.indice_busca = IndiceBusca(df, CAMPOS_BUSCA_NETFLIX)
+
+    def selecionar(self, filtros):
+        """Posições (crescentes) dos títulos que passam em `filtros`."""
+        ano = self.df["ano"].to_numpy()
+        mascara = (ano >= filtros.ano_min) & (ano <= filtros.ano_max)
+        mascara &= self.df["Category"].isin(filtros.categorias).to_numpy()
+        linhas = np.flatnonzero(mascara)
+        for ponte, valor in (("generos", filtros.genero), ("paises", filtros.pais)):
+            if valor is not None:
+                linhas = np.intersect1d(linhas, self.pontes[ponte].linhas_com(valor), assume_unique=True)
+        return linhas
+
+
+def carregar_catalogo(origem=NETFLIX_CSV, diretorio=DIRETORIO_CACHE):
+    """Catálogo pelo mesmo snapshot Parquet do IMDb (offline por padrão: o CSV é local)."""
+    return CatalogoNetflix(carregar_dados_tratados(origem, diretorio, FONTE_NETFLIX))
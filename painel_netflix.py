@@ -0,0 +1,204 @@
+# =========================
+# PAINEL DO CATÁLOGO NETFLIX
+# =========================
+# Seções do dashboard quando CINE_FONTE=netflix. Os dados passam pelo mesmo
+# snapshot em cache do IMDb; gêneros, países e elenco são consultados nas
+# tabelas-ponte do catálogo. Usa o cache de figuras e o cronômetro do app.
+import streamlit as st
+
+from config import NETFLIX_CSV, TAMANHO_PAGINA_TABELA
+from dados import nomes_paises
+from estado_dados import congelar
+from graficos import (
+    criar_grafico_netflix_classificacao,
+    criar_grafico_netflix_duracao_filmes,
+    criar_grafico_netflix_mapa,
+    criar_grafico_netflix_ranking,
+    criar_grafico_netflix_temporadas,
+    criar_grafico_netflix_titulos_por_ano,
+)
+from netflix import FiltrosNetflix, carregar_catalogo
+from sessao import rotulo_todos
+from tabela import pagina_tabela
+
+# Rótulos das seções num dict do módulo: as funções das seções são closures
+# sobre a seleção da sessão e não podem ir para o format_func do widget
+ROTULOS_SECOES = {
+    "visao_geral": "📺 Visão Geral",
+    "generos_paises": "🌎 Gêneros e Países",
+    "elenco": "🎬 Elenco",
+    "duracao": "⏱️ Duração",
+    "dados": "🔍 Dados Completos",
+}
+
+
+@st.cache_resource
+def obter_catalogo():
+    """Catálogo e tabelas-ponte, compartilhados (somente leitura) por todas as sessões."""
+    try:
+        catalogo = carregar_catalogo(NETFLIX_CSV)
+    except Exception:
+        st.error(f"❌ Erro ao carregar o catálogo Netflix ({NETFLIX_CSV}).")
+        st.stop()
+    congelar([vars(catalogo), vars(catalogo.indice_busca)] + [vars(ponte) for ponte in catalogo.pontes.values()])
+    return catalogo
+
+
+def renderizar_painel_netflix(cache_figuras, cronometro):
+    """Barra lateral, cabeçalho e a seção ativa do catálogo Netflix."""
+    catalogo = obter_catalogo()
+    df = catalogo.df
+    pontes = catalogo.pontes
+    cronometro.marcar("carregar_dados")
+
+    # =========================
+    # BARRA LATERAL
+    # =========================
+    with st.sidebar:
+        st.markdown("<h2 style='text-align: center; color: #4ECDC4;'>🎛️ Painel de Controle</h2>", unsafe_allow_html=True)
+        st.markdown("---")
+
+        st.markdown("#### 📅 Ano de Lançamento")
+        anos = sorted(int(ano) for ano in df.loc[df["ano"] > 0, "ano"].unique())
+        ano_min, ano_max = st.select_slider(
+            "Selecione o intervalo de anos:",
+            options=anos,
+            value=(anos[0], anos[-1]),
+            key="netflix_anos"
+        )
+
+        st.markdown("---")
+        st.markdown("#### 🎞️ Tipo de Título")
+        tipos = list(df["Category"].cat.categories)
+        categorias = st.multiselect("Filmes e/ou séries:", tipos, default=tipos, key="netflix_categorias")
+
+        st.markdown("---")
+        st.markdown("#### 🎭 Gênero e País")
+        genero = st.selectbox("Gênero:", [None] + list(pontes["generos"].contagens().index), key="netflix_genero",
+                              format_func=rotulo_todos)
+        pais = st.selectbox("País:", [None] + list(pontes["paises"].contagens().index), key="netflix_pais",
+                            format_func=rotulo_todos)
+    cronometro.marcar("barra_lateral")
+
+    filtros = FiltrosNetflix(ano_min, ano_max, tuple(categorias), genero, pais)
+    linhas = catalogo.selecionar(filtros)
+    if len(linhas) == 0:
+        st.error("Nenhum título encontrado com os filtros selecionados.")
+        st.stop()
+    cronometro.marcar("filtro")
+
+    def figura(id_grafico, construtor, *parametros):
+        """Figura pelo cache (gráfico, versão dos dados, filtros, parâmetros)."""
+        chave = ("netflix:" + id_grafico, df.attrs.get("impressao_digital"), filtros, parametros)
+
+        def construir():
+            cronometro.contar("cache_figuras_falhas")
+            with cronometro.medir(f"grafico:netflix:{id_grafico}"):
+                return construtor()
+
+        return cache_figuras.obter_ou_criar(chave, construir)
+
+    def exibir(fig, aviso="Sem dados para os filtros selecionados."):
+        if fig is None:
+            st.info(aviso)
+            return
+        with cronometro.medir("exibir:plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    # =========================
+    # CABEÇALHO
+    # =========================
+    st.markdown('<h1 class="main-header">🎬 CineAnalytics</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Catálogo Netflix: filmes, séries, gêneros, países e elenco</p>', unsafe_allow_html=True)
+
+    # =========================
+    # SEÇÕES
+    # =========================
+    def renderizar_visao_geral():
+        st.markdown('<div class="section-header">📺 Visão Geral do Catálogo</div>', unsafe_allow_html=True)
+        selecao = df["Category"].iloc[linhas].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Títulos", f"{len(linhas):,}")
+        col2.metric("Filmes", f"{int(selecao.get('Movie', 0)):,}")
+        col3.metric("Séries", f"{int(selecao.get('TV Show', 0)):,}")
+        col4.metric("Países", f"{len(pontes['paises'].contagens(linhas)):,}")
+
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            exibir(figura("titulos_por_ano", lambda: criar_grafico_netflix_titulos_por_ano(df, linhas)))
+        with col2:
+            exibir(figura("classificacao", lambda: criar_grafico_netflix_classificacao(df, linhas)))
+
+    def renderizar_generos_paises():
+        st.markdown('<div class="section-header">🌎 Gêneros e Países</div>', unsafe_allow_html=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            exibir(figura("generos", lambda: criar_grafico_netflix_ranking(
+                pontes["generos"].contagens(linhas), "🎭 Gêneros Mais Frequentes", "Gênero")))
+        with col2:
+            exibir(figura("paises", lambda: criar_grafico_netflix_ranking(
+                pontes["paises"].contagens(linhas), "🏳️ Países com Mais Títulos", "País", cor="#4ECDC4")))
+        exibir(figura("mapa_paises", lambda: criar_grafico_netflix_mapa(
+            pontes["paises"].contagens(linhas), catalogo.iso3_por_pais, nomes_paises())))
+        if catalogo.paises_nao_resolvidos:
+            st.caption(f"Países sem código ISO reconhecido (fora do mapa): {', '.join(catalogo.paises_nao_resolvidos)}")
+
+    def renderizar_elenco():
+        st.markdown('<div class="section-header">🎬 Elenco</div>', unsafe_allow_html=True)
+        top_n = st.slider("Número de pessoas:", 5, 30, key="netflix_top_elenco")
+        exibir(figura("elenco", lambda: criar_grafico_netflix_ranking(
+            pontes["elenco"].contagens(linhas), f"⭐ Top {top_n} do Elenco por Número de Títulos", "Pessoa", top_n=top_n),
+            top_n))
+
+    def renderizar_duracao():
+        st.markdown('<div class="section-header">⏱️ Duração</div>', unsafe_allow_html=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            exibir(figura("duracao_filmes", lambda: criar_grafico_netflix_duracao_filmes(df, linhas)),
+                   "Nenhum filme na seleção.")
+        with col2:
+            exibir(figura("temporadas", lambda: criar_grafico_netflix_temporadas(df, linhas)),
+                   "Nenhuma série na seleção.")
+
+    def renderizar_dados():
+        st.markdown('<div class="section-header">🔍 Dados Completos</div>', unsafe_allow_html=True)
+        colunas = [coluna for coluna in df.columns if not coluna.startswith("_")]
+        busca = st.text_input("Buscar texto:", key="netflix_busca", placeholder="Título, diretor, elenco, sinopse...")
+        linhas_busca = catalogo.indice_busca.buscar(busca, linhas)
+        pagina = st.session_state.get("netflix_pagina", 1)
+        with cronometro.medir("tabela:pagina"):
+            pagina_df, total = pagina_tabela(df, linhas_busca, colunas, pagina, TAMANHO_PAGINA_TABELA)
+        total_paginas = max(1, -(-total // TAMANHO_PAGINA_TABELA))
+        if pagina > total_paginas:
+            pagina = total_paginas
+            pagina_df, total = pagina_tabela(df, linhas_busca, colunas, pagina, TAMANHO_PAGINA_TABELA)
+            st.session_state["netflix_pagina"] = pagina
+        with cronometro.medir("exibir:dataframe"):
+            st.dataframe(pagina_df, use_container_width=True)
+        st.number_input("Página:", min_value=1, max_value=total_paginas, step=1, key="netflix_pagina")
+        st.caption(f"{total:,} títulos · página {pagina} de {total_paginas}")
+
+    secoes = {
+        "visao_geral": renderizar_visao_geral,
+        "generos_paises": renderizar_generos_paises,
+        "elenco": renderizar_elenco,
+        "duracao": renderizar_duracao,
+        "dados": renderizar_dados,
+    }
+    # Widgets das seções ocultas não são renderizados: preserva seus valores
+    # (o valor inicial vem só do Session State, sem value= no widget)
+    st.session_state.setdefault("netflix_top_elenco", 20)
+    for chave in ("netflix_top_elenco", "netflix_busca", "netflix_pagina"):
+        if chave in st.session_state:
+            st.session_state[chave] = st.session_state[chave]
+    secao = st.radio(
+        "Seção",
+        options=list(secoes),
+        format_func=ROTULOS_SECOES.get,
+        horizontal=True,
+        key="netflix_secao",
+        label_visibility="collapsed"
+    )
+    cronometro.marcar("cabecalho")
+    secoes[secao]()
+    cronometro.marcar(secao)
@@ -0,0 +1,111 @@
+# =========================
+# CONSTRUÇÃO PARALELA DE FIGURAS
+# =========================
+# As figuras de uma aba são independentes entre si: depois que as agregações
+# foram feitas na thread do script, cada criar_grafico_* (e a serialização
+# JSON que mede o tamanho da figura para o cache) pode rodar num pool. Os
+# resultados voltam na ordem dos pedidos, que é a ordem do layout.
+#
+# Modos (CINE_POOL_GRAFICOS): "serial" (padrão, sem pool), "threads" (ganha
+# onde pandas/NumPy soltam o GIL) e "processos" (paralelismo real; cada
+# tarefa envia ao trabalhador só as linhas e colunas que o gráfico lê).
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib.machinery import ModuleSpec
+
+import numpy as np
+
+from cache_figuras import tamanho_figura
+from config import POOL_GRAFICOS, TRABALHADORES_GRAFICOS
+
+MODOS_POOL = ("serial", "threads", "processos")
+# Spec de um __main__ que o multiprocessing não reimporta nos trabalhadores
+# (o mesmo caso de `python -m pacote`)
+SPEC_SEM_REIMPORTACAO = ModuleSpec("__main__", None)
+
+
+@dataclass(frozen=True)
+class TarefaGrafico:
+    """
+    Construção de uma figura: `funcao(*argumentos)`, com `funcao` importável
+    fora do script principal (graficos.criar_*). Quando os dois primeiros
+    argumentos são (DataFrame base, posições), `colunas` lista as colunas que
+    a função lê; no modo processos só esse recorte é enviado.
+    """
+    funcao: object
+    argumentos: tuple
+    colunas: tuple = None
+
+
+def _recortar(tarefa):
+    """Argumentos com o DataFrame base trocado pelo recorte (linhas e colunas) que o gráfico usa."""
+    if tarefa.colunas is None:
+        return tarefa.argumentos
+    df, linhas, *resto = tarefa.argumentos
+    recorte = df.iloc[linhas][list(tarefa.colunas)].reset_index(drop=True)
+    return (recorte, np.arange(len(recorte)), *resto)
+
+
+def _construir(funcao, argumentos):
+    """Figura, seu tamanho serializado e os tempos de construção e de serialização (roda no trabalhador)."""
+    inicio = time.perf_counter()
+    figura = funcao(*argumentos)
+    construida = time.perf_counter()
+    tamanho = tamanho_figura(figura)
+    return figura, tamanho, construida - inicio, time.perf_counter() - construida
+
+
+def marcar_principal(modulo):
+    """
+    O spawn reexecuta o módulo __main__ em cada trabalhador; no Streamlit ele
+    é o script do app. Como as tarefas só usam funções importáveis, o
+    principal sem spec recebe SPEC_SEM_REIMPORTACAO e os trabalhadores não o
+    executam. sys.modules não é alterado (outras sessões o leem em paralelo).
+    """
+    if getattr(modulo, "__spec__", None) is None:
+        modulo.__spec__ = SPEC_SEM_REIMPORTACAO
+
+
+class PoolGraficos:
+    """Executa tarefas de gráficos em série, em threads ou em processos."""
+
+    def __init__(self, modo=POOL_GRAFICOS, trabalhadores=TRABALHADORES_GRAFICOS):
+        if modo not in MODOS_POOL:
+            raise ValueError(f"Modo de pool desconhecido: {modo} (use {', '.join(MODOS_POOL)}).")
+        self.modo = modo
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self._executor = None
+
+    def _obter_executor(self):
+        if self._executor is None:
+            if self.modo == "threads":
+                self._executor = ThreadPoolExecutor(self.trabalhadores, thread_name_prefix="graficos")
+            else:
+                # spawn: o processo do Streamlit tem threads, e fork com threads pode travar
+                marcar_principal(sys.modules["__main__"])
+                self._executor = multiprocessing.get_context("spawn").Pool(self.trabalhadores)
+        return self._executor
+
+    def construir(self, tarefas):
+        """Lista de (figura, bytes do JSON, segundos de construção, segundos de serialização), na ordem de `tarefas`."""
+        if self.modo == "serial" or len(tarefas) <= 1:
+            return [_construir(tarefa.funcao, tarefa.argumentos) for tarefa in tarefas]
+        executor = self._obter_executor()
+        if self.modo == "processos":
+            pendentes = [executor.apply_async(_construir, (tarefa.funcao, _recortar(tarefa))) for tarefa in tarefas]
+            return [pendente.get() for pendente in pendentes]
+        futuros = [executor.submit(_construir, tarefa.funcao, tarefa.argumentos) for tarefa in tarefas]
+        return [futuro.result() for futuro in futuros]
+
+    def encerrar(self):
+        if self._executor is None:
+            return
+        if self.modo == "processos":
+            self._executor.terminate()
+        else:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
@@ -0,0 +1,328 @@
+# =========================
+# RELATÓRIO ESTÁTICO (SEM STREAMLIT)
+# =========================
+# Gera todas as figuras do dashboard para uma lista de presets de filtros
+# (todos os anos, última década, só blockbusters...) e grava cada preset como
+# uma página HTML autocontida e um JSON por gráfico. Usa os mesmos dados
+# (carregar_estado), consultas e criar_grafico_* do app; as figuras de todos
+# os presets são construídas juntas no pool de processos (pool_graficos.py).
+#
+# O manifesto da saída guarda a impressão digital de cada preset (versão dos
+# dados, filtros resolvidos, top_n e código dos gráficos): presets cujas
+# entradas não mudaram desde a última execução são pulados.
+#
+# Uso: python relatorio.py --saida relatorios --presets todos_os_anos ultima_decada
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import plotly
+import plotly.io as pio
+
+import graficos
+from config import CSV_URL, TRABALHADORES_GRAFICOS
+from dados import _gravar_atomico, limites_sucesso, nomes_paises
+from estado_dados import carregar_estado
+from filtros import Filtros
+from graficos import (
+    criar_grafico_top_filmes,
+    criar_grafico_distribuicao_notas,
+    criar_grafico_evolucao_receita_anual,
+    criar_grafico_filmes_por_ano,
+    criar_grafico_media_notas_ano,
+    criar_grafico_decadas,
+    criar_grafico_dispercao_nota_receita,
+    criar_grafico_orcamento_vs_receita,
+    criar_grafico_distribuicao_idiomas,
+    criar_grafico_categorias_sucesso,
+    criar_grafico_correlacao,
+    criar_grafico_top_roi,
+    criar_grafico_sazonalidade,
+    criar_grafico_receita_mensal,
+    criar_grafico_filmes_mensal,
+)
+from pool_graficos import MODOS_POOL, PoolGraficos, TarefaGrafico
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_MANIFESTO = "manifesto.json"
+FORMATOS = ("html", "json")
+
+
+# =========================
+# PRESETS DE FILTROS
+# =========================
+def filtros_padrao(df):
+    """Seleção inicial da barra lateral: todos os anos, notas e receitas."""
+    anos = df.loc[df["ano"] > 0, "ano"]
+    return Filtros(int(anos.min()), int(anos.max()), 0.0, 10.0, 0.0, float(df["revenue"].max()))
+
+
+def _ultima_decada(df):
+    padrao = filtros_padrao(df)
+    return replace(padrao, ano_min=max(padrao.ano_min, padrao.ano_max - 9))
+
+
+def _blockbusters(df):
+    # Mesmo limite da categoria "Blockbuster" (80% da receita)
+    return replace(filtros_padrao(df), receita_min=float(limites_sucesso(df["revenue"])[2]))
+
+
+PRESETS = {
+    "todos_os_anos": filtros_padrao,
+    "ultima_decada": _ultima_decada,
+    "blockbusters": _blockbusters,
+}
+
+
+def ler_presets(caminho):
+    """
+    Presets de um arquivo JSON {"nome": {"ano_min": 1990, ...}}: os campos
+    informados substituem os da seleção padrão.
+    """
+    definicoes = json.loads(Path(caminho).read_text(encoding="utf-8"))
+    return {
+        nome: (lambda df, campos=campos: replace(filtros_padrao(df), **campos))
+        for nome, campos in definicoes.items()
+    }
+
+
+# =========================
+# GRÁFICOS DE UM PRESET
+# =========================
+# Mesmos gráficos, títulos e ordem das abas do app.py.
+def pedidos_do_preset(df, consultas, filtros, linhas, top_n=10):
+    """Lista de (seção, id_grafico, título, TarefaGrafico) de todas as abas para `filtros`."""
+    agregados = {}
+
+    def agregado(*por):
+        if por not in agregados:
+            agregados[por] = consultas.agregar(filtros, por)
+        return agregados[por]
+
+    def pontos(funcao, *colunas):
+        return TarefaGrafico(funcao, (df, linhas), colunas)
+
+    top = consultas.maiores(filtros, linhas, "revenue", top_n)
+    top_roi = consultas.maiores(filtros, linhas, "roi", 10, positivas=("roi", "budget_x"))
+    return [
+        ("🏆 Filmes Mais Populares", "top_filmes", "Top Filmes por Receita",
+         TarefaGrafico(criar_grafico_top_filmes, (df, top, top_n), ("names", "revenue", "score"))),
+        ("🏆 Filmes Mais Populares", "distribuicao_notas", "Distribuição de Notas",
+         pontos(criar_grafico_distribuicao_notas, "score")),
+        ("📈 Tendências", "evolucao_receita_anual", "Evolução da Receita Anual",
+         TarefaGrafico(criar_grafico_evolucao_receita_anual, (agregado("ano"),))),
+        ("📈 Tendências", "filmes_por_ano", "Quantidade de Filmes por Ano",
+         TarefaGrafico(criar_grafico_filmes_por_ano, (agregado("ano"),))),
+        ("📈 Tendências", "media_notas_ano", "Evolução das Notas Médias",
+         TarefaGrafico(criar_grafico_media_notas_ano, (agregado("ano"),))),
+        ("📈 Tendências", "decadas", "Análise por Décadas",
+         TarefaGrafico(criar_grafico_decadas, (agregado("ano"),))),
+        ("🎯 Relações", "dispersao_nota_receita", "Nota vs Receita",
+         pontos(criar_grafico_dispercao_nota_receita, "score", "revenue", "names")),
+        ("🎯 Relações", "orcamento_vs_receita", "Orçamento vs Receita",
+         pontos(criar_grafico_orcamento_vs_receita, "budget_x", "revenue", "names", "score")),
+        ("🌎 Distribuições", "distribuicao_idiomas", "Distribuição de Idiomas",
+         TarefaGrafico(criar_grafico_distribuicao_idiomas, (agregado("orig_lang"),))),
+        ("🌎 Distribuições", "categorias_sucesso", "Categorias de Sucesso",
+         pontos(criar_grafico_categorias_sucesso, "success_category")),
+        ("🌎 Distribuições", "mapa_paises", "Distribuição Geográfica de Receita",
+         TarefaGrafico(criar_grafico_correlacao, (agregado("country_iso3"), nomes_paises()))),
+        ("📊 Análise Financeira", "top_roi", "Top Filmes por ROI",
+         TarefaGrafico(criar_grafico_top_roi, (df, top_roi), ("names", "roi", "budget_x"))),
+        ("📅 Sazonalidade", "sazonalidade", "Sazonalidade",
+         TarefaGrafico(criar_grafico_sazonalidade, (agregado("mes"),))),
+        ("📅 Sazonalidade", "receita_mensal", "Receita por Mês",
+         TarefaGrafico(criar_grafico_receita_mensal, (agregado("mes"),))),
+        ("📅 Sazonalidade", "filmes_mensal", "Filmes por Mês",
+         TarefaGrafico(criar_grafico_filmes_mensal, (agregado("mes"),))),
+    ]
+
+
+# =========================
+# MANIFESTO E SAÍDA
+# =========================
+def impressao_digital_preset(df, filtros, top_n, formatos):
+    """Hash das entradas de um preset: versão dos dados, filtros, top_n, formatos e código dos gráficos."""
+    h = hashlib.sha256(json.dumps({
+        "dados": df.attrs.get("impressao_digital"),
+        "filtros": asdict(filtros),
+        "top_n": top_n,
+        "formatos": sorted(formatos),
+        "plotly": plotly.__version__,
+    }, sort_keys=True).encode())
+    for modulo in (graficos, sys.modules[__name__]):
+        h.update(Path(modulo.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def ler_manifesto(saida):
+    caminho = saida / ARQUIVO_MANIFESTO
+    if not caminho.exists():
+        return {}
+    try:
+        return json.loads(caminho.read_text(encoding="utf-8"))
+    except ValueError:
+        logger.warning("Manifesto ilegível em %s; todos os presets serão gerados", caminho)
+        return {}
+
+
+def _gravar_texto(caminho, texto):
+    def escrever(temporario):
+        Path(temporario).write_text(texto, encoding="utf-8")
+        # mkstemp cria o arquivo só para o dono; o relatório é para ser servido/lido por outros
+        os.chmod(temporario, 0o644)
+
+    _gravar_atomico(caminho, escrever)
+
+
+def pagina_html(nome, filtros, graficos_preset, gerado_em):
+    """Página autocontida (plotly.js embutido uma vez) com os gráficos do preset em seções."""
+    partes = []
+    secao_atual = None
+    plotly_incluido = False
+    for secao, _, titulo, figura in graficos_preset:
+        if secao != secao_atual:
+            partes.append(f"<h2>{secao}</h2>")
+            secao_atual = secao
+        partes.append(f"<h3>{titulo}</h3>")
+        if figura is None:
+            partes.append("<p class='vazio'>Não há dados suficientes para este gráfico.</p>")
+            continue
+        partes.append(pio.to_html(figura, full_html=False, include_plotlyjs=not plotly_incluido,
+                                  config={"displaylogo": False}))
+        plotly_incluido = True
+    descricao = (f"Anos {filtros.ano_min}–{filtros.ano_max} · notas {filtros.nota_min:.1f}–{filtros.nota_max:.1f} · "
+                 f"receita ${filtros.receita_min:,.0f}–${filtros.receita_max:,.0f}")
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>CineAnalytics · {nome}</title>
+<style>
+  body {{ background: #0E1117; color: white; font-family: sans-serif; margin: 2rem; }}
+  h1 {{ color: #4ECDC4; }}
+  h2 {{ border-bottom: 1px solid #333; padding-bottom: .3rem; margin-top: 2.5rem; }}
+  .vazio, .filtros {{ color: #AAAAAA; }}
+</style>
+</head>
+<body>
+<h1>🎬 CineAnalytics · {nome}</h1>
+<p class="filtros">{descricao} · gerado em {gerado_em}</p>
+{chr(10).join(partes)}
+</body>
+</html>
+"""
+
+
+def gravar_preset(saida, nome, filtros, graficos_preset, formatos, gerado_em):
+    """Grava o HTML e/ou os JSON de um preset; devolve os arquivos gravados (relativos à saída)."""
+    pasta = saida / nome
+    pasta.mkdir(parents=True, exist_ok=True)
+    arquivos = []
+    if "json" in formatos:
+        for _, id_grafico, _, figura in graficos_preset:
+            if figura is not None:
+                _gravar_texto(pasta / f"{id_grafico}.json", pio.to_json(figura, validate=False))
+                arquivos.append(f"{nome}/{id_grafico}.json")
+    if "html" in formatos:
+        _gravar_texto(pasta / "index.html", pagina_html(nome, filtros, graficos_preset, gerado_em))
+        arquivos.append(f"{nome}/index.html")
+    return arquivos
+
+
+# =========================
+# EXECUÇÃO
+# =========================
+def gerar_relatorio(saida, presets, formatos=FORMATOS, top_n=10, forcar=False, pool=None, origem=CSV_URL):
+    """
+    Gera os presets cujas entradas mudaram (ou todos, com `forcar`). Retorna
+    {preset: "gerado" | "inalterado"}.
+    """
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    versao = carregar_estado(origem).atual()
+    df, consultas = versao.df, versao.consultas
+    manifesto = ler_manifesto(saida)
+
+    pendentes = []
+    situacao = {}
+    for nome, resolver in presets.items():
+        filtros = resolver(df)
+        impressao = impressao_digital_preset(df, filtros, top_n, formatos)
+        anterior = manifesto.get(nome, {})
+        arquivos = anterior.get("arquivos") or []
+        if (not forcar and anterior.get("impressao") == impressao and arquivos
+                and all((saida / arquivo).exists() for arquivo in arquivos)):
+            situacao[nome] = "inalterado"
+            continue
+        linhas = consultas.selecionar(filtros)
+        pendentes.append((nome, filtros, impressao, len(linhas), pedidos_do_preset(df, consultas, filtros, linhas, top_n)))
+
+    if pendentes:
+        pool = pool or PoolGraficos("processos")
+        # Figuras de todos os presets num único lote: o pool fica ocupado até o fim
+        tarefas = [tarefa for *_, pedidos in pendentes for *_, tarefa in pedidos]
+        inicio = time.perf_counter()
+        construidas = iter(pool.construir(tarefas))
+        segundos = time.perf_counter() - inicio
+        gerado_em = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        for nome, filtros, impressao, n_linhas, pedidos in pendentes:
+            graficos_preset = [(secao, id_grafico, titulo, next(construidas)[0])
+                               for secao, id_grafico, titulo, _ in pedidos]
+            arquivos = gravar_preset(saida, nome, filtros, graficos_preset, formatos, gerado_em)
+            manifesto[nome] = {
+                "impressao": impressao,
+                "filtros": asdict(filtros),
+                "linhas": int(n_linhas),
+                "arquivos": arquivos,
+                "gerado_em": gerado_em,
+            }
+            situacao[nome] = "gerado"
+            # Manifesto gravado preset a preset: uma interrupção não perde os já prontos
+            _gravar_texto(saida / ARQUIVO_MANIFESTO, json.dumps(manifesto, ensure_ascii=False, indent=2))
+        logger.info("%d gráficos construídos em %.2f s (%s)", len(tarefas), segundos, pool.modo)
+    return situacao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gráficos do dashboard em HTML/JSON estático para presets de filtros.")
+    parser.add_argument("--saida", type=Path, default=Path("relatorios"), help="Diretório de saída")
+    parser.add_argument("--presets", nargs="+", help=f"Presets a gerar (padrão: todos; embutidos: {', '.join(PRESETS)})")
+    parser.add_argument("--arquivo-presets", type=Path, help='JSON {"nome": {"ano_min": 1990, ...}} com presets extras')
+    parser.add_argument("--formatos", nargs="+", default=list(FORMATOS), choices=FORMATOS)
+    parser.add_argument("--top-n", type=int, default=10, help="Filmes no gráfico de top receita")
+    parser.add_argument("--pool", default="processos", choices=MODOS_POOL, help="Modo do pool de gráficos")
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES_GRAFICOS, help="0 = um por núcleo")
+    parser.add_argument("--forcar", action="store_true", help="Gera mesmo os presets inalterados")
+    parser.add_argument("--csv", default=CSV_URL, help="URL ou caminho do CSV (padrão: CINE_CSV_URL)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    disponiveis = dict(PRESETS)
+    if args.arquivo_presets:
+        disponiveis.update(ler_presets(args.arquivo_presets))
+    nomes = args.presets or list(disponiveis)
+    desconhecidos = [nome for nome in nomes if nome not in disponiveis]
+    if desconhecidos:
+        parser.error(f"presets desconhecidos: {', '.join(desconhecidos)}")
+
+    pool = PoolGraficos(args.pool, args.trabalhadores)
+    try:
+        situacao = gerar_relatorio(args.saida, {nome: disponiveis[nome] for nome in nomes}, args.formatos,
+                                   args.top_n, args.forcar, pool, args.csv)
+    finally:
+        pool.encerrar()
+    for nome, estado in situacao.items():
+        print(f"{nome:<20} {estado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# =========================
+# ESTADO POR SESSÃO (COM ORÇAMENTO DE MEMÓRIA)
+# =========================
+# Dados, cubo, índices e figuras são do processo e somente leitura
+# (estado_dados.py, cache_figuras.py). Cada sessão guarda só os valores dos
+# widgets e resultados pequenos derivados da sua seleção, num cache LRU
+# limitado a CINE_ORCAMENTO_SESSAO_MB: com muitos usuários a memória cresce
+# no máximo esse orçamento por sessão, e um resultado descartado é apenas
+# recalculado no próximo uso.
+import sys
+
+import numpy as np
+import pandas as pd
+
+from cache_figuras import CacheFiguras
+from config import ORCAMENTO_SESSAO_MB
+
+CHAVE_RESULTADOS = "_resultados_sessao"
+
+
+def tamanho_objeto(valor):
+    """Bytes aproximados de um valor guardado na sessão."""
+    if isinstance(valor, CacheFiguras):
+        return valor.bytes_usados
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return int(np.sum(valor.memory_usage(deep=True)))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_objeto(chave) + tamanho_objeto(item) for chave, item in valor.items())
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valor) + sum(tamanho_objeto(item) for item in valor)
+    return sys.getsizeof(valor)
+
+
+def rotulo_opcional(valor):
+    """Rótulo de opção que aceita None (format_func definido fora do script).
+
+    A sessão guarda o format_func dos seus widgets; uma lambda escrita no
+    app.py prenderia os globais da última execução (seleções, figuras) a cada
+    sessão aberta.
+    """
+    return "—" if valor is None else valor
+
+
+def rotulo_todos(valor):
+    """Como rotulo_opcional, para filtros em que None significa "Todos"."""
+    return "Todos" if valor is None else valor
+
+
+def resultados_da_sessao(estado, orcamento_bytes=ORCAMENTO_SESSAO_MB * 2**20):
+    """Cache LRU dos resultados desta sessão (criado no primeiro uso)."""
+    if CHAVE_RESULTADOS not in estado:
+        estado[CHAVE_RESULTADOS] = CacheFiguras(orcamento_bytes, medir=tamanho_objeto)
+    return estado[CHAVE_RESULTADOS]
+
+
+def bytes_da_sessao(estado):
+    """Bytes de tudo que a sessão guarda (widgets e resultados)."""
+    return sum(tamanho_objeto(estado[chave]) for chave in list(estado.keys()))
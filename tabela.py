@@ -0,0 +1,50 @@
+# =========================
+# TABELA PAGINADA (ORDENAÇÃO NO SERVIDOR)
+# =========================
+# A aba "Dados Completos" envia ao navegador só a página visível. Ordenação
+# e seleção de colunas são aplicadas sobre as posições das linhas filtradas
+# (e já buscadas pelo índice de busca.py), e apenas as linhas da página são
+# materializadas.
+import numpy as np
+import pandas as pd
+
+
+def ordenar_ate(df, linhas, coluna, crescente, limite):
+    """
+    As primeiras `limite` posições da seleção ordenada por `coluna`.
+
+    Colunas numéricas usam seleção parcial (argpartition) e só ordenam o
+    prefixo necessário; as demais caem numa ordenação estável completa.
+    Valores ausentes ficam sempre no fim.
+    """
+    if coluna is None or len(linhas) == 0:
+        return linhas[:limite]
+    serie = df[coluna]
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        valores = serie.to_numpy(dtype=float)[linhas]
+        chave = valores if crescente else -valores
+        chave = np.where(np.isnan(chave), np.inf, chave)
+        if limite < len(linhas):
+            candidatas = np.argpartition(chave, limite - 1)[:limite]
+            # Empates na fronteira: a ordem estável exige as primeiras posições
+            candidatas = np.flatnonzero(chave <= chave[candidatas].max())
+        else:
+            candidatas = np.arange(len(linhas))
+        ordem = candidatas[np.argsort(chave[candidatas], kind="stable")][:limite]
+        return linhas[ordem]
+    valores = serie.iloc[linhas].reset_index(drop=True)
+    ordem = valores.sort_values(ascending=crescente, kind="stable", na_position="last").index.to_numpy()
+    return linhas[ordem[:limite]]
+
+
+def pagina_tabela(df, linhas, colunas, pagina=1, tamanho_pagina=50, ordenar_por=None, crescente=True):
+    """
+    Uma página da tabela e o total de linhas da seleção.
+
+    Só as `tamanho_pagina` linhas da página (e apenas as `colunas`
+    escolhidas) são copiadas para o DataFrame devolvido.
+    """
+    total = len(linhas)
+    inicio = (max(pagina, 1) - 1) * tamanho_pagina
+    ordenadas = ordenar_ate(df, linhas, ordenar_por, crescente, inicio + tamanho_pagina)
+    return df.iloc[ordenadas[inicio:inicio + tamanho_pagina]][list(colunas)], total